@@ -0,0 +1,194 @@
+"""
+Section rosters for instructors.
+
+A roster lists the students currently placed in a section with their subject
+enrollments and latest submission, built with three queries regardless of
+class size:
+  1. current StudentLevel rows of the section (with profile names)
+  2. subject enrollments of those students
+  3. the latest submission of each student (DISTINCT ON student)
+
+Rosters are cached under the section's cache version, which academics.signals
+bumps whenever placements, enrollments, submissions or names change.
+acompute_roster/aget_roster are the same through the async ORM, for the
+async roster view.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import bump_cache_version, cache_version, tenant_cache_key
+
+
+def section_version(section_id):
+    return cache_version("section", section_id)
+
+
+def bump_section_versions(section_ids):
+    for section_id in set(section_ids):
+        if section_id:
+            bump_cache_version("section", section_id)
+
+
+def bump_student_sections(student_ids):
+    """Bumps the sections the given students are currently placed in."""
+    from students.models import StudentLevel
+
+    student_ids = [student_id for student_id in set(student_ids) if student_id]
+    if not student_ids:
+        return
+    bump_section_versions(
+        StudentLevel.objects.filter(
+            student_id__in=student_ids, is_current=True, section__isnull=False
+        ).values_list("section_id", flat=True)
+    )
+
+
+def roster_cache_key(section_id, subject_id=None):
+    return tenant_cache_key(
+        "roster", section_id, subject_id or "all", section_version(section_id)
+    )
+
+
+def _placements(section_id):
+    from students.models import StudentLevel
+
+    return (
+        StudentLevel.objects.filter(section_id=section_id, is_current=True)
+        .order_by("student__profile__first_name", "student__profile__last_name")
+        .values(
+            "student_id",
+            "academic_year",
+            "student__enrollment_id",
+            "student__status",
+            "student__profile__first_name",
+            "student__profile__last_name",
+        )
+    )
+
+
+def _enrollments(student_ids):
+    from course_content.models import SubjectEnrollment
+
+    return (
+        SubjectEnrollment.objects.filter(student_id__in=student_ids)
+        .order_by("subject__name")
+        .values("student_id", "academic_year", "subject_id", "subject__code", "subject__name")
+    )
+
+
+def _latest_submissions(student_ids, subject_id):
+    from course_content.models import AssignmentSubmission
+
+    submissions = AssignmentSubmission.objects.filter(
+        student_id__in=student_ids, submitted_at__isnull=False
+    )
+    if subject_id:
+        submissions = submissions.filter(assignment__content__target_subjects=subject_id)
+    return (
+        submissions.order_by("student_id", "-submitted_at")
+        .distinct("student_id")
+        .values(
+            "student_id",
+            "assignment_id",
+            "assignment__content__title",
+            "status",
+            "submitted_at",
+            "score",
+        )
+    )
+
+
+def _build_roster(section, subject_id, placements, enrollments, submissions):
+    academic_years = {p["student_id"]: p["academic_year"] for p in placements}
+
+    subjects = {}
+    for row in enrollments:
+        # Only the enrollments of the year the student is placed in this section for
+        if row["academic_year"] == academic_years[row["student_id"]]:
+            subjects.setdefault(row["student_id"], []).append(
+                {"id": row["subject_id"], "code": row["subject__code"], "name": row["subject__name"]}
+            )
+    latest = {row["student_id"]: row for row in submissions}
+
+    students = []
+    for placement in placements:
+        submission = latest.get(placement["student_id"])
+        students.append(
+            {
+                "student_id": placement["student_id"],
+                "enrollment_id": placement["student__enrollment_id"],
+                "first_name": placement["student__profile__first_name"],
+                "last_name": placement["student__profile__last_name"],
+                "status": placement["student__status"],
+                "subjects": subjects.get(placement["student_id"], []),
+                "latest_submission": {
+                    "assignment_id": submission["assignment_id"],
+                    "title": submission["assignment__content__title"],
+                    "status": submission["status"],
+                    "submitted_at": submission["submitted_at"],
+                    "score": submission["score"],
+                }
+                if submission
+                else None,
+            }
+        )
+
+    return {
+        "section": section.id,
+        "section_name": section.name,
+        "level_name": section.level.name,
+        "subject": subject_id,
+        "students": students,
+    }
+
+
+def compute_roster(section, subject_id=None):
+    """
+    Roster of `section`. With `subject_id`, the latest submission is limited
+    to assignments of that subject.
+    """
+    placements = list(_placements(section.id))
+    student_ids = [p["student_id"] for p in placements]
+    return _build_roster(
+        section,
+        subject_id,
+        placements,
+        list(_enrollments(student_ids)),
+        list(_latest_submissions(student_ids, subject_id)),
+    )
+
+
+async def acompute_roster(section, subject_id=None):
+    """compute_roster through the async ORM; `section` must have its level loaded."""
+    placements = [p async for p in _placements(section.id)]
+    student_ids = [p["student_id"] for p in placements]
+    return _build_roster(
+        section,
+        subject_id,
+        placements,
+        [row async for row in _enrollments(student_ids)],
+        [row async for row in _latest_submissions(student_ids, subject_id)],
+    )
+
+
+def get_roster(section, subject_id=None):
+    """Cached roster of a section for the current section version."""
+    key = roster_cache_key(section.id, subject_id)
+    data = cache.get(key)
+    if data is None:
+        data = compute_roster(section, subject_id)
+        cache.set(key, data, settings.ROSTER_CACHE_TIMEOUT)
+    return data
+
+
+async def aget_roster(section, subject_id=None):
+    """get_roster for async views."""
+    # The cache key carries the tenant schema, which lives on the request's sync thread
+    key = await sync_to_async(roster_cache_key)(section.id, subject_id)
+    data = await cache.aget(key)
+    if data is None:
+        data = await acompute_roster(section, subject_id)
+        await cache.aset(key, data, settings.ROSTER_CACHE_TIMEOUT)
+    return data
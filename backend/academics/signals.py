@@ -0,0 +1,66 @@
+"""
+Keeps cache versions in step with the data they cover: the tenant's
+academic structure (tree) and each section's roster.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from course_content.models import AssignmentSubmission, SubjectEnrollment
+from profiles.models import Profile
+from students.models import Student, StudentLevel
+from .models import AcademicLevel, Program, Section, Subject
+from .roster import bump_section_versions, bump_student_sections
+from .tree import bump_structure_version
+
+
+@receiver(post_save, sender=Program)
+@receiver(post_delete, sender=Program)
+@receiver(post_save, sender=AcademicLevel)
+@receiver(post_delete, sender=AcademicLevel)
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def structure_changed(sender, **kwargs):
+    bump_structure_version()
+
+
+@receiver(pre_save, sender=StudentLevel)
+def remember_previous_section(sender, instance, raw=False, **kwargs):
+    instance._previous_section_id = None
+    if instance.pk and not raw:
+        instance._previous_section_id = (
+            StudentLevel.objects.filter(pk=instance.pk).values_list("section_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=StudentLevel)
+@receiver(post_delete, sender=StudentLevel)
+def placement_changed(sender, instance, **kwargs):
+    # A move between sections changes both rosters
+    bump_section_versions(
+        [instance.section_id, getattr(instance, "_previous_section_id", None)]
+    )
+
+
+@receiver(post_save, sender=SubjectEnrollment)
+@receiver(post_delete, sender=SubjectEnrollment)
+@receiver(post_save, sender=AssignmentSubmission)
+@receiver(post_delete, sender=AssignmentSubmission)
+def student_activity_changed(sender, instance, **kwargs):
+    bump_student_sections([instance.student_id])
+
+
+@receiver(post_save, sender=Student)
+def student_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        bump_student_sections([instance.id])
+
+
+@receiver(post_save, sender=Profile)
+def profile_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        bump_student_sections(
+            Student.objects.filter(profile_id=instance.id).values_list("id", flat=True)
+        )
@@ -1,3 +1,237 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from course_content.models import Assignment, AssignmentSubmission, CourseContent
+from profiles.models import Profile
+from staff.models import Instructor, StaffMember
+from students.models import Student, StudentLevel
+from .models import AcademicLevel, Program, Section, Subject, SubjectAssignment
+
+
+def counted_selects(queries):
+    # Skip the middleware's tenant lookup; django-tenants also interleaves SET search_path
+    return [
+        q["sql"]
+        for q in queries.captured_queries
+        if q["sql"].startswith("SELECT") and "organizations_domain" not in q["sql"]
+    ]
+
+
+class SectionRosterTest(TenantTestCase):
+    """
+    Verifies the roster is built with a fixed number of queries, served from
+    cache until the section version moves, and open to the section's instructors.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        level = AcademicLevel.objects.create(program=program, name="Grade 9", order=1)
+        self.section = Section.objects.create(level=level, name="A")
+        self.other_section = Section.objects.create(level=level, name="B")
+        self.subject = Subject.objects.create(level=level, name="Science", code="SCI9")
+
+        self.teacher_user = User.objects.create_user(username="teacher", password="x")
+        teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(
+                first_name="Tea", last_name="Cher", user_id=self.teacher_user.id
+            ),
+            employee_id="EMP-R1",
+            designation="Teacher",
+        )
+        SubjectAssignment.objects.create(
+            section=self.section,
+            subject=self.subject,
+            instructor=Instructor.objects.create(staff_member=teacher, specialization="Science"),
+        )
+
+        content = CourseContent.objects.create(
+            title="Lab report", description="", content_type="assignment", created_by=teacher
+        )
+        content.target_subjects.add(self.subject)
+        self.assignment = Assignment.objects.create(
+            content=content, due_date=timezone.now() + timedelta(days=3), instructions=""
+        )
+
+        self.students = []
+        for index in range(6):
+            student = Student.objects.create(
+                profile=Profile.objects.create(first_name=f"Student{index}", last_name="Test"),
+                enrollment_id=f"R-{index}",
+            )
+            # Placing the student derives the section's core subject enrollment
+            StudentLevel.objects.create(
+                student=student, level=level, section=self.section, academic_year="2026"
+            )
+            AssignmentSubmission.objects.create(
+                assignment=self.assignment,
+                student=student,
+                status="submitted",
+                submitted_at=timezone.now(),
+            )
+            self.students.append(student)
+
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.url = f"/api/academics/sections/{self.section.id}/roster/"
+
+    def test_fixed_queries_and_versioned_cache(self):
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(self.url, {"subject": self.subject.id})
+        self.assertEqual(response.status_code, 200, response.content)
+        # Section lookup + placements, enrollments, latest submissions
+        self.assertEqual(len(counted_selects(queries)), 4)
+
+        students = response.json()["students"]
+        self.assertEqual(len(students), 6)
+        self.assertEqual(students[0]["subjects"][0]["code"], "SCI9")
+        self.assertEqual(students[0]["latest_submission"]["status"], "submitted")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.api.get(self.url, {"subject": self.subject.id})
+        self.assertEqual(len(counted_selects(queries)), 1)
+
+        # Grading a submission bumps the section version
+        submission = AssignmentSubmission.objects.get(student=self.students[0])
+        submission.status = "graded"
+        submission.score = 90
+        submission.save()
+        students = self.api.get(self.url, {"subject": self.subject.id}).json()["students"]
+        self.assertEqual(students[0]["latest_submission"]["status"], "graded")
+
+        # Moving a student changes both rosters
+        other_url = f"/api/academics/sections/{self.other_section.id}/roster/"
+        self.assertEqual(self.api.get(other_url).json()["students"], [])
+        placement = StudentLevel.objects.get(student=self.students[1])
+        placement.section = self.other_section
+        placement.save()
+        self.assertEqual(len(self.api.get(self.url).json()["students"]), 5)
+        self.assertEqual(len(self.api.get(other_url).json()["students"]), 1)
+
+    def test_instructors_of_the_section_only(self):
+        self.api.force_authenticate(self.teacher_user)
+        self.assertEqual(self.api.get(self.url).status_code, 200)
+
+        other = self.api.get(f"/api/academics/sections/{self.other_section.id}/roster/")
+        self.assertEqual(other.status_code, 403)
+
+
+class AcademicTreeTest(TenantTestCase):
+    """
+    Verifies the structure tree is four flat queries, cached per structure
+    version and revalidated with ETags.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for code in ("HS", "ALV"):
+            program = Program.objects.create(name=f"Program {code}", code=code)
+            for order in (1, 2):
+                level = AcademicLevel.objects.create(
+                    program=program, name=f"Level {order}", order=order
+                )
+                for name in ("A", "B", "C"):
+                    Section.objects.create(level=level, name=name)
+                Subject.objects.create(level=level, name="Maths", code=f"MTH{order}")
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+
+    def test_tree_queries_cache_and_etag(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get("/api/academics/tree/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(counted_selects(queries)), 4)
+
+        programs = response.json()["programs"]
+        self.assertEqual([p["code"] for p in programs], ["ALV", "HS"])
+        level = programs[0]["levels"][0]
+        self.assertEqual([s["name"] for s in level["sections"]], ["A", "B", "C"])
+        self.assertEqual(level["subjects"][0]["code"], "MTH1")
+
+        etag = response["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.api.get("/api/academics/tree/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(counted_selects(queries), [])
+
+        Subject.objects.create(
+            level=AcademicLevel.objects.get(program__code="HS", order=1), name="Art", code="ART1"
+        )
+        response = self.api.get("/api/academics/tree/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        hs_level = response.json()["programs"][1]["levels"][0]
+        self.assertEqual([s["code"] for s in hs_level["subjects"]], ["ART1", "MTH1"])
+
+    def test_users_without_a_role_here_are_refused(self):
+        # Tokens are not bound to a school, so an account from another tenant authenticates
+        outsider = APIClient(HTTP_HOST=self.domain.domain)
+        outsider.force_authenticate(User.objects.create_user(username="outsider", password="x"))
+        self.assertEqual(outsider.get("/api/academics/tree/").status_code, 403)
+
+    def test_program_list_does_not_query_per_section(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get("/api/academics/programs/")
+        self.assertEqual(response.status_code, 200)
+        # Programs, levels (with program), sections (with level and program)
+        self.assertEqual(len(counted_selects(queries)), 3)
+        program = next(p for p in response.json()["results"] if p["code"] == "HS")
+        self.assertEqual(program["levels"][0]["sections"][0]["program_name"], "Program HS")
+
+
+class ListPaginationTest(TenantTestCase):
+    """
+    Verifies list endpoints page by cursor and honour ?fields= / ?omit= down
+    to the columns and prefetches they query.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS", description="Long text")
+        for order in range(1, 6):
+            level = AcademicLevel.objects.create(program=program, name=f"Grade {order}", order=order)
+            Section.objects.create(level=level, name="A")
+            Subject.objects.create(
+                level=level, name=f"Maths {order}", code=f"MTH{order}", description="Syllabus"
+            )
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+
+    def test_cursor_pages_cover_the_table_once(self):
+        seen = []
+        url, params = "/api/academics/subjects/", {"page_size": 2}
+        while url:
+            data = self.api.get(url, params).json()
+            self.assertNotIn("count", data)
+            self.assertLessEqual(len(data["results"]), 2)
+            seen.extend(subject["code"] for subject in data["results"])
+            url, params = data["next"], None
+        self.assertEqual(sorted(seen), [f"MTH{order}" for order in range(1, 6)])
+
+    def test_fields_trims_the_serializer_and_the_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get("/api/academics/subjects/", {"fields": "id,name"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()["results"][0]), {"id", "name"})
+        (select,) = counted_selects(queries)
+        self.assertIn('"academics_subject"."name"', select)
+        self.assertNotIn('"academics_subject"."description"', select)
+
+        # Nested levels and sections are neither rendered nor prefetched
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get("/api/academics/programs/", {"omit": "levels,description"})
+        self.assertEqual(len(counted_selects(queries)), 1)
+        self.assertNotIn("levels", response.json()["results"][0])
+        self.assertNotIn('"academics_program"."description"', counted_selects(queries)[0])
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.api.get("/api/academics/subjects/", {"fields": "id,nope"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("nope", response.json()["fields"])
@@ -0,0 +1,64 @@
+"""
+The whole academic structure (programs -> levels -> sections and subjects)
+as one document for dropdowns and targeting forms.
+
+It is built from four flat queries and assembled in memory, then cached
+under the tenant's structure version, which academics.signals bumps on any
+change. The version doubles as the ETag, so unchanged trees cost clients a
+304 and the server a single cache read.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import bump_cache_version, cache_version, tenant_cache_key
+from .models import AcademicLevel, Program, Section, Subject
+
+STRUCTURE_NAMESPACE = "academic-structure"
+
+
+def structure_version():
+    return cache_version(STRUCTURE_NAMESPACE)
+
+
+def bump_structure_version():
+    bump_cache_version(STRUCTURE_NAMESPACE)
+
+
+def build_tree():
+    programs = list(
+        Program.objects.order_by("name").values("id", "name", "code", "is_active")
+    )
+    levels = AcademicLevel.objects.order_by("order", "name").values(
+        "id", "program_id", "name", "order"
+    )
+    sections = Section.objects.order_by("name").values("id", "level_id", "name", "capacity")
+    subjects = Subject.objects.order_by("name").values(
+        "id", "level_id", "name", "code", "credits", "is_elective"
+    )
+
+    levels_by_program = {}
+    levels_by_id = {}
+    for level in levels:
+        level = {**level, "sections": [], "subjects": []}
+        levels_by_id[level["id"]] = level
+        levels_by_program.setdefault(level.pop("program_id"), []).append(level)
+    for section in sections:
+        levels_by_id[section.pop("level_id")]["sections"].append(section)
+    for subject in subjects:
+        levels_by_id[subject.pop("level_id")]["subjects"].append(subject)
+
+    for program in programs:
+        program["levels"] = levels_by_program.get(program["id"], [])
+    return programs
+
+
+def get_tree():
+    """(version, programs) for the current tenant, cached per structure version."""
+    version = structure_version()
+    key = tenant_cache_key("academic-tree", version)
+    programs = cache.get(key)
+    if programs is None:
+        programs = build_tree()
+        cache.set(key, programs, settings.ACADEMIC_TREE_CACHE_TIMEOUT)
+    return version, programs
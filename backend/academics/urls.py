@@ -4,8 +4,10 @@ from .views import (
     ProgramViewSet,
     AcademicLevelViewSet,
     SectionViewSet,
+    SectionRosterView,
     SubjectViewSet,
     SubjectAssignmentViewSet,
+    AcademicTreeView,
 )
 
 router = DefaultRouter()
@@ -16,5 +18,7 @@ router.register(r"subjects", SubjectViewSet)
 router.register(r"assignments", SubjectAssignmentViewSet, basename="assignment")
 
 urlpatterns = [
+    path("tree/", AcademicTreeView.as_view(), name="academic-tree"),
+    path("sections/<uuid:pk>/roster/", SectionRosterView.as_view(), name="section-roster"),
     path("", include(router.urls)),
 ]
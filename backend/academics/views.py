@@ -1,4 +1,12 @@
-from rest_framework import viewsets, permissions
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import viewsets, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Program, AcademicLevel, Section, Subject, SubjectAssignment
 from .serializers import (
     ProgramSerializer,
@@ -8,10 +16,19 @@ from .serializers import (
     SubjectAssignmentSerializer,
 )
 from roles.permissions import HasPermission
-
-
-class ProgramViewSet(viewsets.ModelViewSet):
-    queryset = Program.objects.all().prefetch_related("levels__sections")
+from core.async_views import AsyncAPIView
+from core.mixins import SparseFieldsMixin
+from .roster import aget_roster
+from .tree import get_tree, structure_version
+
+
+class ProgramViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
+    # SectionSerializer reads level.program.name, so the prefetched levels and
+    # sections carry their parents instead of fetching them per section
+    queryset = Program.objects.all().prefetch_related(
+        Prefetch("levels", queryset=AcademicLevel.objects.select_related("program")),
+        Prefetch("levels__sections", queryset=Section.objects.select_related("level__program")),
+    )
     serializer_class = ProgramSerializer
 
     def get_permissions(self):
@@ -26,7 +43,7 @@ class ProgramViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), HasPermission("view_program")]
 
 
-class AcademicLevelViewSet(viewsets.ModelViewSet):
+class AcademicLevelViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = AcademicLevel.objects.all().select_related("program")
     serializer_class = AcademicLevelSerializer
 
@@ -48,7 +65,7 @@ class AcademicLevelViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), HasPermission("view_academic_level")]
 
 
-class SectionViewSet(viewsets.ModelViewSet):
+class SectionViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Section.objects.all().select_related("level__program")
     serializer_class = SectionSerializer
 
@@ -64,7 +81,48 @@ class SectionViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), HasPermission("view_section")]
 
 
-class SubjectViewSet(viewsets.ModelViewSet):
+class SectionRosterView(AsyncAPIView):
+    """
+    Students currently in the section with their subject enrollments and
+    latest submission (`?subject=` limits submissions to one subject).
+    Open to `view_student` holders and the section's instructors.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def get(self, request, pk):
+        try:
+            section = await Section.objects.select_related("level").aget(pk=pk)
+        except Section.DoesNotExist:
+            return self.respond({"error": "Section not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        can_view = await sync_to_async(HasPermission("view_student").has_permission)(
+            request, self
+        )
+        if not can_view:
+            can_view = await SubjectAssignment.objects.filter(
+                section=section,
+                instructor__staff_member__profile__user_id=request.user.id,
+            ).aexists()
+        if not can_view:
+            return self.respond(
+                {"error": "You do not teach this section"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        subject_id = request.query_params.get("subject")
+        if subject_id:
+            try:
+                subject_id = uuid.UUID(subject_id)
+            except ValueError:
+                return self.respond(
+                    {"error": "Invalid subject id"}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+        return self.respond(await aget_roster(section, subject_id))
+
+
+class SubjectViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Subject.objects.all().select_related("level")
     serializer_class = SubjectSerializer
 
@@ -80,7 +138,7 @@ class SubjectViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), HasPermission("view_subject")]
 
 
-class SubjectAssignmentViewSet(viewsets.ModelViewSet):
+class SubjectAssignmentViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     serializer_class = SubjectAssignmentSerializer
 
     def get_queryset(self):
@@ -123,3 +181,28 @@ class SubjectAssignmentViewSet(viewsets.ModelViewSet):
                 HasPermission("delete_subject_assignment"),
             ]
         return [permissions.IsAuthenticated(), HasPermission("view_subject_assignment")]
+
+
+class AcademicTreeView(APIView):
+    """
+    GET /api/academics/tree/
+
+    Programs -> levels -> sections and subjects in one response, for the
+    enrollment and content-targeting forms. Needs view_program, so users of
+    other schools (whose tokens are valid here too) are refused. Supports
+    If-None-Match against the structure version.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasPermission("view_program")]
+
+    def get(self, request):
+        etag = quote_etag(str(structure_version()))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        version, programs = get_tree()
+        response = Response({"version": version, "programs": programs})
+        response["ETag"] = quote_etag(str(version))
+        response["Cache-Control"] = "private, max-age=0, must-revalidate"
+        return response
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.db import connection
-from .models import User
+from .models import User, TenantMembership
 from roles.models import UserRole
 
 
@@ -60,3 +60,11 @@ class UserAdmin(GlobalOnlyAdminMixin, BaseUserAdmin):
             },
         ),
     )
+
+
+@admin.register(TenantMembership)
+class TenantMembershipAdmin(GlobalOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ("user_id", "organization", "roles", "has_profile", "updated_at")
+    list_filter = ("organization", "has_profile")
+    search_fields = ("user_id", "organization__name", "organization__schema_name")
+    readonly_fields = ("created_at", "updated_at")
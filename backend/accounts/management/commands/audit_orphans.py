@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from profiles.utils import get_global_audit_results, cleanup_orphans_for_tenant
+from accounts.utils.memberships import get_orphan_membership_tenants
 
 
 class Command(BaseCommand):
@@ -11,9 +12,17 @@ class Command(BaseCommand):
             action="store_true",
             help="Actually delete the orphaned profiles.",
         )
+        parser.add_argument(
+            "--full-scan",
+            action="store_true",
+            help="Scan every tenant schema instead of trusting the membership index.",
+        )
 
     def handle(self, *args, **options):
-        results = get_global_audit_results()
+        # The membership index narrows the scan to schemas that actually hold dead links.
+        # Run 'rebuild_memberships' first if data was changed outside the application.
+        tenants = None if options["full_scan"] else get_orphan_membership_tenants()
+        results = get_global_audit_results(tenants)
         total_orphans = 0
 
         self.stdout.write(self.style.ERROR("--- Critical Orphan Audit ---"))
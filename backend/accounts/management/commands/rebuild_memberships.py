@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from organizations.models import Organization
+from accounts.utils.memberships import rebuild_memberships_for_tenant
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the public user-to-tenant membership index from tenant UserRole and Profile data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            type=str,
+            help="Only rebuild memberships for this tenant schema.",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options.get("schema"):
+            tenants = tenants.filter(schema_name=options["schema"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['schema']}' does not exist.")
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING("--- Rebuilding Membership Index ---")
+        )
+
+        total = 0
+        for tenant in tenants:
+            count = rebuild_memberships_for_tenant(tenant)
+            total += count
+            self.stdout.write(f"Tenant: {tenant.name} ({tenant.schema_name}) - {count} memberships")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\nIndexed {total} memberships across the platform.")
+        )
@@ -26,3 +26,35 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.username
+
+
+class TenantMembership(models.Model):
+    """
+    Public-schema index answering "which schools does this user belong to".
+    Mirrors the tenant-side UserRole/Profile links so cross-tenant operations
+    (deletion, audits, school switching) don't have to visit every schema.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # SOFT LINK: Same convention as Profile.user_id, so dead links left behind
+    # by a deleted User remain visible to the orphan audit.
+    user_id = models.UUIDField()
+    organization = models.ForeignKey(
+        "organizations.Organization",
+        on_delete=models.CASCADE,
+        related_name="memberships",
+    )
+
+    # Active role slugs held in that tenant (e.g. ["owner"], ["student"])
+    roles = models.JSONField(default=list, blank=True)
+    has_profile = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user_id", "organization")
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.organization_id}"
@@ -1,14 +1,17 @@
-from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_delete, pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.db import connection
+from django.db import connection, transaction
 from django.apps import apps
 from django_tenants.utils import schema_context
 import logging
 
 logger = logging.getLogger(__name__)
 
-from .models import User
+from .models import User, TenantMembership
+from .utils.memberships import sync_membership
 from organizations.models import Organization
+from profiles.models import Profile
+from roles.models import UserRole
 
 
 @receiver(pre_delete, sender=User)
@@ -20,22 +23,68 @@ def cleanup_user_tenant_data(sender, instance, **kwargs):
     user_id = instance.id
     db = instance._state.db or "default"
 
-    # 1. Fetch all tenants requiring cleanup
+    # 1. Fetch only the tenants this user belongs to (indexed membership lookup)
     try:
-        tenants = list(Organization.objects.using(db).exclude(schema_name="public"))
+        tenants = list(
+            Organization.objects.using(db)
+            .filter(memberships__user_id=user_id)
+            .exclude(schema_name="public")
+            .distinct()
+        )
     except Exception as e:
         logger.error(f"Failed to fetch tenants for user cleanup: {str(e)}")
         return
 
     # 2. Iterate through each tenant and perform the purge
+    purged = []
     for tenant in tenants:
         with schema_context(tenant.schema_name):
             try:
-                ProfileModel = apps.get_model("profiles", "Profile")
-                # Using .all() to force a clean queryset on the current schema context
-                ProfileModel.objects.using(db).filter(user_id=user_id).delete()
+                # A savepoint per tenant, so one failure doesn't abort the user's deletion
+                with transaction.atomic(using=db):
+                    ProfileModel = apps.get_model("profiles", "Profile")
+                    # Using .all() to force a clean queryset on the current schema context
+                    ProfileModel.objects.using(db).filter(user_id=user_id).delete()
             except Exception as e:
                 logger.warning(
                     f"Could not purge data for user {user_id} in schema {tenant.schema_name}: {str(e)}"
                 )
                 continue
+        purged.append(tenant)
+
+    # 3. Drop the index rows of purged tenants only; the others keep pointing
+    # audit_orphans at the data left behind
+    TenantMembership.objects.using(db).filter(
+        user_id=user_id, organization__in=purged
+    ).delete()
+
+
+# --- Membership Index Sync ---
+# UserRole and Profile live in tenant schemas; every change to them is mirrored
+# into the public TenantMembership table for the active tenant.
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def sync_membership_from_role(sender, instance, **kwargs):
+    sync_membership(instance.user_id)
+
+
+@receiver(pre_save, sender=Profile)
+def remember_previous_profile_user(sender, instance, **kwargs):
+    # Activation/revocation changes user_id; keep the old value so its membership is refreshed too
+    if instance._state.adding:
+        instance._previous_user_id = None
+        return
+    instance._previous_user_id = (
+        Profile.objects.filter(pk=instance.pk).values_list("user_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def sync_membership_from_profile(sender, instance, **kwargs):
+    previous_user_id = getattr(instance, "_previous_user_id", None)
+    if previous_user_id and previous_user_id != instance.user_id:
+        sync_membership(previous_user_id)
+    sync_membership(instance.user_id)
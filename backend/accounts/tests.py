@@ -7,7 +7,8 @@ import uuid
 from accounts.models import User
 from organizations.models import Organization, Domain
 from profiles.models import Profile
-from django_tenants.utils import tenant_context
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context, tenant_context
 import uuid
 
 
@@ -130,7 +131,77 @@ class EduSekaiIdentityJanitorTest(TransactionTestCase):
         self.assertIn("Oxford University", report)
         self.assertIn("1 dead links DETECTED", report)
 
+    def test_membership_index_tracks_tenant_links(self):
+        """
+        Scenario: A user gets a role in one school and a profile in another.
+        Expectation: The public membership index lists both schools, and the
+        rebuild command reproduces it from tenant data.
+        """
+        from accounts.models import TenantMembership
+        from roles.models import Role, UserRole
+
+        with tenant_context(self.school_a):
+            owner_role = Role.objects.get(slug="owner")
+            UserRole.objects.create(user=self.user, role=owner_role)
+
+        with tenant_context(self.school_b):
+            Profile.objects.create(
+                user_id=self.user.id, first_name="Indy", last_name="Jones"
+            )
+
+        connection.set_schema_to_public()
+        memberships = {
+            m.organization_id: m
+            for m in TenantMembership.objects.filter(user_id=self.user.id)
+        }
+        self.assertEqual(set(memberships), {self.school_a.id, self.school_b.id})
+        self.assertEqual(memberships[self.school_a.id].roles, ["owner"])
+        self.assertTrue(memberships[self.school_b.id].has_profile)
+
+        TenantMembership.objects.all().delete()
+        call_command("rebuild_memberships", stdout=StringIO())
+        self.assertEqual(
+            TenantMembership.objects.filter(user_id=self.user.id).count(), 2
+        )
+
     def tearDown(self):
         connection.set_schema_to_public()
         self.school_a.delete()
         self.school_b.delete()
+
+
+class UserPurgeIndexTest(TenantTestCase):
+    """
+    Verifies that a tenant whose purge fails keeps its membership row, so the
+    orphan audit still visits it.
+    """
+
+    def test_failed_purge_keeps_the_membership(self):
+        from accounts.models import TenantMembership
+        from accounts.utils.memberships import get_orphan_membership_tenants
+
+        user = User.objects.create_user(username="leaver", password="x")
+        user_id = user.id
+        Profile.objects.create(user_id=user_id, first_name="Lea", last_name="Ver")
+        # A half-migrated tenant, so purging it fails
+        broken = Organization(schema_name="school_broken", name="Broken School")
+        broken.auto_create_schema = False
+        with schema_context("public"):
+            broken.save()
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE SCHEMA school_broken")
+            cursor.execute("CREATE TABLE school_broken.profiles_profile (id uuid)")
+        TenantMembership.objects.create(user_id=user_id, organization=broken, has_profile=True)
+
+        user.delete()
+
+        self.assertFalse(Profile.objects.filter(user_id=user_id).exists())
+        self.assertEqual(
+            list(
+                TenantMembership.objects.filter(user_id=user_id).values_list(
+                    "organization_id", flat=True
+                )
+            ),
+            [broken.id],
+        )
+        self.assertEqual(list(get_orphan_membership_tenants()), [broken])
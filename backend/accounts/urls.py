@@ -4,6 +4,7 @@ from .views import (
     LoginView,
     LogoutView,
     MeView,
+    MySchoolsView,
     TokenRefreshView,
     VerifyAccountView,
     ChangePasswordView,
@@ -19,6 +20,7 @@ urlpatterns = [
     path("logout/", LogoutView.as_view(), name="logout"),
     path("refresh/", TokenRefreshView.as_view(), name="token-refresh"),
     path("me/", MeView.as_view(), name="me"),
+    path("schools/", MySchoolsView.as_view(), name="my-schools"),
     path("verify-account/", VerifyAccountView.as_view(), name="verify-account"),
     path("change-password/", ChangePasswordView.as_view(), name="change-password"),
 ]
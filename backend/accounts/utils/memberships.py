@@ -0,0 +1,143 @@
+from django.db import connection
+from django_tenants.utils import get_public_schema_name, tenant_context
+
+
+def _current_organization():
+    """
+    Resolves the Organization for the active schema.
+    schema_context() only installs a FakeTenant (no pk), so fall back to a lookup.
+    """
+    from organizations.models import Organization
+
+    if connection.schema_name == get_public_schema_name():
+        return None
+
+    tenant = getattr(connection, "tenant", None)
+    if tenant is not None and getattr(tenant, "pk", None):
+        return tenant
+
+    return Organization.objects.filter(schema_name=connection.schema_name).first()
+
+
+def sync_membership(user_id, organization=None):
+    """
+    Recomputes the membership row of one user for the current tenant.
+    Must be called inside the tenant's schema context.
+    """
+    from accounts.models import TenantMembership
+    from profiles.models import Profile
+    from roles.models import UserRole
+
+    if not user_id:
+        return None
+
+    organization = organization or _current_organization()
+    if organization is None:
+        return None
+
+    roles = sorted(
+        UserRole.objects.filter(user_id=user_id, is_active=True).values_list(
+            "role__slug", flat=True
+        )
+    )
+    has_profile = Profile.objects.filter(user_id=user_id).exists()
+
+    if not roles and not has_profile:
+        TenantMembership.objects.filter(
+            user_id=user_id, organization=organization
+        ).delete()
+        return None
+
+    membership, _ = TenantMembership.objects.update_or_create(
+        user_id=user_id,
+        organization=organization,
+        defaults={"roles": roles, "has_profile": has_profile},
+    )
+    return membership
+
+
+def rebuild_memberships_for_tenant(organization):
+    """
+    Rebuilds every membership row of one tenant from its UserRole and Profile tables.
+    Returns the number of memberships written.
+    """
+    from accounts.models import TenantMembership
+    from profiles.models import Profile
+    from roles.models import UserRole
+
+    with tenant_context(organization):
+        entries = {}
+        for user_id, slug in UserRole.objects.filter(is_active=True).values_list(
+            "user_id", "role__slug"
+        ):
+            entries.setdefault(user_id, {"roles": [], "has_profile": False})
+            entries[user_id]["roles"].append(slug)
+
+        for user_id in Profile.objects.filter(user_id__isnull=False).values_list(
+            "user_id", flat=True
+        ):
+            entries.setdefault(user_id, {"roles": [], "has_profile": False})
+            entries[user_id]["has_profile"] = True
+
+    TenantMembership.objects.filter(organization=organization).delete()
+    TenantMembership.objects.bulk_create(
+        [
+            TenantMembership(
+                user_id=user_id,
+                organization=organization,
+                roles=sorted(data["roles"]),
+                has_profile=data["has_profile"],
+            )
+            for user_id, data in entries.items()
+        ]
+    )
+    return len(entries)
+
+
+def get_user_schools(user_id):
+    """
+    Serializable list of the user's schools for login routing and school switching.
+    Two queries regardless of the number of schools.
+    """
+    from accounts.models import TenantMembership
+
+    memberships = TenantMembership.objects.filter(
+        user_id=user_id,
+        organization__is_active=True,
+    ).select_related("organization").prefetch_related("organization__domains")
+
+    schools = []
+    for membership in memberships:
+        organization = membership.organization
+        if organization.schema_name == get_public_schema_name():
+            continue
+        domains = list(organization.domains.all())
+        primary = next((d for d in domains if d.is_primary), None) or (
+            domains[0] if domains else None
+        )
+        schools.append(
+            {
+                "id": organization.id,
+                "name": organization.name,
+                "schema_name": organization.schema_name,
+                "domain": primary.domain if primary else None,
+                "roles": membership.roles,
+            }
+        )
+    return sorted(schools, key=lambda school: school["name"])
+
+
+def get_orphan_membership_tenants():
+    """
+    Tenants holding memberships whose user no longer exists (single anti-join).
+    Lets the orphan audit visit only the schemas that actually have dead links.
+    """
+    from accounts.models import TenantMembership, User
+    from organizations.models import Organization
+
+    orphan_org_ids = (
+        TenantMembership.objects.exclude(user_id__in=User.objects.values("id"))
+        .values_list("organization_id", flat=True)
+        .distinct()
+    )
+    return Organization.objects.filter(id__in=orphan_org_ids)
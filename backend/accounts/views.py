@@ -4,8 +4,11 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework import status
 from django.conf import settings
 
+from core.async_views import AsyncAPIView
+
 from .serializers import LoginSerializer, OrganizationRegisterSerializer, UserSerializer
 from .utils.jwt_cookies import set_jwt_cookies, clear_jwt_cookies, set_access_cookie
+from .utils.memberships import get_user_schools
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 
@@ -36,7 +39,14 @@ class LoginView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
 
-        response = Response({"message": "Login successful"}, status=status.HTTP_200_OK)
+        data = {"message": "Login successful"}
+
+        # On the main site, tell the client which school(s) to route the user to
+        tenant = getattr(request, "tenant", None)
+        if not tenant or tenant.schema_name == "public":
+            data["schools"] = get_user_schools(user.id)
+
+        response = Response(data, status=status.HTTP_200_OK)
         set_jwt_cookies(response, user)
         return response
 
@@ -77,10 +87,15 @@ class TokenRefreshView(APIView):
             )
 
 
-class MeView(APIView):
+class MeView(AsyncAPIView):
+    """
+    The current user with their roles, active role permissions and profile
+    in this school. Polled by every client, so it is served async.
+    """
+
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
+    async def get(self, request):
         user = request.user
         tenant = getattr(request, "tenant", None)
         requested_role = request.query_params.get("active_role")
@@ -99,7 +114,9 @@ class MeView(APIView):
         if tenant and tenant.schema_name != "public":
             from roles.models import UserRole
 
-            role_objects = UserRole.objects.filter(user=user).select_related("role")
+            role_objects = [
+                ur async for ur in UserRole.objects.filter(user=user).select_related("role")
+            ]
 
             role_slugs = [ur.role.slug for ur in role_objects]
             data["roles"] = role_slugs
@@ -126,21 +143,36 @@ class MeView(APIView):
                     if active_user_role.role.slug == "owner":
                         data["permissions"] = ["*"]  # Superuser wildcard
                     else:
-                        data["permissions"] = list(
-                            active_user_role.role.permissions.values_list(
+                        data["permissions"] = [
+                            codename
+                            async for codename in active_user_role.role.permissions.values_list(
                                 "codename", flat=True
                             )
-                        )
+                        ]
 
             # Fetch Unified Profile
             from profiles.models import Profile
             from profiles.serializers import ProfileSerializer
 
-            profile = Profile.objects.filter(user_id=user.id).first()
+            profile = await Profile.objects.filter(user_id=user.id).afirst()
             if profile:
+                # Already loaded; the serializer would otherwise query it from the event loop
+                profile._user_cache = user
                 data["profile"] = ProfileSerializer(profile).data
 
-        return Response(data)
+        return self.respond(data)
+
+
+class MySchoolsView(APIView):
+    """
+    Lists every school the current user belongs to, for the school switcher.
+    Served from the public membership index instead of probing each tenant schema.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_user_schools(request.user.id))
 
 
 class VerifyAccountView(APIView):
@@ -1,3 +1,24 @@
 from django.contrib import admin
+from .models import AttendanceSheet, MonthlyStudentAttendance, SectionDailyAttendance
 
-# Register your models here.
+
+@admin.register(AttendanceSheet)
+class AttendanceSheetAdmin(admin.ModelAdmin):
+    list_display = ["section", "date", "period", "marked_by", "updated_at"]
+    list_filter = ["date", "period"]
+    raw_id_fields = ["section", "marked_by"]
+    readonly_fields = ["created_at", "updated_at"]
+
+
+@admin.register(MonthlyStudentAttendance)
+class MonthlyStudentAttendanceAdmin(admin.ModelAdmin):
+    list_display = ["student", "month", "section", "present", "absent", "late", "excused"]
+    list_filter = ["month"]
+    raw_id_fields = ["student", "section"]
+
+
+@admin.register(SectionDailyAttendance)
+class SectionDailyAttendanceAdmin(admin.ModelAdmin):
+    list_display = ["section", "level", "date", "present", "absent", "late", "excused"]
+    list_filter = ["date"]
+    raw_id_fields = ["section", "level"]
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from attendance.utils import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recomputes monthly student and daily section attendance rollups from attendance sheets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            type=str,
+            help="Tenant schema to rebuild (default: every tenant)",
+        )
+        parser.add_argument(
+            "--from",
+            dest="start",
+            type=str,
+            help="First date to rebuild (YYYY-MM-DD, widened to the start of its month)",
+        )
+        parser.add_argument(
+            "--to",
+            dest="end",
+            type=str,
+            help="Last date to rebuild (YYYY-MM-DD, widened to the end of its month)",
+        )
+
+    def handle(self, *args, **options):
+        start = self._parse(options.get("start"), "--from")
+        end = self._parse(options.get("end"), "--to")
+
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options.get("schema"):
+            tenants = tenants.filter(schema_name=options["schema"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['schema']}' does not exist.")
+
+        for tenant in tenants:
+            with tenant_context(tenant):
+                sheets, monthly, daily = rebuild_rollups(start, end)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{tenant.name} ({tenant.schema_name}): {sheets} sheets -> "
+                    f"{monthly} monthly student rows, {daily} daily section rows"
+                )
+            )
+
+    def _parse(self, value, flag):
+        if not value:
+            return None
+        parsed = parse_date(value)
+        if not parsed:
+            raise CommandError(f"{flag} must be a date in YYYY-MM-DD format.")
+        return parsed
@@ -0,0 +1,139 @@
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+import uuid
+
+
+class AttendanceStatus(models.TextChoices):
+    PRESENT = "P", "Present"
+    ABSENT = "A", "Absent"
+    LATE = "L", "Late"
+    EXCUSED = "E", "Excused"
+
+
+# Maps a status code to its counter column on the rollup tables
+STATUS_FIELDS = {
+    AttendanceStatus.PRESENT: "present",
+    AttendanceStatus.ABSENT: "absent",
+    AttendanceStatus.LATE: "late",
+    AttendanceStatus.EXCUSED: "excused",
+}
+
+
+class AttendanceSheet(models.Model):
+    """
+    Attendance of a whole section for one period of one day.
+    Per-student statuses are packed into `statuses` (one AttendanceStatus code
+    per student, aligned with `student_ids`), so marking a section is a single
+    row write instead of one INSERT per student.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    section = models.ForeignKey(
+        "academics.Section", on_delete=models.CASCADE, related_name="attendance_sheets"
+    )
+    date = models.DateField()
+    period = models.PositiveSmallIntegerField(default=1)
+
+    # Packed roster: statuses[i] is the status of student_ids[i]
+    student_ids = ArrayField(models.UUIDField(), default=list, blank=True)
+    statuses = models.TextField(blank=True)
+
+    marked_by = models.ForeignKey(
+        "staff.StaffMember",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="marked_attendance",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["section", "date", "period"]
+        ordering = ["-date", "period"]
+        indexes = [
+            models.Index(fields=["date"], name="attendance_sheet_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.section} on {self.date} (P{self.period})"
+
+    def as_dict(self):
+        """Unpacks the roster into {student_id: status_code}."""
+        return dict(zip(self.student_ids, self.statuses))
+
+
+class MonthlyStudentAttendance(models.Model):
+    """
+    Precomputed per-student counters for one calendar month.
+    Maintained incrementally whenever a sheet is marked.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(
+        "students.Student", on_delete=models.CASCADE, related_name="attendance_months"
+    )
+    month = models.DateField(help_text="First day of the month")
+    section = models.ForeignKey(
+        "academics.Section",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="monthly_attendance",
+    )
+
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    excused = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["student", "month"]
+        ordering = ["-month"]
+        indexes = [
+            models.Index(fields=["section", "month"], name="attendance_month_section_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} {self.month:%Y-%m}"
+
+    @property
+    def total(self):
+        return self.present + self.absent + self.late + self.excused
+
+
+class SectionDailyAttendance(models.Model):
+    """
+    Precomputed counters of all student-period marks of a section on one day.
+    Level is denormalized so level/program aggregates never touch the sheets.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    section = models.ForeignKey(
+        "academics.Section", on_delete=models.CASCADE, related_name="daily_attendance"
+    )
+    level = models.ForeignKey(
+        "academics.AcademicLevel",
+        on_delete=models.CASCADE,
+        related_name="daily_attendance",
+    )
+    date = models.DateField()
+
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    excused = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ["section", "date"]
+        ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["level", "date"], name="attendance_day_level_idx"),
+            models.Index(fields=["date"], name="attendance_day_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.section_id} {self.date}"
@@ -0,0 +1,87 @@
+from rest_framework import serializers
+from academics.models import Section
+from .models import AttendanceSheet, AttendanceStatus, MonthlyStudentAttendance
+from .utils import summarize_statuses
+
+
+class AttendanceSheetSerializer(serializers.ModelSerializer):
+    section_name = serializers.CharField(source="section.name", read_only=True)
+    level_name = serializers.CharField(source="section.level.name", read_only=True)
+    summary = serializers.SerializerMethodField()
+    records = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AttendanceSheet
+        fields = [
+            "id",
+            "section",
+            "section_name",
+            "level_name",
+            "date",
+            "period",
+            "summary",
+            "records",
+            "marked_by",
+            "created_at",
+            "updated_at",
+        ]
+
+    def get_summary(self, obj):
+        return summarize_statuses(obj.statuses)
+
+    def get_records(self, obj):
+        return [
+            {"student_id": student_id, "status": status}
+            for student_id, status in zip(obj.student_ids, obj.statuses)
+        ]
+
+
+class AttendanceRecordSerializer(serializers.Serializer):
+    student_id = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=AttendanceStatus.choices)
+
+
+class MarkAttendanceSerializer(serializers.Serializer):
+    """
+    Payload for marking a whole section at once. Only students whose status
+    differs from `default_status` need to be listed in `records`.
+    """
+
+    section_id = serializers.UUIDField()
+    date = serializers.DateField()
+    period = serializers.IntegerField(min_value=1, default=1)
+    default_status = serializers.ChoiceField(
+        choices=AttendanceStatus.choices, default=AttendanceStatus.PRESENT
+    )
+    records = AttendanceRecordSerializer(many=True, required=False, default=list)
+
+    def validate_section_id(self, value):
+        section = Section.objects.filter(id=value).first()
+        if not section:
+            raise serializers.ValidationError("Section not found")
+        self.context["section"] = section
+        return value
+
+    def validate_records(self, value):
+        student_ids = [record["student_id"] for record in value]
+        if len(student_ids) != len(set(student_ids)):
+            raise serializers.ValidationError("Each student may only appear once.")
+        return value
+
+
+class MonthlyStudentAttendanceSerializer(serializers.ModelSerializer):
+    total = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = MonthlyStudentAttendance
+        fields = [
+            "id",
+            "student",
+            "month",
+            "section",
+            "present",
+            "absent",
+            "late",
+            "excused",
+            "total",
+        ]
@@ -1,3 +1,127 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIClient
+
+from academics.models import Program, AcademicLevel, Section
+from accounts.models import User
+from profiles.models import Profile
+from students.models import Student, StudentLevel
+from .models import AttendanceSheet, MonthlyStudentAttendance, SectionDailyAttendance
+from .utils import mark_section, rebuild_rollups
+
+
+class SectionAttendanceTest(TenantTestCase):
+    """
+    Verifies that a whole section is stored as one packed row and that
+    the monthly rollups only move by the status changes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        level = AcademicLevel.objects.create(program=program, name="Grade 9", order=1)
+        self.section = Section.objects.create(level=level, name="A")
+
+        self.students = []
+        for index in range(5):
+            profile = Profile.objects.create(first_name=f"Student{index}", last_name="Test")
+            student = Student.objects.create(profile=profile, enrollment_id=f"STD-{index}")
+            StudentLevel.objects.create(
+                student=student,
+                level=level,
+                section=self.section,
+                academic_year="2026",
+            )
+            self.students.append(student)
+
+    def test_mark_whole_section_is_one_row(self):
+        absent = self.students[0].id
+        sheet, created = mark_section(
+            self.section, date(2026, 1, 15), 1, {absent: "A"}, default_status="P"
+        )
+
+        self.assertTrue(created)
+        self.assertEqual(AttendanceSheet.objects.count(), 1)
+        self.assertEqual(len(sheet.student_ids), 5)
+        self.assertEqual(sheet.as_dict()[absent], "A")
+        self.assertEqual(sheet.statuses.count("P"), 4)
+
+        rollup = MonthlyStudentAttendance.objects.get(student_id=absent)
+        self.assertEqual((rollup.month, rollup.absent, rollup.present), (date(2026, 1, 1), 1, 0))
+
+    def test_remarking_applies_only_the_delta(self):
+        student = self.students[1].id
+        mark_section(self.section, date(2026, 1, 15), 1, {student: "A"}, "P")
+        mark_section(self.section, date(2026, 1, 15), 1, {student: "L"}, "P")
+        mark_section(self.section, date(2026, 1, 16), 1, {}, "P")
+
+        self.assertEqual(AttendanceSheet.objects.count(), 2)
+        rollup = MonthlyStudentAttendance.objects.get(student_id=student)
+        self.assertEqual((rollup.present, rollup.absent, rollup.late), (1, 0, 1))
+
+    def test_unknown_student_is_rejected(self):
+        outsider = Student.objects.create(
+            profile=Profile.objects.create(first_name="Out", last_name="Sider"),
+            enrollment_id="STD-X",
+        )
+        with self.assertRaises(ValueError):
+            mark_section(self.section, date(2026, 1, 15), 1, {outsider.id: "A"}, "P")
+        self.assertFalse(AttendanceSheet.objects.exists())
+
+    def test_mark_endpoint(self):
+        admin = User.objects.create_superuser(username="principal", password="x")
+        api = APIClient(HTTP_HOST=self.domain.domain)
+        api.force_authenticate(admin)
+        response = api.post(
+            "/api/attendance/sheets/mark/",
+            {
+                "section_id": str(self.section.id),
+                "date": "2026-01-15",
+                "records": [{"student_id": str(self.students[2].id), "status": "E"}],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["summary"]["excused"], 1)
+        self.assertEqual(response.json()["summary"]["present"], 4)
+
+    def test_analytics_match_rebuilt_rollups(self):
+        mark_section(self.section, date(2026, 1, 15), 1, {self.students[0].id: "A"}, "P")
+        mark_section(self.section, date(2026, 1, 15), 2, {self.students[0].id: "L"}, "P")
+        mark_section(self.section, date(2026, 2, 2), 1, {}, "A")
+
+        day = SectionDailyAttendance.objects.get(section=self.section, date=date(2026, 1, 15))
+        self.assertEqual((day.present, day.absent, day.late), (8, 1, 1))
+
+        admin = User.objects.create_superuser(username="analyst", password="x")
+        api = APIClient(HTTP_HOST=self.domain.domain)
+        api.force_authenticate(admin)
+
+        sections = api.get(
+            "/api/attendance/analytics/sections/", {"from": "2026-01-01", "to": "2026-01-31"}
+        ).json()
+        self.assertEqual(sections[0]["total"], 10)
+        self.assertEqual(sections[0]["attendance_rate"], 90.0)
+
+        students = api.get(
+            "/api/attendance/analytics/students/", {"student": str(self.students[0].id)}
+        ).json()
+        self.assertEqual((students[0]["late"], students[0]["absent"], students[0]["total"]), (1, 2, 3))
+
+        for path, param in [("students", "student"), ("sections", "section"), ("levels", "program")]:
+            response = api.get(f"/api/attendance/analytics/{path}/", {param: "not-a-uuid"})
+            self.assertEqual(response.status_code, 400, response.content)
+            self.assertIn(param, response.json())
+
+        def snapshot():
+            return list(
+                MonthlyStudentAttendance.objects.order_by("student_id", "month").values(
+                    "student_id", "month", "section_id", "present", "absent", "late", "excused"
+                )
+            )
+
+        incremental = snapshot()
+        rebuild_rollups()
+        self.assertEqual(incremental, snapshot())
@@ -0,0 +1,16 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import (
+    AttendanceSheetViewSet,
+    MonthlyStudentAttendanceViewSet,
+    AttendanceAnalyticsViewSet,
+)
+
+router = DefaultRouter()
+router.register(r"sheets", AttendanceSheetViewSet)
+router.register(r"monthly", MonthlyStudentAttendanceViewSet)
+router.register(r"analytics", AttendanceAnalyticsViewSet, basename="attendance-analytics")
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
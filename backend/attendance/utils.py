@@ -0,0 +1,234 @@
+import calendar
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest
+
+from students.models import StudentLevel
+from .models import (
+    AttendanceSheet,
+    MonthlyStudentAttendance,
+    SectionDailyAttendance,
+    STATUS_FIELDS,
+)
+
+
+def get_section_roster(section_id):
+    """Ids of active students currently placed in the section, in a stable order."""
+    return list(
+        StudentLevel.objects.filter(
+            section_id=section_id, is_current=True, student__status="active"
+        )
+        .order_by("student__profile__first_name", "student__profile__last_name")
+        .values_list("student_id", flat=True)
+    )
+
+
+def month_start(date):
+    return date.replace(day=1)
+
+
+def month_end(date):
+    return date.replace(day=calendar.monthrange(date.year, date.month)[1])
+
+
+def compute_deltas(old_map, new_map):
+    """
+    Counter changes per student between two {student_id: status} snapshots.
+    Returns {student_id: {field: +/-n}} for students whose status changed.
+    """
+    deltas = {}
+    for student_id in set(old_map) | set(new_map):
+        old_status = old_map.get(student_id)
+        new_status = new_map.get(student_id)
+        if old_status == new_status:
+            continue
+
+        changes = defaultdict(int)
+        if old_status in STATUS_FIELDS:
+            changes[STATUS_FIELDS[old_status]] -= 1
+        if new_status in STATUS_FIELDS:
+            changes[STATUS_FIELDS[new_status]] += 1
+        deltas[student_id] = changes
+    return deltas
+
+
+def apply_monthly_deltas(month, section_id, deltas):
+    """
+    Folds counter changes into the monthly per-student rollup.
+    Three statements regardless of roster size: seed missing rows, lock, bulk update.
+    """
+    if not deltas:
+        return
+
+    student_ids = list(deltas)
+    MonthlyStudentAttendance.objects.bulk_create(
+        [
+            MonthlyStudentAttendance(
+                student_id=student_id, month=month, section_id=section_id
+            )
+            for student_id in student_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+    rows = list(
+        MonthlyStudentAttendance.objects.select_for_update().filter(
+            student_id__in=student_ids, month=month
+        )
+    )
+    for row in rows:
+        for field, change in deltas[row.student_id].items():
+            setattr(row, field, max(getattr(row, field) + change, 0))
+        row.section_id = section_id
+
+    MonthlyStudentAttendance.objects.bulk_update(
+        rows, list(STATUS_FIELDS.values()) + ["section", "updated_at"]
+    )
+
+
+def apply_section_delta(section, date, old_statuses, new_statuses):
+    """Moves the (section, day) counters by the difference between two packed rosters."""
+    old_counts = summarize_statuses(old_statuses)
+    new_counts = summarize_statuses(new_statuses)
+    changes = {
+        field: new_counts[field] - old_counts[field]
+        for field in STATUS_FIELDS.values()
+        if new_counts[field] != old_counts[field]
+    }
+    if not changes:
+        return
+
+    SectionDailyAttendance.objects.get_or_create(
+        section=section, date=date, defaults={"level_id": section.level_id}
+    )
+    SectionDailyAttendance.objects.filter(section=section, date=date).update(
+        **{field: Greatest(F(field) + change, 0) for field, change in changes.items()}
+    )
+
+
+@transaction.atomic
+def mark_section(section, date, period, records, default_status, marked_by=None):
+    """
+    Records attendance for a whole section in one row write.
+    `records` maps student_id -> status for the students that differ from
+    `default_status` (or from what was already marked on this sheet).
+    Returns (sheet, created).
+    """
+    # Two first marks of the same sheet race on the unique (section, date,
+    # period): the loser's insert waits for the winner and get_or_create then
+    # returns the winner's row, which both lock before reading it
+    sheet, created = AttendanceSheet.objects.get_or_create(
+        section=section, date=date, period=period
+    )
+    sheet = AttendanceSheet.objects.select_for_update().get(pk=sheet.pk)
+    old_map = sheet.as_dict()
+
+    # Students who left the section keep their already-marked status on this sheet
+    roster = get_section_roster(section.id)
+    on_roster = set(roster)
+    roster += [student_id for student_id in old_map if student_id not in on_roster]
+
+    unknown = set(records) - set(roster)
+    if unknown:
+        raise ValueError(
+            f"{len(unknown)} student(s) are not part of this section's roster."
+        )
+
+    new_map = {
+        student_id: records.get(student_id, old_map.get(student_id, default_status))
+        for student_id in roster
+    }
+
+    sheet.student_ids = roster
+    sheet.statuses = "".join(new_map[student_id] for student_id in roster)
+    sheet.marked_by = marked_by
+    sheet.save()
+
+    apply_monthly_deltas(month_start(date), section.id, compute_deltas(old_map, new_map))
+    apply_section_delta(section, date, "".join(old_map.values()), sheet.statuses)
+
+    return sheet, created
+
+
+def summarize_statuses(statuses):
+    """Counts per status field for a packed status string."""
+    return {field: statuses.count(code) for code, field in STATUS_FIELDS.items()}
+
+
+def with_rate(row):
+    """
+    Adds `total` and `attendance_rate` (present + late over all marks, in %)
+    to an aggregated counter row.
+    """
+    total = sum(row[field] or 0 for field in STATUS_FIELDS.values())
+    attended = (row["present"] or 0) + (row["late"] or 0)
+    row["total"] = total
+    row["attendance_rate"] = round(attended * 100 / total, 2) if total else None
+    return row
+
+
+def counter_sums():
+    return {field: Sum(field) for field in STATUS_FIELDS.values()}
+
+
+@transaction.atomic
+def rebuild_rollups(start=None, end=None):
+    """
+    Recomputes both rollup tables from the attendance sheets.
+    The range is widened to whole months so monthly rows are never partial.
+    Returns (sheet_count, monthly_rows, daily_rows).
+    """
+    sheets = AttendanceSheet.objects.all()
+    monthly = MonthlyStudentAttendance.objects.all()
+    daily = SectionDailyAttendance.objects.all()
+
+    if start:
+        start = month_start(start)
+        sheets = sheets.filter(date__gte=start)
+        monthly = monthly.filter(month__gte=start)
+        daily = daily.filter(date__gte=start)
+    if end:
+        end = month_end(end)
+        sheets = sheets.filter(date__lte=end)
+        monthly = monthly.filter(month__lte=end)
+        daily = daily.filter(date__lte=end)
+
+    monthly.delete()
+    daily.delete()
+
+    student_months = {}
+    section_days = {}
+    sheet_count = 0
+
+    # Sheets are ordered by date so the latest section wins for a student's month
+    for section_id, level_id, date, student_ids, statuses in (
+        sheets.order_by("date", "period")
+        .values_list(
+            "section_id", "section__level_id", "date", "student_ids", "statuses"
+        )
+        .iterator()
+    ):
+        sheet_count += 1
+        day = section_days.setdefault(
+            (section_id, date),
+            SectionDailyAttendance(section_id=section_id, level_id=level_id, date=date),
+        )
+        month = month_start(date)
+        for student_id, code in zip(student_ids, statuses):
+            field = STATUS_FIELDS.get(code)
+            if not field:
+                continue
+            setattr(day, field, getattr(day, field) + 1)
+            row = student_months.setdefault(
+                (student_id, month),
+                MonthlyStudentAttendance(student_id=student_id, month=month),
+            )
+            row.section_id = section_id
+            setattr(row, field, getattr(row, field) + 1)
+
+    MonthlyStudentAttendance.objects.bulk_create(student_months.values(), batch_size=1000)
+    SectionDailyAttendance.objects.bulk_create(section_days.values(), batch_size=1000)
+
+    return sheet_count, len(student_months), len(section_days)
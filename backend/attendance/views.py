@@ -1,3 +1,230 @@
-from django.shortcuts import render
+import uuid
 
-# Create your views here.
+from rest_framework import viewsets, status, permissions
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from django.utils.dateparse import parse_date
+from django_filters.rest_framework import DjangoFilterBackend
+
+from .models import AttendanceSheet, MonthlyStudentAttendance, SectionDailyAttendance
+from .serializers import (
+    AttendanceSheetSerializer,
+    MarkAttendanceSerializer,
+    MonthlyStudentAttendanceSerializer,
+)
+from .utils import mark_section, month_start, with_rate, counter_sums
+from roles.permissions import HasPermission
+from core.mixins import SparseFieldsMixin
+
+
+class AttendanceSheetViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = AttendanceSheet.objects.all().select_related("section__level")
+    serializer_class = AttendanceSheetSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {
+        "section": ["exact"],
+        "period": ["exact"],
+        "date": ["exact", "gte", "lte"],
+    }
+
+    def get_permissions(self):
+        if self.action == "mark":
+            return [permissions.IsAuthenticated(), HasPermission("mark_attendance")]
+        return [permissions.IsAuthenticated(), HasPermission("view_attendance")]
+
+    @action(detail=False, methods=["post"])
+    def mark(self, request):
+        """
+        Mark attendance for a whole section in one call.
+        Payload: {
+            "section_id": "uuid",
+            "date": "2026-01-15",
+            "period": 1,
+            "default_status": "P",
+            "records": [{"student_id": "uuid", "status": "A"}]
+        }
+        """
+        serializer = MarkAttendanceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        from profiles.models import Profile
+
+        profile = (
+            Profile.objects.filter(user_id=request.user.id)
+            .select_related("staff_record")
+            .first()
+        )
+        marked_by = getattr(profile, "staff_record", None) if profile else None
+
+        try:
+            sheet, created = mark_section(
+                section=serializer.context["section"],
+                date=data["date"],
+                period=data["period"],
+                records={r["student_id"]: r["status"] for r in data["records"]},
+                default_status=data["default_status"],
+                marked_by=marked_by,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            AttendanceSheetSerializer(sheet).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class MonthlyStudentAttendanceViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = MonthlyStudentAttendance.objects.all()
+    serializer_class = MonthlyStudentAttendanceSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {
+        "student": ["exact"],
+        "section": ["exact"],
+        "month": ["exact", "gte", "lte"],
+    }
+    permission_classes = [permissions.IsAuthenticated, HasPermission("view_attendance")]
+
+
+class AttendanceAnalyticsViewSet(viewsets.ViewSet):
+    """
+    Attendance percentages served purely from the rollup tables.
+    Cost depends on the number of days/months in the range, never on the
+    number of students or periods marked.
+
+    Query params: from, to (YYYY-MM-DD) plus the entity filters of each action.
+    Student figures come from monthly rollups, so their range is month-granular.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasPermission("view_attendance")]
+
+    def _date_range(self, request):
+        bounds = {}
+        for param in ["from", "to"]:
+            raw = request.query_params.get(param)
+            if raw:
+                value = parse_date(raw)
+                if not value:
+                    raise ValidationError({param: "Expected a date in YYYY-MM-DD format."})
+                bounds[param] = value
+        return bounds.get("from"), bounds.get("to")
+
+    def _ids(self, request, *params):
+        """The given id filters that are present, parsed as UUIDs."""
+        ids = {}
+        for param in params:
+            raw = request.query_params.get(param)
+            if raw:
+                try:
+                    ids[param] = uuid.UUID(raw)
+                except ValueError:
+                    raise ValidationError({param: "Expected a valid id."})
+        return ids
+
+    @action(detail=False, methods=["get"])
+    def students(self, request):
+        start, end = self._date_range(request)
+        rows = MonthlyStudentAttendance.objects.all()
+        if start:
+            rows = rows.filter(month__gte=month_start(start))
+        if end:
+            rows = rows.filter(month__lte=end)
+
+        ids = self._ids(request, "student", "section", "level")
+        if "student" in ids:
+            rows = rows.filter(student_id=ids["student"])
+        if "section" in ids:
+            rows = rows.filter(section_id=ids["section"])
+        if "level" in ids:
+            rows = rows.filter(section__level_id=ids["level"])
+
+        data = (
+            rows.values(
+                "student_id",
+                "student__enrollment_id",
+                "student__profile__first_name",
+                "student__profile__last_name",
+            )
+            .annotate(**counter_sums())
+            .order_by("student__profile__first_name", "student__profile__last_name")
+        )
+        return Response(
+            [
+                with_rate(
+                    {
+                        "student_id": row.pop("student_id"),
+                        "enrollment_id": row.pop("student__enrollment_id"),
+                        "name": f"{row.pop('student__profile__first_name')} {row.pop('student__profile__last_name')}",
+                        **row,
+                    }
+                )
+                for row in data
+            ]
+        )
+
+    def _daily_rows(self, request):
+        start, end = self._date_range(request)
+        rows = SectionDailyAttendance.objects.all()
+        if start:
+            rows = rows.filter(date__gte=start)
+        if end:
+            rows = rows.filter(date__lte=end)
+        return rows
+
+    @action(detail=False, methods=["get"])
+    def sections(self, request):
+        rows = self._daily_rows(request)
+        ids = self._ids(request, "level", "section")
+        if "level" in ids:
+            rows = rows.filter(level_id=ids["level"])
+        if "section" in ids:
+            rows = rows.filter(section_id=ids["section"])
+
+        data = (
+            rows.values("section_id", "section__name", "level__name")
+            .annotate(**counter_sums())
+            .order_by("level__name", "section__name")
+        )
+        return Response(
+            [
+                with_rate(
+                    {
+                        "section_id": row.pop("section_id"),
+                        "section_name": row.pop("section__name"),
+                        "level_name": row.pop("level__name"),
+                        **row,
+                    }
+                )
+                for row in data
+            ]
+        )
+
+    @action(detail=False, methods=["get"])
+    def levels(self, request):
+        rows = self._daily_rows(request)
+        ids = self._ids(request, "program", "level")
+        if "program" in ids:
+            rows = rows.filter(level__program_id=ids["program"])
+        if "level" in ids:
+            rows = rows.filter(level_id=ids["level"])
+
+        data = (
+            rows.values("level_id", "level__name", "level__program__name", "level__order")
+            .annotate(**counter_sums())
+            .order_by("level__program__name", "level__order")
+        )
+        return Response(
+            [
+                with_rate(
+                    {
+                        "level_id": row.pop("level_id"),
+                        "level_name": row.pop("level__name"),
+                        "program_name": row.pop("level__program__name"),
+                        **{k: v for k, v in row.items() if k != "level__order"},
+                    }
+                )
+                for row in data
+            ]
+        )
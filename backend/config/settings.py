@@ -29,6 +29,7 @@ SHARED_APPS = (
     "accounts",
     "organizations",
     "payments",
+    "filestore",  # Content-addressed blobs shared by all tenants
 )
 
 TENANT_APPS = (
@@ -40,6 +41,8 @@ TENANT_APPS = (
     "families",
     "academics",
     "course_content",
+    "attendance",
+    "search",
 )
 
 INSTALLED_APPS = list(SHARED_APPS) + [
@@ -51,7 +54,7 @@ TENANT_DOMAIN_MODEL = "organizations.Domain"
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
-    "django_tenants.middleware.main.TenantMainMiddleware",
+    "core.middleware.TenantMainMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -79,6 +82,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 # Database
 DATABASES = {
@@ -138,6 +142,16 @@ REST_FRAMEWORK = {
         "accounts.authentication.JWTCookieAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.DefaultCursorPagination",
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -194,6 +208,7 @@ JAZZMIN_SETTINGS = {
         "organizations.Organization": "fas fa-university",
         "organizations.Domain": "fas fa-globe",
         "payments.Payment": "fas fa-credit-card",
+        "filestore.MediaBlob": "fas fa-hdd",
         "profiles.Profile": "fas fa-user-circle",
         "students.Student": "fas fa-user-graduate",
         "staff.StaffMember": "fas fa-user-tie",
@@ -202,6 +217,8 @@ JAZZMIN_SETTINGS = {
         "profiles.InstitutionProfile": "fas fa-school",
         "roles.Role": "fas fa-user-shield",
         "roles.UserRole": "fas fa-user-tag",
+        "attendance.AttendanceSheet": "fas fa-clipboard-check",
+        "attendance.MonthlyStudentAttendance": "fas fa-calendar-check",
     },
     "order_with_respect_to": [
         "organizations",
@@ -226,6 +243,44 @@ JAZZMIN_UI_TWEAKS = {
     "layout_fixed": True,
 }
 
+# Cache
+# LocMem is per-process; point CACHE_BACKEND/CACHE_LOCATION at a shared backend
+# (e.g. django.core.cache.backends.redis.RedisCache) when running several workers.
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="edusekai"),
+    }
+}
+
+GRADEBOOK_CACHE_TIMEOUT = config("GRADEBOOK_CACHE_TIMEOUT", cast=int, default=600)
+ROSTER_CACHE_TIMEOUT = config("ROSTER_CACHE_TIMEOUT", cast=int, default=3600)
+ACADEMIC_TREE_CACHE_TIMEOUT = config("ACADEMIC_TREE_CACHE_TIMEOUT", cast=int, default=86400)
+# Hostname -> tenant lookups, cached per process by core.middleware (0 disables)
+TENANT_CACHE_TIMEOUT = config("TENANT_CACHE_TIMEOUT", cast=int, default=60)
+
 # Media Files (User Uploads)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# Protected downloads (filestore.serving): "nginx" (X-Accel-Redirect), "apache"
+# (X-Sendfile) or empty to stream from Django. With nginx, MEDIA_SENDFILE_PREFIX must
+# be an `internal` location aliasing MEDIA_ROOT, and MEDIA_ROOT/blobs/ and
+# MEDIA_ROOT/protected/ must not be publicly served under MEDIA_URL.
+MEDIA_SENDFILE_BACKEND = config("MEDIA_SENDFILE_BACKEND", default="")
+MEDIA_SENDFILE_PREFIX = config("MEDIA_SENDFILE_PREFIX", default="/protected-media/")
+
+# Thumbnail/preview threads (filestore.derivatives); 0 renders inline after commit
+DERIVATIVE_WORKERS = config("DERIVATIVE_WORKERS", cast=int, default=2)
+
+# Chunked uploads (course_content.uploads)
+CHUNKED_UPLOAD_MAX_SIZE = config(
+    "CHUNKED_UPLOAD_MAX_SIZE", cast=int, default=2 * 1024 * 1024 * 1024
+)
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = config(
+    "CHUNKED_UPLOAD_MAX_CHUNK_SIZE", cast=int, default=8 * 1024 * 1024
+)
+# Unfinished (and unattached finished) uploads are purged by gc_media_blobs after this
+CHUNKED_UPLOAD_MAX_AGE_HOURS = config("CHUNKED_UPLOAD_MAX_AGE_HOURS", cast=int, default=48)
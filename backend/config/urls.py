@@ -1,7 +1,7 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from django.views.static import serve
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -15,8 +15,17 @@ urlpatterns = [
     path("api/families/", include("families.urls")),
     path("api/academics/", include("academics.urls")),
     path("api/course-content/", include("course_content.urls")),
+    path("api/attendance/", include("attendance.urls")),
+    path("api/search/", include("search.urls")),
 ]
 
-# Serve media files in development
+# Serve public media files in development. Course files (blobs/) and their
+# previews (protected/) are only sent by the views that check access.
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    urlpatterns += [
+        re_path(
+            r"^%s(?!blobs/|protected/)(?P<path>.*)$" % settings.MEDIA_URL.lstrip("/"),
+            serve,
+            {"document_root": settings.MEDIA_ROOT},
+        ),
+    ]
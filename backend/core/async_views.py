@@ -0,0 +1,93 @@
+"""
+Async read endpoints for ASGI deployments (gunicorn.conf.py).
+
+DRF views are synchronous: under ASGI each one holds a thread from start to
+finish, as it does under WSGI. An AsyncAPIView handler is a coroutine on
+the event loop and reaches the database through Django's async ORM, which
+borrows a thread only for each query, so the thread is free while the
+view awaits anything else. Under WSGI (runserver, tests) Django runs the
+same views through async_to_sync.
+
+Only what read endpoints need is kept from APIView: the configured
+authentication classes and permission checks through a DRF Request (so
+`request.query_params` and the test client's force_authenticate work), and
+JSON rendered by ORJSONRenderer. Errors are answered as APIView answers
+them (handle_exception), so status codes, headers and payloads match the
+sync views. Authentication and permissions are
+synchronous code and run in sync_to_async. So does anything else that reads
+`django.db.connection`, such as the tenant schema behind tenant_cache_key:
+connections belong to the request's sync thread, not to the event loop.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .renderers import ORJSONRenderer
+
+
+class AsyncAPIView(View):
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+    http_method_names = ["get", "head", "options"]
+
+    renderer = ORJSONRenderer()
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    def check_permissions(self, request):
+        """APIView.check_permissions; authenticates the request on first use of request.user."""
+        for permission in self.get_permissions():
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def get_authenticate_header(self, request):
+        """APIView.get_authenticate_header."""
+        if request.authenticators:
+            return request.authenticators[0].authenticate_header(request)
+
+    def handle_exception(self, exc):
+        """
+        APIView.handle_exception: 401s carry WWW-Authenticate (403 when no
+        authenticator sends one), the configured exception handler answers
+        APIException, Http404 and PermissionDenied, anything else is raised.
+        """
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticate_header = self.get_authenticate_header(self.request)
+            if authenticate_header:
+                exc.auth_header = authenticate_header
+            else:
+                exc.status_code = status.HTTP_403_FORBIDDEN
+
+        context = {"view": self, "args": self.args, "kwargs": self.kwargs, "request": self.request}
+        response = api_settings.EXCEPTION_HANDLER(exc, context)
+        if response is None:
+            raise exc
+        rendered = self.respond(response.data, status=response.status_code)
+        for header, value in response.items():
+            if header.lower() != "content-type":
+                rendered[header] = value
+        return rendered
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(
+            request, authenticators=[auth() for auth in self.authentication_classes]
+        )
+        self.request = request
+        try:
+            await sync_to_async(self.check_permissions)(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            # The exception handler rolls back ATOMIC_REQUESTS on the sync thread's connection
+            return await sync_to_async(self.handle_exception)(exc)
+
+    def respond(self, data, status=200):
+        return HttpResponse(
+            self.renderer.render(data), status=status, content_type="application/json"
+        )
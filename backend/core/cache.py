@@ -0,0 +1,47 @@
+"""
+Tenant-aware helpers around Django's cache.
+Every key is namespaced by the active schema so schools never share entries.
+
+Versioned namespaces: instead of deleting every key derived from some data,
+callers put `cache_version(...)` into their keys and `bump_cache_version(...)`
+when the data changes; stale entries are then simply never read again and
+expire on their own.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import connection
+
+
+def tenant_cache_key(*parts):
+    return ":".join(["edusekai", connection.schema_name, *[str(part) for part in parts]])
+
+
+def _version_key(parts):
+    return tenant_cache_key("version", *parts)
+
+
+def _fresh_version():
+    # Starting from the clock means a version key lost to eviction or a
+    # restart never comes back with a number old entries were stored under
+    return time.time_ns() // 1000
+
+
+def cache_version(*parts):
+    """Current version of a namespace, e.g. cache_version("section", section_id)."""
+    key = _version_key(parts)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(*parts):
+    """Moves a namespace to a new version, orphaning everything cached under the old one."""
+    key = _version_key(parts)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
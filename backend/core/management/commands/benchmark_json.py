@@ -0,0 +1,98 @@
+"""
+Compares DRF's stdlib JSONRenderer with core.renderers.ORJSONRenderer on a
+tenant's own data (seed one with populate_test_data first).
+"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import tenant_context
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+from organizations.models import Organization
+
+
+def _payloads(limit):
+    """Typical list payloads: raw rows with native types and serializer output."""
+    from course_content.models import AssignmentSubmission, CourseContent
+    from course_content.serializers import CourseContentSerializer
+    from staff.models import StaffMember
+    from staff.serializers import StaffMemberSerializer
+    from students.models import Student
+
+    return {
+        # UUIDs, dates and booleans as the database returns them
+        "students (rows)": list(
+            Student.objects.values(
+                "id",
+                "enrollment_id",
+                "status",
+                "admission_date",
+                "profile_id",
+                "profile__first_name",
+                "profile__last_name",
+                "profile__user_id",
+            )[:limit]
+        ),
+        # Decimals and aware datetimes
+        "submissions (rows)": list(
+            AssignmentSubmission.objects.values(
+                "id", "assignment_id", "student_id", "status", "score", "submitted_at"
+            )[:limit]
+        ),
+        "course content (serializer)": CourseContentSerializer(
+            CourseContent.objects.select_related("created_by__profile")[:limit], many=True
+        ).data,
+        "staff (serializer)": StaffMemberSerializer(
+            StaffMember.objects.select_related("profile")[:limit], many=True
+        ).data,
+    }
+
+
+def _best_of(render, data, iterations):
+    best = float("inf")
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class Command(BaseCommand):
+    help = "Times the stdlib and orjson renderers on list payloads built from a tenant's data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema", type=str, required=True, help="Tenant schema with seeded data"
+        )
+        parser.add_argument("--limit", type=int, default=5000, help="Rows per payload")
+        parser.add_argument("--iterations", type=int, default=20, help="Renders per measurement")
+
+    def handle(self, *args, **options):
+        tenant = Organization.objects.filter(schema_name=options["schema"]).first()
+        if not tenant or tenant.schema_name == "public":
+            raise CommandError(f"Tenant '{options['schema']}' does not exist.")
+
+        with tenant_context(tenant):
+            payloads = _payloads(options["limit"])
+
+        stdlib, fast = JSONRenderer(), ORJSONRenderer()
+        self.stdout.write(
+            f"{'payload':<28} {'rows':>6} {'KiB':>8} {'stdlib ms':>10} {'orjson ms':>10} {'speedup':>8}"
+        )
+        for name, data in payloads.items():
+            if not data:
+                self.stdout.write(f"{name:<28} {0:>6}  (no rows, seed the tenant first)")
+                continue
+            expected, rendered = stdlib.render(data), fast.render(data)
+            if json.loads(expected) != json.loads(rendered):
+                raise CommandError(f"{name}: the renderers disagree")
+
+            slow_s = _best_of(stdlib.render, data, options["iterations"])
+            fast_s = _best_of(fast.render, data, options["iterations"])
+            self.stdout.write(
+                f"{name:<28} {len(data):>6} {len(rendered) / 1024:>8.1f} "
+                f"{slow_s * 1000:>10.2f} {fast_s * 1000:>10.2f} {slow_s / fast_s:>7.1f}x"
+            )
@@ -0,0 +1,40 @@
+"""
+Tenant routing for both WSGI and ASGI deployments.
+"""
+
+import time
+
+from django.conf import settings
+from django_tenants.middleware.main import TenantMainMiddleware as BaseTenantMainMiddleware
+
+# hostname -> (expires at, tenant); cleared by core.signals when a domain or organization changes
+_tenants = {}
+
+
+def clear_tenant_cache():
+    _tenants.clear()
+
+
+class TenantMainMiddleware(BaseTenantMainMiddleware):
+    """
+    django-tenants' middleware with the hostname lookup cached in process for
+    TENANT_CACHE_TIMEOUT seconds (0 disables it), so a request no longer
+    starts with a query against the public schema.
+
+    It is sync- and async-capable through MiddlewareMixin. Under ASGI,
+    process_request runs in sync_to_async on the request's thread-sensitive
+    executor. Database connections are per thread, and that is the thread
+    the request's async ORM calls and sync views run their queries on, so
+    the schema is set on the connection they use. Never call
+    `connection.set_tenant` from the event loop itself.
+    """
+
+    def get_tenant(self, domain_model, hostname):
+        timeout = settings.TENANT_CACHE_TIMEOUT
+        cached = _tenants.get(hostname)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        tenant = super().get_tenant(domain_model, hostname)
+        if timeout:
+            _tenants[hostname] = (time.monotonic() + timeout, tenant)
+        return tenant
@@ -0,0 +1,95 @@
+"""
+View mixins shared by tenant apps.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.query import ModelIterable
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def _field_names(value):
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets for read requests: `?fields=id,name` keeps only the
+    listed fields, `?omit=description` drops fields.
+
+    The serializer loses the other fields before it renders anything, so an
+    unrequested SerializerMethodField is never evaluated. When every kept
+    field reads a model field (a column or a relation), the queryset is
+    trimmed too: `only()` those columns plus the primary and foreign keys
+    (so joins keep working), and prefetches of dropped relations are
+    skipped. Otherwise the queryset is left alone, since a method field may
+    read anything.
+    """
+
+    def get_sparse_fields(self, serializer):
+        """Names of `serializer`'s fields to keep, or None to keep them all."""
+        if self.request is None or self.request.method != "GET":
+            return None
+        fields = _field_names(self.request.query_params.get("fields"))
+        omit = _field_names(self.request.query_params.get("omit"))
+        if not fields and not omit:
+            return None
+
+        available = set(serializer.fields)
+        unknown = (fields | omit) - available
+        if unknown:
+            raise ValidationError(
+                {"fields": f"Unknown fields: {', '.join(sorted(unknown))}"}
+            )
+        return (fields or available) - omit
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        target = getattr(serializer, "child", serializer)
+        keep = self.get_sparse_fields(target)
+        if keep is not None:
+            for name in set(target.fields) - keep:
+                target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if queryset._iterable_class is not ModelIterable:
+            return queryset
+        serializer = self.get_serializer_class()()
+        keep = self.get_sparse_fields(serializer)
+        if keep is None:
+            return queryset
+
+        model = queryset.model
+        columns = {model._meta.pk.name}
+        columns.update(field.name for field in model._meta.concrete_fields if field.is_relation)
+        # Columns the cursor reads its position from
+        ordering = getattr(self, "ordering", None) or queryset.query.order_by or model._meta.ordering
+        columns.update(
+            name.lstrip("-")
+            for name in ([ordering] if isinstance(ordering, str) else ordering)
+            if isinstance(name, str) and "__" not in name and name.lstrip("-") not in ("?", "pk")
+        )
+        sources = set()
+        for name in keep:
+            field = serializer.fields[name]
+            if isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+                return queryset
+            try:
+                model_field = model._meta.get_field(field.source.split(".")[0])
+            except FieldDoesNotExist:
+                return queryset
+            if model_field.concrete:
+                columns.add(model_field.name)
+            elif not model_field.is_relation:
+                return queryset
+            sources.add(model_field.name)
+
+        # Prefetches feeding only dropped fields are not needed either
+        prefetches = [
+            lookup
+            for lookup in queryset._prefetch_related_lookups
+            if getattr(lookup, "prefetch_through", lookup).split("__")[0] in sources
+        ]
+        return queryset.prefetch_related(None).prefetch_related(*prefetches).only(*columns)
@@ -0,0 +1,94 @@
+"""
+Pagination classes shared by tenant apps.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    The API-wide default (REST_FRAMEWORK["DEFAULT_PAGINATION_CLASS"]).
+
+    A cursor page is one indexed range scan however deep the client pages,
+    with no COUNT(*). The order is `?ordering=` (OrderingFilter) or the view's
+    `ordering` when set, otherwise the first plain (non-relation) field of
+    the queryset's or the model's default order, with the primary key
+    breaking ties; querysets without one page by primary key.
+    Views that order by something a cursor cannot encode (ranks, related
+    fields) set a limit/offset class instead.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    template = None
+
+    def get_ordering(self, request, queryset, view):
+        # OrderingFilter (?ordering=) still takes precedence in super()
+        self.ordering = getattr(view, "ordering", None) or self._default_ordering(queryset)
+        return super().get_ordering(request, queryset, view)
+
+    @staticmethod
+    def _default_ordering(queryset):
+        # The cursor encodes str() of the first field, so it must be a plain column
+        for name in queryset.query.order_by or queryset.model._meta.ordering:
+            if not isinstance(name, str) or "__" in name or name.lstrip("-") in ("?", "pk"):
+                continue
+            try:
+                field = queryset.model._meta.get_field(name.lstrip("-"))
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.is_relation:
+                return (name, "-pk" if name.startswith("-") else "pk")
+        return ("pk",)
+
+
+class DefaultPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with a total count, for admin listings that
+    would otherwise return whole tables.
+    """
+
+    default_limit = 50
+    max_limit = 200
+
+
+class FetchAheadPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination without the COUNT(*) query: one extra row is
+    fetched to tell whether a next page exists. Meant for search results,
+    where counting every match costs as much as the search itself.
+    """
+
+    default_limit = 20
+    max_limit = 100
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+
+        rows = list(queryset[self.offset : self.offset + self.limit + 1])
+        # Only tells get_next_link whether anything follows this page
+        self.count = self.offset + len(rows)
+        return rows[: self.limit]
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"].pop("count", None)
+        response_schema["required"] = ["results"]
+        return response_schema
@@ -0,0 +1,171 @@
+"""
+Serializer-free output for read-heavy list endpoints.
+
+A Projection declares the shape of a list row the way a serializer does,
+but as a map of output keys to `values()` lookups: rows come straight from
+one values() query and are turned into dicts without DRF's per-field
+machinery. Keys that need more than a column are computed from the row by
+a `get_<key>(row)` method, nested shapes are other projections under a
+lookup prefix, and data that needs its own query (many-to-many ids and the
+like) is loaded once per page in `prepare(rows)`.
+
+A projection stands in for a serializer only in list responses and must
+render the same JSON for the same rows (each app's tests check this
+against the serializer it replaces). Views opt in with ProjectionListMixin.
+"""
+
+from asgiref.sync import sync_to_async
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Returned by a `get_<key>` method to leave the key out of the row, as a
+# serializer skips a read-only field whose source crosses a NULL relation
+OMIT = object()
+
+# Serializer formatting for the values that differ from their JSON-native form
+_datetime = serializers.DateTimeField().to_representation
+
+
+def datetime_value(value):
+    """An aware datetime formatted like serializers.DateTimeField."""
+    return None if value is None else _datetime(value)
+
+
+def decimal_value(max_digits, decimal_places):
+    """A Decimal formatted like serializers.DecimalField(max_digits, decimal_places)."""
+    field = serializers.DecimalField(max_digits=max_digits, decimal_places=decimal_places)
+    return lambda value: None if value is None else field.to_representation(value)
+
+
+def file_url(storage, name, request=None):
+    """A stored file's URL as serializers.FileField renders it (None without a file)."""
+    if not name:
+        return None
+    url = storage.url(name)
+    return request.build_absolute_uri(url) if request else url
+
+
+def full_name(first_name, middle_name, last_name):
+    """Same as Profile.full_name, from columns."""
+    return " ".join(part for part in (first_name, middle_name, last_name) if part)
+
+
+class Projection:
+    """
+    `columns` maps output keys to a values() lookup, or to (lookup, convert)
+    when the value needs the serializer's formatting. `computed` maps keys
+    to the lookups their `get_<key>(row)` method reads, and `nested` maps
+    keys to (projection class, lookup prefix); a nested row whose primary
+    key is NULL renders as None. `fields` is the output order.
+    """
+
+    columns = {}
+    computed = {}
+    nested = {}
+    fields = ()
+
+    def __init__(self, context=None, fields=None, prefix=""):
+        self.context = context or {}
+        self.prefix = prefix
+        self.fields = [key for key in type(self).fields if fields is None or key in fields]
+        self._nested = {
+            key: projection_class(self.context, prefix=prefix + nested_prefix)
+            for key, (projection_class, nested_prefix) in self.nested.items()
+            if key in self.fields
+        }
+
+    def lookups(self):
+        """Every values() lookup the kept fields read, with this prefix applied."""
+        lookups = {self.prefix + "pk"}
+        for key in self.fields:
+            if key in self.columns:
+                column = self.columns[key]
+                lookups.add(self.prefix + (column[0] if isinstance(column, tuple) else column))
+            elif key in self.computed:
+                lookups.update(self.prefix + lookup for lookup in self.computed[key])
+            elif key in self._nested:
+                lookups.update(self._nested[key].lookups())
+        return lookups
+
+    def prepare(self, rows):
+        """Loads per-page data for `rows` (values() dicts) before rendering."""
+
+    def render_row(self, row):
+        if self.prefix and row[self.prefix + "pk"] is None:
+            return None
+        out = {}
+        for key in self.fields:
+            if key in self.columns:
+                column = self.columns[key]
+                if isinstance(column, tuple):
+                    lookup, convert = column
+                    out[key] = convert(row[self.prefix + lookup])
+                else:
+                    out[key] = row[self.prefix + column]
+            elif key in self._nested:
+                out[key] = self._nested[key].render_row(row)
+            else:
+                value = getattr(self, f"get_{key}")(row)
+                if value is not OMIT:
+                    out[key] = value
+        return out
+
+    def render(self, rows):
+        self.prepare(rows)
+        for projection in self._nested.values():
+            projection.prepare(rows)
+        return [self.render_row(row) for row in rows]
+
+    async def arender(self, rows):
+        """render() for async views; prepare() may query, so it runs in sync_to_async."""
+        return await sync_to_async(self.render)(rows)
+
+    def values(self, queryset, extra=()):
+        """`queryset` as the values() rows this projection renders."""
+        return queryset.values(*(self.lookups() | set(extra)))
+
+    def field(self, row, lookup):
+        """A computed key's input, with the prefix applied."""
+        return row[self.prefix + lookup]
+
+
+class ProjectionListMixin:
+    """
+    Serves `list` from `projection_class` instead of the serializer: the
+    filtered (and paginated) queryset is read with values() and rendered by
+    the projection. ?fields=/?omit= (SparseFieldsMixin) narrow it the same
+    way they narrow the serializer.
+    """
+
+    projection_class = None
+
+    def get_projection(self):
+        keep = None
+        if hasattr(self, "get_sparse_fields"):
+            keep = self.get_sparse_fields(self.projection_class)
+        return self.projection_class({"request": self.request, "view": self}, fields=keep)
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        rows = projection.values(queryset, extra=self._ordering_columns(queryset))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(projection.render(page))
+        return Response(projection.render(list(rows)))
+
+    def _ordering_columns(self, queryset):
+        """Plain columns any ordering may use; the cursor reads its position from the row."""
+        view_ordering = getattr(self, "ordering", None) or ()
+        candidates = [
+            *queryset.query.order_by,
+            *queryset.model._meta.ordering,
+            *([view_ordering] if isinstance(view_ordering, str) else view_ordering),
+            *getattr(self, "ordering_fields", ()),
+        ]
+        return {
+            name.lstrip("-")
+            for name in candidates
+            if isinstance(name, str) and "__" not in name and name.lstrip("-") != "?"
+        }
@@ -0,0 +1,53 @@
+"""
+orjson-backed JSON renderer and parser for DRF (REST_FRAMEWORK settings).
+
+orjson encodes str/int/float, UUID, datetime, date and time in C. Anything
+else it does not know (Decimal, lazy translations, querysets, timedelta)
+goes through DRF's own encoder, so responses read the same as with
+rest_framework's JSONRenderer, only produced faster. See the
+benchmark_json command for the comparison on a tenant's data.
+"""
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# UTC datetimes end in "Z" like DRF's; dicts keyed by UUIDs or ints are allowed
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_fallback = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            # orjson only indents by two spaces; any requested indent gets that
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=_fallback, option=options)
+
+        # Same strict-JavaScript-subset escaping as DRF's renderer
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        body = stream.read()
+        try:
+            if encoding.lower().replace("-", "") != "utf8":
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (orjson.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,102 @@
+"""
+PostgreSQL full-text search helpers shared by tenant apps.
+
+Prefix queries (`alg` matches `algebra`) keep search-as-you-type on the GIN
+index. Trigram fuzzy matching needs the pg_trgm extension; it is used only
+when installed, so a database without it still gets full-text search.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+from rest_framework.filters import BaseFilterBackend
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+TRIGRAM_THRESHOLD = 0.3
+
+_trigram_available = None
+
+
+def trigram_available():
+    """Whether pg_trgm is installed (checked once per process)."""
+    global _trigram_available
+    if _trigram_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_available = cursor.fetchone() is not None
+    return _trigram_available
+
+
+def prefix_search_query(text, config="english"):
+    """
+    Builds `term1:* & term2:*` from free text. Only word characters survive,
+    so user input can never inject tsquery operators. None for empty input.
+    """
+    terms = TERM_RE.findall(text or "")
+    if not terms:
+        return None
+    raw = " & ".join(f"{term}:*" for term in terms[:8])
+    return SearchQuery(raw, search_type="raw", config=config)
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over a view's `search_vector_field`.
+
+    View attributes:
+      search_vector_field - SearchVectorField to match (default "search_vector")
+      search_config       - text search configuration (default "english")
+      trigram_fields      - fields for `?fuzzy=true` typo-tolerant matching
+      search_prefix_fields - identifier fields (IDs, phone numbers) matched by
+                            case-sensitive prefix, which a varchar_pattern_ops
+                            or unique index can serve; such hits rank first
+
+    Results are ordered by relevance unless the client passes `?ordering=`.
+    """
+
+    search_param = "search"
+    fuzzy_param = "fuzzy"
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        query = prefix_search_query(text, getattr(view, "search_config", "english"))
+        if query is None:
+            return queryset
+
+        vector = F(getattr(view, "search_vector_field", "search_vector"))
+        match = Q(**{getattr(view, "search_vector_field", "search_vector"): query})
+        rank = SearchRank(vector, query)
+
+        prefix_fields = getattr(view, "search_prefix_fields", [])
+        if prefix_fields:
+            identifier = Q()
+            for field in prefix_fields:
+                for variant in {text, text.upper()}:
+                    identifier |= Q(**{f"{field}__startswith": variant})
+            match |= identifier
+            exact = Case(When(identifier, then=Value(1.0)), default=Value(0.0))
+            rank = Greatest(rank, exact, output_field=FloatField())
+
+        trigram_fields = getattr(view, "trigram_fields", [])
+        fuzzy = request.query_params.get(self.fuzzy_param, "").lower() == "true"
+        if fuzzy and trigram_fields and trigram_available():
+            from django.contrib.postgres.search import TrigramWordSimilarity
+
+            similarities = [TrigramWordSimilarity(text, field) for field in trigram_fields]
+            similarity = (
+                Greatest(*similarities, output_field=FloatField())
+                if len(similarities) > 1
+                else similarities[0]
+            )
+            queryset = queryset.annotate(search_similarity=similarity)
+            match |= Q(search_similarity__gte=TRIGRAM_THRESHOLD)
+            rank = Greatest(rank, F("search_similarity"), output_field=FloatField())
+
+        queryset = queryset.filter(match).annotate(search_rank=rank)
+
+        if request.query_params.get("ordering"):
+            return queryset
+        return queryset.order_by("-search_rank", *queryset.query.order_by)
@@ -0,0 +1,38 @@
+import logging
+
+from django.db import connection, transaction, DatabaseError
+from django.db.models.signals import post_delete, post_save, pre_migrate
+from django.dispatch import receiver
+
+from .middleware import clear_tenant_cache
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_migrate, dispatch_uid="core.ensure_search_extensions")
+def ensure_search_extensions(sender, **kwargs):
+    """
+    Installs pg_trgm (used for fuzzy search) into the public schema when the
+    database allows it. Full-text search works without it.
+    """
+    if getattr(connection, "_search_extensions_checked", False):
+        return
+    connection._search_extensions_checked = True
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public")
+    except DatabaseError as e:
+        logger.warning("pg_trgm is unavailable; fuzzy search is disabled (%s)", e)
+
+
+
+def clear_cached_tenants(sender, **kwargs):
+    """Drops this process's hostname -> tenant cache (core.middleware)."""
+    clear_tenant_cache()
+
+
+for _model in ("organizations.Domain", "organizations.Organization"):
+    for _signal in (post_save, post_delete):
+        _signal.connect(
+            clear_cached_tenants, sender=_model, dispatch_uid=f"core.tenant_cache.{_model}"
+        )
@@ -0,0 +1,237 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+
+from django.core.management import call_command
+from django.urls import URLResolver, get_resolver
+from django.db import connection
+from django.http import Http404
+from django.test import AsyncClient, AsyncRequestFactory, SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from academics.models import AcademicLevel, Program, Section, Subject, SubjectAssignment
+from accounts.models import User
+from attendance.models import AttendanceSheet, MonthlyStudentAttendance
+from course_content.models import Assignment, ChunkedUpload, CourseContent, SubjectEnrollment
+from organizations.models import Domain
+from profiles.models import Profile
+from roles.models import Role, UserRole
+from staff.models import Instructor, StaffMember
+from students.models import Student
+from .async_views import AsyncAPIView
+from .pagination import DefaultCursorPagination
+from .renderers import ORJSONParser, ORJSONRenderer
+
+
+def cursor_paginated_lists(patterns=None, prefix="/"):
+    """The path of every list endpoint paginated by DefaultCursorPagination."""
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        path = prefix + str(pattern.pattern).lstrip("^").rstrip("$")
+        if isinstance(pattern, URLResolver):
+            yield from cursor_paginated_lists(pattern.url_patterns, path)
+            continue
+        view = getattr(pattern.callback, "cls", None)
+        actions = getattr(pattern.callback, "actions", None) or {}
+        if (
+            actions.get("get") == "list"
+            and "(?P<format>" not in path
+            and issubclass(view.pagination_class or object, DefaultCursorPagination)
+        ):
+            yield path
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """
+    Verifies the orjson renderer and parser read the same as DRF's stdlib ones.
+    """
+
+    def test_matches_the_stdlib_renderer(self):
+        data = {
+            "id": uuid.uuid4(),
+            "when": datetime.datetime(2026, 1, 15, 8, 30, tzinfo=datetime.timezone.utc),
+            "local": timezone.localtime(timezone.now()),
+            "day": datetime.date(2026, 1, 15),
+            "score": decimal.Decimal("9.5"),
+            "keys": {uuid.UUID(int=1): 1},
+            "rows": ({"name": "Kid\u2028"},),
+        }
+        stdlib = json.loads(JSONRenderer().render({**data, "keys": {str(uuid.UUID(int=1)): 1}}))
+        rendered = ORJSONRenderer().render(data)
+        self.assertEqual(json.loads(rendered), stdlib)
+        self.assertIn(b'"2026-01-15T08:30:00Z"', rendered)
+        self.assertIn(b"\\u2028", rendered)
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_parser(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO(b'{"a": [1, "\xc3\xa9"]}')), {"a": [1, "é"]})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b"{nope"))
+
+
+class BenchmarkJsonTest(TenantTestCase):
+    def test_reports_each_payload(self):
+        Student.objects.create(
+            profile=Profile.objects.create(first_name="Kid", last_name="Bench"),
+            enrollment_id="B-1",
+        )
+        out = io.StringIO()
+        call_command(
+            "benchmark_json", schema=self.tenant.schema_name, iterations=1, stdout=out
+        )
+        self.assertIn("students (rows)", out.getvalue())
+        self.assertIn("x", out.getvalue().splitlines()[1])
+
+
+class AsgiServingTest(TenantTestCase):
+    """
+    Verifies requests served through the ASGI handler resolve the tenant for
+    async views and sync DRF views alike, and that tenant lookups are cached.
+    """
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user(username="owner", email="o@example.com", password="x")
+        Profile.objects.create(user_id=user.id, first_name="Own", last_name="Er")
+        UserRole.objects.create(user=user, role=Role.objects.get(slug="owner"))
+        # AsyncClient always sends "Host: testserver"
+        Domain.objects.create(domain="testserver", tenant=self.tenant, is_primary=False)
+        self.client = AsyncClient()
+        self.client.cookies["access_token"] = str(RefreshToken.for_user(user).access_token)
+
+    async def test_async_and_sync_views_under_asgi(self):
+        response = await self.client.get("/api/auth/me/")
+        self.assertEqual(response.status_code, 200, response.content)
+        me = response.json()
+        self.assertEqual((me["roles"], me["permissions"]), (["owner"], ["*"]))
+        self.assertEqual(me["profile"]["first_name"], "Own")
+        self.assertEqual(me["profile"]["email"], "o@example.com")
+
+        self.assertEqual((await self.client.get("/api/academics/sections/")).status_code, 200)
+
+        self.client.cookies.clear()
+        response = await self.client.get("/api/auth/me/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.headers["WWW-Authenticate"], 'Bearer realm="api"')
+        self.assertIn("detail", response.json())
+
+    async def test_async_views_answer_errors_like_sync_views(self):
+        class MissingView(AsyncAPIView):
+            permission_classes = []
+
+            async def get(self, request):
+                raise Http404
+
+        class BrokenView(MissingView):
+            async def get(self, request):
+                raise ValueError("boom")
+
+        response = await MissingView.as_view()(AsyncRequestFactory().get("/"))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content), {"detail": "Not found."})
+        with self.assertRaises(ValueError):
+            await BrokenView.as_view()(AsyncRequestFactory().get("/"))
+
+    def test_tenant_lookup_is_cached(self):
+        api = APIClient(HTTP_HOST=self.domain.domain)
+        api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+
+        def domain_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(api.get("/api/academics/sections/").status_code, 200)
+            return [q for q in queries.captured_queries if "organizations_domain" in q["sql"]]
+
+        domain_queries()
+        self.assertEqual(domain_queries(), [])
+        # Saving a domain clears the cache
+        self.domain.save()
+        self.assertEqual(len(domain_queries()), 1)
+
+
+class CursorPaginationTest(TenantTestCase):
+    """
+    Verifies every cursor-paginated list can be paged to the end, including
+    models whose default order starts with a foreign key.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(username="pager", password="x")
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(self.admin)
+
+        programs = [
+            Program.objects.create(name="Primary", code="PR"),
+            Program.objects.create(name="High School", code="HS"),
+        ]
+        levels = [
+            AcademicLevel.objects.create(program=program, name=f"Grade {order}", order=order)
+            for program, order in zip(programs, (5, 9))
+        ]
+        sections = [Section.objects.create(level=level, name="A") for level in levels]
+        subjects = [
+            Subject.objects.create(level=level, name="Maths", code="MTH") for level in levels
+        ]
+        instructors = []
+        for number in range(2):
+            staff = StaffMember.objects.create(
+                profile=Profile.objects.create(first_name=f"Teacher{number}", last_name="T"),
+                employee_id=f"EMP-{number}",
+                designation="Teacher",
+            )
+            instructors.append(
+                Instructor.objects.create(staff_member=staff, specialization="Maths")
+            )
+        for section, subject, instructor in zip(sections, subjects, instructors):
+            SubjectAssignment.objects.create(section=section, subject=subject, instructor=instructor)
+
+        due = timezone.now()
+        for number, (section, subject) in enumerate(zip(sections, subjects)):
+            student = Student.objects.create(
+                profile=Profile.objects.create(first_name=f"Kid{number}", last_name="K"),
+                enrollment_id=f"STU-{number}",
+            )
+            SubjectEnrollment.objects.create(student=student, subject=subject, academic_year="2026")
+            MonthlyStudentAttendance.objects.create(
+                student=student, section=section, month=datetime.date(2026, 1, 1)
+            )
+            AttendanceSheet.objects.create(section=section, date=datetime.date(2026, 1, 5 + number))
+            content = CourseContent.objects.create(
+                title=f"Homework {number}",
+                description="",
+                content_type="assignment",
+                created_by=instructors[0].staff_member,
+            )
+            Assignment.objects.create(
+                content=content, due_date=due + datetime.timedelta(days=number), instructions=""
+            )
+            ChunkedUpload.objects.create(
+                user_id=self.admin.id, filename=f"scan{number}.pdf", total_size=10
+            )
+
+    def test_every_list_pages_past_the_first_page(self):
+        paths = list(cursor_paginated_lists())
+        self.assertIn("/api/academics/levels/", paths)
+        self.assertIn("/api/academics/sections/", paths)
+        for path in paths:
+            with self.subTest(path):
+                response = self.api.get(path, {"page_size": 1})
+                self.assertEqual(response.status_code, 200, response.content)
+                page = response.json()
+                ids = [row["id"] for row in page["results"]]
+                self.assertIsNotNone(page["next"], "needs at least two rows to page")
+                while page["next"]:
+                    response = self.api.get(page["next"])
+                    self.assertEqual(response.status_code, 200, response.content)
+                    page = response.json()
+                    ids += [row["id"] for row in page["results"]]
+                self.assertEqual(len(ids), len(set(ids)))
+                self.assertEqual(len(ids), len(self.api.get(path).json()["results"]))
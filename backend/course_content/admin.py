@@ -1,5 +1,11 @@
 from django.contrib import admin
-from .models import CourseContent, SubjectEnrollment, Assignment, AssignmentSubmission
+from .models import (
+    CourseContent,
+    SubjectEnrollment,
+    Assignment,
+    AssignmentSubmission,
+    ChunkedUpload,
+)
 
 
 @admin.register(CourseContent)
@@ -42,3 +48,11 @@ class AssignmentSubmissionAdmin(admin.ModelAdmin):
     list_filter = ["status", "submitted_at", "graded_at"]
     search_fields = ["student__profile__first_name", "student__profile__last_name"]
     readonly_fields = ["created_at", "updated_at", "is_late"]
+
+
+@admin.register(ChunkedUpload)
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    list_display = ["filename", "user_id", "offset", "total_size", "status", "created_at"]
+    list_filter = ["status", "created_at"]
+    search_fields = ["filename", "sha256"]
+    readonly_fields = ["sha256", "created_at", "updated_at"]
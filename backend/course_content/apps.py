@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CourseContentConfig(AppConfig):
     name = 'course_content'
+
+    def ready(self):
+        import course_content.signals
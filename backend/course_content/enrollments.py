@@ -0,0 +1,99 @@
+"""
+Core subject enrollments derived from section placements.
+
+A student currently placed in a section takes every non-elective subject
+assigned to that section (SubjectAssignment). `sync_subject_enrollments`
+brings SubjectEnrollment in line for a set of students or sections with two
+set-based statements:
+  1. INSERT the missing derived rows (source = 'section'); an existing
+     manual enrollment of the same subject and year wins the conflict
+  2. DELETE derived rows of the placement's year whose subject is no longer
+     a core subject of the student's current section
+Signals in course_content.signals call it for the rows a change touches;
+the sync_subject_enrollments command reconciles a whole school.
+"""
+
+from django.db import connection, transaction
+
+from academics.models import Section, Subject, SubjectAssignment
+from students.models import StudentLevel
+from .models import SubjectEnrollment
+
+INSERT_SQL = """
+    INSERT INTO {enrollment} (id, student_id, subject_id, academic_year, enrolled_at, source)
+    SELECT gen_random_uuid(), sl.student_id, sa.subject_id, sl.academic_year, now(), 'section'
+    FROM {placement} sl
+    JOIN {assignment} sa ON sa.section_id = sl.section_id
+    JOIN {subject} s ON s.id = sa.subject_id AND NOT s.is_elective
+    WHERE sl.is_current AND {scope}
+    ON CONFLICT (student_id, subject_id, academic_year) DO NOTHING
+"""
+
+DELETE_SQL = """
+    DELETE FROM {enrollment} se
+    USING {placement} sl
+    WHERE se.source = 'section'
+      AND se.student_id = sl.student_id
+      AND se.academic_year = sl.academic_year
+      AND sl.is_current AND {scope}
+      AND NOT EXISTS (
+          SELECT 1 FROM {assignment} sa
+          JOIN {subject} s ON s.id = sa.subject_id AND NOT s.is_elective
+          WHERE sa.section_id = sl.section_id AND sa.subject_id = se.subject_id
+      )
+"""
+
+
+def _tables():
+    quote = connection.ops.quote_name
+    return {
+        "enrollment": quote(SubjectEnrollment._meta.db_table),
+        "placement": quote(StudentLevel._meta.db_table),
+        "assignment": quote(SubjectAssignment._meta.db_table),
+        "subject": quote(Subject._meta.db_table),
+    }
+
+
+def sync_subject_enrollments(student_ids=None, section_ids=None):
+    """
+    Derives core enrollments for the given students and/or sections (every
+    current placement when both are None). Returns (created, removed).
+    """
+    from academics.roster import bump_section_versions, bump_student_sections
+
+    everyone = student_ids is None and section_ids is None
+    student_ids = [str(student_id) for student_id in student_ids or [] if student_id]
+    section_ids = [str(section_id) for section_id in section_ids or [] if section_id]
+    if not (everyone or student_ids or section_ids):
+        return 0, 0
+
+    clauses, params = [], {}
+    if student_ids:
+        clauses.append("sl.student_id = ANY(%(student_ids)s::uuid[])")
+        params["student_ids"] = student_ids
+    if section_ids:
+        clauses.append("sl.section_id = ANY(%(section_ids)s::uuid[])")
+        params["section_ids"] = section_ids
+    scope = f"({' OR '.join(clauses)})" if clauses else "TRUE"
+
+    tables = _tables()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(INSERT_SQL.format(scope=scope, **tables), params)
+        created = cursor.rowcount
+        cursor.execute(DELETE_SQL.format(scope=scope, **tables), params)
+        removed = cursor.rowcount
+
+    if created or removed:
+        # Raw SQL sends no signals; rosters list subject enrollments
+        if everyone:
+            bump_section_versions(Section.objects.values_list("id", flat=True))
+        bump_student_sections(student_ids)
+        bump_section_versions(section_ids)
+    return created, removed
+
+
+def drop_derived_enrollments(student_id, academic_year):
+    """Removes the derived enrollments of a placement that no longer exists."""
+    return SubjectEnrollment.objects.filter(
+        student_id=student_id, academic_year=academic_year, source="section"
+    ).delete()[0]
@@ -0,0 +1,192 @@
+"""
+Gradebook aggregation over AssignmentSubmission.
+
+Grades of a (section, subject) pair are computed in the database with a fixed
+number of aggregate queries, independent of students x assignments:
+  1. assignments of the subject visible to the section
+  2. students currently placed in the section
+  3. per-student totals (late penalty applied in SQL)
+  4. per-assignment averages
+
+Results are cached under the tenant's gradebook version, which
+course_content.signals bumps whenever submissions, assignments, their
+targeting or student placements change.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Avg,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Q,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, Ceil, Coalesce, Extract, Greatest
+
+from core.cache import bump_cache_version, cache_version, tenant_cache_key
+from students.models import StudentLevel
+from .models import Assignment, AssignmentSubmission
+
+
+GRADEBOOK_NAMESPACE = "gradebook"
+
+
+def gradebook_version():
+    return cache_version(GRADEBOOK_NAMESPACE)
+
+
+def bump_gradebook_version():
+    bump_cache_version(GRADEBOOK_NAMESPACE)
+
+
+def gradebook_cache_key(section_id, subject_id):
+    return tenant_cache_key("gradebook", gradebook_version(), section_id, subject_id)
+
+
+def _days_late():
+    """Whole days (rounded up) a submission came in after the due date; 0 if on time."""
+    lateness = ExpressionWrapper(
+        F("submitted_at") - F("assignment__due_date"), output_field=DurationField()
+    )
+    return Greatest(
+        Coalesce(Ceil(Extract(lateness, "epoch") / Value(86400.0)), Value(0.0)),
+        Value(0.0),
+    )
+
+
+def _adjusted_score():
+    """Score after `late_penalty_percent` per late day, never below zero."""
+    penalty = (
+        Cast("assignment__late_penalty_percent", FloatField()) * _days_late() / Value(100.0)
+    )
+    return Cast("score", FloatField()) * Greatest(Value(1.0) - penalty, Value(0.0))
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def get_gradebook_assignments(section_id, subject_id):
+    """
+    Assignments targeting the subject that are visible to the section:
+    either targeted at this section or not restricted to any section.
+    """
+    return (
+        Assignment.objects.filter(content__target_subjects=subject_id)
+        .filter(
+            Q(content__target_sections=section_id)
+            | Q(content__target_sections__isnull=True)
+        )
+        .distinct()
+    )
+
+
+def compute_gradebook(section_id, subject_id):
+    assignments = list(
+        get_gradebook_assignments(section_id, subject_id)
+        .order_by("due_date")
+        .values("id", "content__title", "due_date", "total_points", "late_penalty_percent")
+    )
+    assignment_ids = [a["id"] for a in assignments]
+
+    students = list(
+        StudentLevel.objects.filter(section_id=section_id, is_current=True)
+        .order_by("student__profile__first_name", "student__profile__last_name")
+        .values(
+            "student_id",
+            "student__enrollment_id",
+            "student__profile__first_name",
+            "student__profile__last_name",
+        )
+    )
+    student_ids = [s["student_id"] for s in students]
+
+    submissions = AssignmentSubmission.objects.filter(
+        assignment_id__in=assignment_ids, student_id__in=student_ids
+    ).annotate(adjusted=_adjusted_score())
+    graded = Q(status="graded", score__isnull=False)
+
+    per_student = {
+        row["student_id"]: row
+        for row in submissions.values("student_id").annotate(
+            earned=Sum("adjusted", filter=graded),
+            raw=Sum(Cast("score", FloatField()), filter=graded),
+            possible=Sum(Cast("assignment__total_points", FloatField()), filter=graded),
+            average_percentage=Avg(
+                F("adjusted") * Value(100.0) / Cast("assignment__total_points", FloatField()),
+                filter=graded,
+            ),
+            graded_count=Count("id", filter=graded),
+            submitted_count=Count("id", filter=Q(submitted_at__isnull=False)),
+        )
+    }
+
+    per_assignment = {
+        row["assignment_id"]: row
+        for row in submissions.values("assignment_id").annotate(
+            average_score=Avg("adjusted", filter=graded),
+            graded_count=Count("id", filter=graded),
+        )
+    }
+
+    student_rows = []
+    for student in students:
+        totals = per_student.get(student["student_id"], {})
+        earned, possible = totals.get("earned"), totals.get("possible")
+        student_rows.append(
+            {
+                "student_id": student["student_id"],
+                "enrollment_id": student["student__enrollment_id"],
+                "name": f"{student['student__profile__first_name']} {student['student__profile__last_name']}",
+                "graded_count": totals.get("graded_count", 0),
+                "submitted_count": totals.get("submitted_count", 0),
+                "raw_score": _round(totals.get("raw")),
+                "earned": _round(earned),
+                "possible": _round(possible),
+                # Points-weighted: large assignments count proportionally more
+                "weighted_percentage": _round(earned * 100 / possible) if possible else None,
+                # Unweighted: every assignment counts the same
+                "average_percentage": _round(totals.get("average_percentage")),
+            }
+        )
+
+    graded_students = [r for r in student_rows if r["weighted_percentage"] is not None]
+    class_average = (
+        _round(sum(r["weighted_percentage"] for r in graded_students) / len(graded_students))
+        if graded_students
+        else None
+    )
+
+    return {
+        "section": section_id,
+        "subject": subject_id,
+        "class_average": class_average,
+        "assignments": [
+            {
+                "id": a["id"],
+                "title": a["content__title"],
+                "due_date": a["due_date"],
+                "total_points": a["total_points"],
+                "late_penalty_percent": a["late_penalty_percent"],
+                "graded_count": per_assignment.get(a["id"], {}).get("graded_count", 0),
+                "average_score": _round(per_assignment.get(a["id"], {}).get("average_score")),
+            }
+            for a in assignments
+        ],
+        "students": student_rows,
+    }
+
+
+def get_gradebook(section_id, subject_id):
+    """Cached gradebook of a (section, subject) pair."""
+    key = gradebook_cache_key(section_id, subject_id)
+    data = cache.get(key)
+    if data is None:
+        data = compute_gradebook(section_id, subject_id)
+        cache.set(key, data, settings.GRADEBOOK_CACHE_TIMEOUT)
+    return data
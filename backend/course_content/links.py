@@ -0,0 +1,26 @@
+"""
+Links to course files. Content files, submission files and content previews
+are only sent by the download and preview actions, which check access first
+(filestore.serving); serializers and projections expose these URLs, never
+the stored files' media URLs.
+"""
+
+from rest_framework.reverse import reverse
+
+from filestore.derivatives import recorded_derivatives
+
+
+def content_download_url(pk, request=None):
+    return reverse("content-download", kwargs={"pk": pk}, request=request)
+
+
+def content_preview_urls(pk, derivatives, source_name, request=None):
+    """{label: url} of the recorded previews of a content's current file."""
+    return {
+        label: reverse("content-preview", kwargs={"pk": pk, "label": label}, request=request)
+        for label in recorded_derivatives(derivatives, "file", source_name)
+    }
+
+
+def submission_download_url(pk, request=None):
+    return reverse("submission-download", kwargs={"pk": pk}, request=request)
@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from course_content.models import CourseContent
+
+METADATA_FIELDS = [
+    "file_size",
+    "file_mime_type",
+    "file_sha256",
+    "file_pages",
+    "file_duration",
+    "extracted_text",
+]
+
+
+class Command(BaseCommand):
+    help = "Populates size, MIME type, checksum, page/duration and searchable text of existing course content files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            type=str,
+            help="Tenant schema to backfill (default: every tenant)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Recompute rows that already have metadata",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Rows written per UPDATE batch (default: 200)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options.get("schema"):
+            tenants = tenants.filter(schema_name=options["schema"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['schema']}' does not exist.")
+
+        for tenant in tenants:
+            with tenant_context(tenant):
+                updated, missing = self._backfill(options["force"], options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{tenant.name} ({tenant.schema_name}): {updated} rows updated, "
+                    f"{missing} files missing from storage"
+                )
+            )
+
+    def _backfill(self, force, batch_size):
+        contents = CourseContent.objects.exclude(file="").exclude(file__isnull=True)
+        if not force:
+            contents = contents.filter(file_size__isnull=True)
+
+        batch = []
+        updated = missing = 0
+        for content in contents.only("id", "file").iterator():
+            try:
+                content.refresh_file_metadata()
+            except (FileNotFoundError, OSError):
+                missing += 1
+                continue
+            batch.append(content)
+            if len(batch) >= batch_size:
+                updated += self._flush(batch)
+        updated += self._flush(batch)
+        return updated, missing
+
+    def _flush(self, batch):
+        # bulk_update skips save signals, so blob reference counts are untouched
+        CourseContent.objects.bulk_update(batch, METADATA_FIELDS)
+        count = len(batch)
+        batch.clear()
+        return count
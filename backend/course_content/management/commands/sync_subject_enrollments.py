@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from course_content.enrollments import sync_subject_enrollments
+
+
+class Command(BaseCommand):
+    help = (
+        "Derives core subject enrollments from every current section placement and "
+        "removes derived enrollments that no longer match (manual ones are kept)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            type=str,
+            help="Tenant schema to reconcile (default: every tenant)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options.get("schema"):
+            tenants = tenants.filter(schema_name=options["schema"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['schema']}' does not exist.")
+
+        for tenant in tenants:
+            with tenant_context(tenant):
+                created, removed = sync_subject_enrollments()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{tenant.name} ({tenant.schema_name}): {created} enrollments derived, "
+                    f"{removed} stale derived enrollments removed"
+                )
+            )
@@ -1,6 +1,11 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+import shutil
 import uuid
 
+from filestore.storage import content_addressed_storage
+
 
 class ContentType(models.TextChoices):
     NOTE = "note", "Study Note"
@@ -24,9 +29,29 @@ class CourseContent(models.Model):
     content_type = models.CharField(max_length=20, choices=ContentType.choices)
 
     # File/URL storage
-    file = models.FileField(upload_to="course_content/%Y/%m/", null=True, blank=True)
+    file = models.FileField(storage=content_addressed_storage, null=True, blank=True)
     external_url = models.URLField(null=True, blank=True)
 
+    # File metadata, captured when the file is saved (see course_content.signals)
+    file_size = models.BigIntegerField(null=True, blank=True)
+    file_mime_type = models.CharField(max_length=100, blank=True)
+    file_sha256 = models.CharField(max_length=64, blank=True)
+    file_pages = models.PositiveIntegerField(null=True, blank=True)
+    file_duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+    # Resized WebP versions, filled in by filestore.derivatives
+    derivatives = models.JSONField(default=dict, blank=True)
+
+    # Full-text search: document text is extracted on upload and the weighted
+    # vector is maintained by PostgreSQL itself (title > description > file text)
+    extracted_text = models.TextField(blank=True, editable=False)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config="english")
+        + SearchVector("description", weight="B", config="english")
+        + SearchVector("extracted_text", weight="C", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     # Author (any staff member can create content)
     created_by = models.ForeignKey(
         "staff.StaffMember", on_delete=models.CASCADE, related_name="created_content"
@@ -53,11 +78,27 @@ class CourseContent(models.Model):
         indexes = [
             models.Index(fields=["-created_at"]),
             models.Index(fields=["content_type", "-created_at"]),
+            GinIndex(fields=["search_vector"], name="content_search_vector_idx"),
         ]
 
     def __str__(self):
         return f"{self.title} ({self.get_content_type_display()})"
 
+    def refresh_file_metadata(self):
+        """
+        Fills the file_* columns and the searchable document text from the file;
+        clears them when there is none.
+        """
+        from filestore.metadata import file_metadata
+
+        metadata = file_metadata(self.file) if self.file else {}
+        self.extracted_text = metadata.get("text", "")
+        self.file_size = metadata.get("size")
+        self.file_mime_type = metadata.get("mime_type", "")
+        self.file_sha256 = metadata.get("sha256", "")
+        self.file_pages = metadata.get("pages")
+        self.file_duration = metadata.get("duration")
+
 
 class SubjectEnrollment(models.Model):
     """
@@ -78,6 +119,14 @@ class SubjectEnrollment(models.Model):
     academic_year = models.CharField(max_length=20)
     enrolled_at = models.DateTimeField(auto_now_add=True)
 
+    # Core subjects are derived from the section's SubjectAssignments and kept
+    # in sync by course_content.enrollments; manual enrollments are never removed
+    SOURCE_CHOICES = [
+        ("manual", "Manual"),
+        ("section", "Derived from section"),
+    ]
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default="manual")
+
     class Meta:
         unique_together = ["student", "subject", "academic_year"]
 
@@ -139,7 +188,7 @@ class AssignmentSubmission(models.Model):
     # Submission data
     submitted_at = models.DateTimeField(null=True, blank=True)
     submission_file = models.FileField(
-        upload_to="submissions/%Y/%m/", null=True, blank=True
+        storage=content_addressed_storage, null=True, blank=True
     )
     submission_text = models.TextField(blank=True)
     submission_url = models.URLField(blank=True)
@@ -181,3 +230,53 @@ class AssignmentSubmission(models.Model):
         if self.submitted_at and self.assignment.due_date:
             return self.submitted_at > self.assignment.due_date
         return False
+
+
+class ChunkedUpload(models.Model):
+    """
+    A file uploaded in pieces so large videos and scans survive flaky networks.
+    Each accepted chunk is kept as a part file under MEDIA_ROOT; once `offset`
+    reaches `total_size` the parts are joined, hashed, verified and stored in
+    `file`, which content and submissions then reference via `upload_id`.
+    """
+
+    STATUS_CHOICES = [
+        ("uploading", "Uploading"),
+        ("complete", "Complete"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Soft link to the uploading User (public schema)
+    user_id = models.UUIDField(db_index=True)
+
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Expected digest sent by the client; replaced by the verified digest",
+    )
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default="uploading"
+    )
+    file = models.FileField(storage=content_addressed_storage, null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.total_size})"
+
+    @property
+    def parts_dir(self):
+        from django.conf import settings
+
+        return settings.MEDIA_ROOT / "chunked_uploads" / str(self.id)
+
+    def discard_parts(self):
+        shutil.rmtree(self.parts_dir, ignore_errors=True)
@@ -0,0 +1,247 @@
+"""
+List projections (core.projections) of course content and submissions,
+rendering what CourseContentSerializer and AssignmentSubmissionSerializer
+render for the same rows.
+"""
+
+from core.projections import (
+    OMIT,
+    Projection,
+    datetime_value,
+    decimal_value,
+    full_name,
+)
+from .links import content_download_url, content_preview_urls, submission_download_url
+from .models import AssignmentSubmission, ContentType, CourseContent
+
+PROFILE_NAME = ("profile__first_name", "profile__middle_name", "profile__last_name")
+
+
+class CourseContentProjection(Projection):
+    columns = {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "content_type": "content_type",
+        "file_size": "file_size",
+        "file_mime_type": "file_mime_type",
+        "file_sha256": "file_sha256",
+        "file_pages": "file_pages",
+        "file_duration": "file_duration",
+        "external_url": "external_url",
+        "created_by": "created_by_id",
+        "is_published": "is_published",
+        "publish_date": ("publish_date", datetime_value),
+        "is_pinned": "is_pinned",
+        "created_at": ("created_at", datetime_value),
+        "updated_at": ("updated_at", datetime_value),
+    }
+    computed = {
+        "content_type_display": ("content_type",),
+        "download_url": ("file",),
+        "file_previews": ("file", "derivatives"),
+        "created_by_name": tuple(f"created_by__{lookup}" for lookup in PROFILE_NAME),
+        "target_programs": (),
+        "target_programs_details": (),
+        "target_levels": (),
+        "target_levels_details": (),
+        "target_sections": (),
+        "target_sections_details": (),
+        "target_subjects": (),
+        "target_subjects_details": (),
+        "specific_students": (),
+    }
+    # many-to-many field -> the detail keys the serializer adds besides "id"
+    many = {
+        "target_programs": {"name": "name"},
+        "target_levels": {"name": "name", "program": "program__name"},
+        "target_sections": {"name": "name", "level": "level__name"},
+        "target_subjects": {"name": "name", "code": "code"},
+        "specific_students": {},
+    }
+    fields = (
+        "id",
+        "title",
+        "description",
+        "content_type",
+        "content_type_display",
+        "download_url",
+        "file_size",
+        "file_mime_type",
+        "file_sha256",
+        "file_pages",
+        "file_duration",
+        "file_previews",
+        "external_url",
+        "created_by",
+        "created_by_name",
+        "target_programs",
+        "target_programs_details",
+        "target_levels",
+        "target_levels_details",
+        "target_sections",
+        "target_sections_details",
+        "target_subjects",
+        "target_subjects_details",
+        "specific_students",
+        "is_published",
+        "publish_date",
+        "is_pinned",
+        "created_at",
+        "updated_at",
+    )
+
+    content_types = dict(ContentType.choices)
+
+    def prepare(self, rows):
+        """One query per many-to-many field the kept fields use, for the whole page."""
+        content_ids = [row["pk"] for row in rows]
+        self.related = {}
+        for name, details in self.many.items():
+            if name not in self.fields and f"{name}_details" not in self.fields:
+                continue
+            field = CourseContent._meta.get_field(name)
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            # Same order as `content.<name>.all()`
+            ordering = [
+                f"-{target}__{o[1:]}" if o.startswith("-") else f"{target}__{o}"
+                for o in field.related_model._meta.ordering
+            ]
+            links = (
+                field.remote_field.through.objects.filter(**{f"{source}__in": content_ids})
+                .order_by(*ordering, "pk")
+                .values(
+                    f"{source}_id",
+                    f"{target}_id",
+                    *(f"{target}__{lookup}" for lookup in details.values()),
+                )
+            )
+            by_content = self.related[name] = {}
+            for link in links:
+                by_content.setdefault(link[f"{source}_id"], []).append(
+                    {
+                        "id": link[f"{target}_id"],
+                        **{key: link[f"{target}__{lookup}"] for key, lookup in details.items()},
+                    }
+                )
+
+    def _related(self, row, name):
+        return self.related[name].get(row["pk"], [])
+
+    def get_content_type_display(self, row):
+        return self.content_types.get(row["content_type"], row["content_type"])
+
+    def get_download_url(self, row):
+        if not row["file"]:
+            return None
+        return content_download_url(row["pk"], self.context.get("request"))
+
+    def get_file_previews(self, row):
+        return content_preview_urls(
+            row["pk"], row["derivatives"], row["file"], self.context.get("request")
+        )
+
+    def get_created_by_name(self, row):
+        if row["created_by__profile__first_name"] is None:
+            return OMIT
+        return full_name(*(row[f"created_by__{lookup}"] for lookup in PROFILE_NAME))
+
+    def get_target_programs(self, row):
+        return [item["id"] for item in self._related(row, "target_programs")]
+
+    def get_target_programs_details(self, row):
+        return self._related(row, "target_programs")
+
+    def get_target_levels(self, row):
+        return [item["id"] for item in self._related(row, "target_levels")]
+
+    def get_target_levels_details(self, row):
+        return self._related(row, "target_levels")
+
+    def get_target_sections(self, row):
+        return [item["id"] for item in self._related(row, "target_sections")]
+
+    def get_target_sections_details(self, row):
+        return self._related(row, "target_sections")
+
+    def get_target_subjects(self, row):
+        return [item["id"] for item in self._related(row, "target_subjects")]
+
+    def get_target_subjects_details(self, row):
+        return self._related(row, "target_subjects")
+
+    def get_specific_students(self, row):
+        return [item["id"] for item in self._related(row, "specific_students")]
+
+
+class AssignmentSubmissionProjection(Projection):
+    columns = {
+        "id": "id",
+        "assignment": "assignment_id",
+        "assignment_title": "assignment__content__title",
+        "student": "student_id",
+        "student_enrollment_id": "student__enrollment_id",
+        "submitted_at": ("submitted_at", datetime_value),
+        "submission_text": "submission_text",
+        "submission_url": "submission_url",
+        "status": "status",
+        "score": ("score", decimal_value(max_digits=5, decimal_places=2)),
+        "feedback": "feedback",
+        "graded_by": "graded_by_id",
+        "graded_at": ("graded_at", datetime_value),
+        "created_at": ("created_at", datetime_value),
+        "updated_at": ("updated_at", datetime_value),
+    }
+    computed = {
+        "student_name": tuple(f"student__{lookup}" for lookup in PROFILE_NAME),
+        "download_url": ("submission_file",),
+        "status_display": ("status",),
+        "graded_by_name": tuple(f"graded_by__{lookup}" for lookup in PROFILE_NAME),
+        "is_late": ("submitted_at", "assignment__due_date"),
+    }
+    fields = (
+        "id",
+        "assignment",
+        "assignment_title",
+        "student",
+        "student_name",
+        "student_enrollment_id",
+        "submitted_at",
+        "download_url",
+        "submission_text",
+        "submission_url",
+        "status",
+        "status_display",
+        "score",
+        "feedback",
+        "graded_by",
+        "graded_by_name",
+        "graded_at",
+        "is_late",
+        "created_at",
+        "updated_at",
+    )
+
+    statuses = dict(AssignmentSubmission.STATUS_CHOICES)
+
+    def get_student_name(self, row):
+        return full_name(*(row[f"student__{lookup}"] for lookup in PROFILE_NAME))
+
+    def get_download_url(self, row):
+        if not row["submission_file"]:
+            return None
+        return submission_download_url(row["pk"], self.context.get("request"))
+
+    def get_status_display(self, row):
+        return self.statuses.get(row["status"], row["status"])
+
+    def get_graded_by_name(self, row):
+        if row["graded_by__profile__first_name"] is None:
+            return OMIT
+        return full_name(*(row[f"graded_by__{lookup}"] for lookup in PROFILE_NAME))
+
+    def get_is_late(self, row):
+        # AssignmentSubmission.is_late
+        if row["submitted_at"] and row["assignment__due_date"]:
+            return row["submitted_at"] > row["assignment__due_date"]
+        return False
@@ -1,5 +1,16 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
-from .models import CourseContent, SubjectEnrollment, Assignment, AssignmentSubmission
+from .models import (
+    CourseContent,
+    SubjectEnrollment,
+    Assignment,
+    AssignmentSubmission,
+    ChunkedUpload,
+)
+from .links import content_download_url, content_preview_urls, submission_download_url
+from .uploads import resolve_upload
 from django.utils import timezone
 
 
@@ -10,7 +21,6 @@ class CourseContentSerializer(serializers.ModelSerializer):
     content_type_display = serializers.CharField(
         source="get_content_type_display", read_only=True
     )
-    file_size = serializers.SerializerMethodField()
 
     # Target details for display
     target_programs_details = serializers.SerializerMethodField()
@@ -18,6 +28,17 @@ class CourseContentSerializer(serializers.ModelSerializer):
     target_sections_details = serializers.SerializerMethodField()
     target_subjects_details = serializers.SerializerMethodField()
 
+    # Files are uploaded here but only ever sent by the download action, which
+    # checks access; the stored file's media URL is never exposed
+    file = serializers.FileField(write_only=True, required=False, allow_null=True)
+    download_url = serializers.SerializerMethodField()
+
+    # Thumbnail/first-page preview URLs of image and PDF files
+    file_previews = serializers.SerializerMethodField()
+
+    # Completed ChunkedUpload to use as `file` instead of a multipart upload
+    upload_id = serializers.UUIDField(write_only=True, required=False)
+
     class Meta:
         model = CourseContent
         fields = [
@@ -27,7 +48,14 @@ class CourseContentSerializer(serializers.ModelSerializer):
             "content_type",
             "content_type_display",
             "file",
+            "download_url",
             "file_size",
+            "file_mime_type",
+            "file_sha256",
+            "file_pages",
+            "file_duration",
+            "file_previews",
+            "upload_id",
             "external_url",
             "created_by",
             "created_by_name",
@@ -46,16 +74,26 @@ class CourseContentSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["created_by", "created_at", "updated_at"]
+        read_only_fields = [
+            "created_by",
+            "file_size",
+            "file_mime_type",
+            "file_sha256",
+            "file_pages",
+            "file_duration",
+            "created_at",
+            "updated_at",
+        ]
 
-    def get_file_size(self, obj):
-        if obj.file:
-            try:
-                return obj.file.size
-            except (FileNotFoundError, OSError):
-                # File reference exists in DB but file is missing on disk
-                return None
-        return None
+    def get_download_url(self, obj):
+        if not obj.file:
+            return None
+        return content_download_url(obj.pk, self.context.get("request"))
+
+    def get_file_previews(self, obj):
+        return content_preview_urls(
+            obj.pk, obj.derivatives, obj.file.name, self.context.get("request")
+        )
 
     def get_target_programs_details(self, obj):
         return [{"id": p.id, "name": p.name} for p in obj.target_programs.all()]
@@ -86,6 +124,10 @@ class CourseContentSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """Ensure either file or external_url is provided for non-assignment content"""
+        upload_id = data.pop("upload_id", None)
+        if upload_id:
+            data["file"] = resolve_upload(upload_id, self.context["request"].user)
+
         content_type = data.get("content_type")
         file = data.get("file")
         external_url = data.get("external_url")
@@ -127,8 +169,9 @@ class SubjectEnrollmentSerializer(serializers.ModelSerializer):
             "subject_code",
             "academic_year",
             "enrolled_at",
+            "source",
         ]
-        read_only_fields = ["enrolled_at"]
+        read_only_fields = ["enrolled_at", "source"]
 
 
 class AssignmentSerializer(serializers.ModelSerializer):
@@ -186,6 +229,9 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
     )
     status_display = serializers.CharField(source="get_status_display", read_only=True)
     is_late = serializers.BooleanField(read_only=True)
+    # Sent only by the download action, to the student and to graders
+    submission_file = serializers.FileField(write_only=True, required=False, allow_null=True)
+    download_url = serializers.SerializerMethodField()
 
     class Meta:
         model = AssignmentSubmission
@@ -198,6 +244,7 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
             "student_enrollment_id",
             "submitted_at",
             "submission_file",
+            "download_url",
             "submission_text",
             "submission_url",
             "status",
@@ -220,6 +267,11 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
             "is_late",
         ]
 
+    def get_download_url(self, obj):
+        if not obj.submission_file:
+            return None
+        return submission_download_url(obj.pk, self.context.get("request"))
+
     def validate_submission_file(self, value):
         """Validate file size (max 10MB)"""
         if value and value.size > 10 * 1024 * 1024:  # 10MB
@@ -236,6 +288,7 @@ class CreateAssignmentSerializer(serializers.Serializer):
     title = serializers.CharField(max_length=200)
     description = serializers.CharField()
     file = serializers.FileField(required=False, allow_null=True)
+    upload_id = serializers.UUIDField(required=False)
     external_url = serializers.URLField(required=False, allow_blank=True)
 
     # Targeting
@@ -268,8 +321,98 @@ class CreateAssignmentSerializer(serializers.Serializer):
     late_penalty_percent = serializers.IntegerField(default=0)
     instructions = serializers.CharField()
 
+    def validate(self, data):
+        upload_id = data.pop("upload_id", None)
+        if upload_id:
+            data["file"] = resolve_upload(upload_id, self.context["request"].user)
+        return data
+
     def validate_file(self, value):
         """Validate file size (max 10MB)"""
         if value and value.size > 10 * 1024 * 1024:  # 10MB
             raise serializers.ValidationError("File size must not exceed 10MB")
         return value
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChunkedUpload
+        fields = [
+            "id",
+            "filename",
+            "total_size",
+            "offset",
+            "sha256",
+            "status",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["offset", "status", "created_at", "updated_at"]
+
+    def validate_filename(self, value):
+        filename = os.path.basename(value.replace("\\", "/"))
+        if not filename:
+            raise serializers.ValidationError("A file name is required")
+        return filename
+
+    def validate_total_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("File may not be empty")
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"File size must not exceed {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes"
+            )
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if value and (len(value) != 64 or any(c not in "0123456789abcdef" for c in value)):
+            raise serializers.ValidationError("Must be a hex-encoded SHA-256 digest")
+        return value
+
+
+class GradeEntrySerializer(serializers.Serializer):
+    submission_id = serializers.UUIDField()
+    score = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0)
+    feedback = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class BulkGradeSerializer(serializers.Serializer):
+    """
+    Payload for grading many submissions at once.
+    Scores are checked against each assignment's `total_points` in the view.
+    """
+
+    grades = GradeEntrySerializer(many=True, allow_empty=False, max_length=1000)
+
+    def validate_grades(self, value):
+        submission_ids = [entry["submission_id"] for entry in value]
+        if len(submission_ids) != len(set(submission_ids)):
+            raise serializers.ValidationError("Each submission may only appear once.")
+        return value
+
+
+class BulkEnrollSerializer(serializers.Serializer):
+    """
+    Payload for enrolling many students in one subject. Students are given
+    explicitly, by whole section or level (current placements), or both.
+    """
+
+    subject_id = serializers.UUIDField()
+    academic_year = serializers.CharField(max_length=20)
+    student_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, default=list, max_length=5000
+    )
+    section_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, default=list, max_length=100
+    )
+    level_ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, default=list, max_length=100
+    )
+
+    def validate(self, data):
+        if not (data["student_ids"] or data["section_ids"] or data["level_ids"]):
+            raise serializers.ValidationError(
+                "Provide student_ids, section_ids or level_ids."
+            )
+        return data
@@ -0,0 +1,116 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from academics.models import Subject, SubjectAssignment
+from students.models import StudentLevel
+from .enrollments import drop_derived_enrollments, sync_subject_enrollments
+from .gradebook import bump_gradebook_version
+from .models import Assignment, AssignmentSubmission, CourseContent
+
+
+@receiver(pre_save, sender=CourseContent)
+def capture_file_metadata(sender, instance, **kwargs):
+    """
+    Records size, MIME type, checksum and page/duration metadata whenever the
+    file changes, so serializers never stat the stored file.
+    """
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "file" not in update_fields:
+        return
+
+    current_name = instance.file.name or ""
+    if instance._state.adding:
+        previous_name = None
+    else:
+        previous_name = (
+            CourseContent.objects.filter(pk=instance.pk)
+            .values_list("file", flat=True)
+            .first()
+        )
+    file_changed = not instance.file._committed or (previous_name or "") != current_name
+    if file_changed or (current_name and instance.file_size is None):
+        instance.refresh_file_metadata()
+
+
+@receiver(pre_save, sender=StudentLevel)
+def remember_previous_year(sender, instance, raw=False, **kwargs):
+    instance._previous_academic_year = None
+    if instance.pk and not raw:
+        instance._previous_academic_year = (
+            StudentLevel.objects.filter(pk=instance.pk)
+            .values_list("academic_year", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=StudentLevel)
+def placement_saved(sender, instance, raw=False, **kwargs):
+    """Keeps a student's core subject enrollments in step with their section."""
+    if raw:
+        return
+    previous_year = getattr(instance, "_previous_academic_year", None)
+    if previous_year and previous_year != instance.academic_year:
+        drop_derived_enrollments(instance.student_id, previous_year)
+    if instance.is_current:
+        sync_subject_enrollments(student_ids=[instance.student_id])
+
+
+@receiver(post_delete, sender=StudentLevel)
+def placement_deleted(sender, instance, **kwargs):
+    drop_derived_enrollments(instance.student_id, instance.academic_year)
+
+
+@receiver(pre_save, sender=SubjectAssignment)
+def remember_previous_section(sender, instance, raw=False, **kwargs):
+    instance._previous_section_id = None
+    if instance.pk and not raw:
+        instance._previous_section_id = (
+            SubjectAssignment.objects.filter(pk=instance.pk)
+            .values_list("section_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=SubjectAssignment)
+@receiver(post_delete, sender=SubjectAssignment)
+def section_subjects_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_subject_enrollments(
+        section_ids=[instance.section_id, getattr(instance, "_previous_section_id", None)]
+    )
+
+
+@receiver(post_save, sender=Subject)
+def subject_saved(sender, instance, created=False, raw=False, **kwargs):
+    # Toggling is_elective adds or removes the subject for whole sections
+    if created or raw:
+        return
+    sync_subject_enrollments(
+        section_ids=list(instance.assignments.values_list("section_id", flat=True))
+    )
+
+
+# --- Gradebook cache version ---
+# Gradebooks read submissions, assignments and their subject/section
+# targeting, and current placements; any change to those bumps the version.
+
+
+@receiver(post_save, sender=AssignmentSubmission)
+@receiver(post_delete, sender=AssignmentSubmission)
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+@receiver(post_save, sender=CourseContent)
+@receiver(post_delete, sender=CourseContent)
+@receiver(post_save, sender=StudentLevel)
+@receiver(post_delete, sender=StudentLevel)
+def gradebook_data_changed(sender, raw=False, **kwargs):
+    if not raw:
+        bump_gradebook_version()
+
+
+@receiver(m2m_changed, sender=CourseContent.target_subjects.through)
+@receiver(m2m_changed, sender=CourseContent.target_sections.through)
+def gradebook_targeting_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_gradebook_version()
@@ -1,3 +1,1037 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+from PIL import Image
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.renderers import ORJSONRenderer
+from academics.models import Program, AcademicLevel, Section, Subject, SubjectAssignment
+from accounts.models import User
+from filestore.models import MediaBlob
+from organizations.models import Domain
+from filestore.storage import content_addressed_storage, protected_storage
+from profiles.models import Profile
+from profiles.serializers import ProfileSerializer
+from roles.models import Permission, Role, UserRole
+from staff.models import StaffMember
+from students.models import Student, StudentLevel
+from .models import (
+    CourseContent,
+    Assignment,
+    AssignmentSubmission,
+    ChunkedUpload,
+    SubjectEnrollment,
+)
+from .gradebook import compute_gradebook, get_gradebook
+from .serializers import AssignmentSubmissionSerializer, CourseContentSerializer
+
+
+def pdf_with_text(text, pages=1):
+    """A minimal PDF whose `pages` pages each draw `text`."""
+    stream = f"BT /F1 24 Tf 72 720 Td ({text}) Tj ET".encode()
+    kids = b" ".join(b"%d 0 R" % (5 + page) for page in range(pages))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages),
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ] + [
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 3 0 R "
+        b"/Resources << /Font << /F1 4 0 R >> >> >>"
+    ] * pages
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    body += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    body += b"trailer << /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF" % (len(objects) + 1, xref)
+    return body
+
+
+class TemporaryMediaMixin:
+    """
+    Points MEDIA_ROOT at a throwaway directory. TenantTestCase does not call
+    TestCase.setUpClass, so class-level override_settings would be ignored.
+    """
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        overrides = override_settings(
+            MEDIA_ROOT=Path(media_root), MEDIA_SENDFILE_BACKEND="", DERIVATIVE_WORKERS=0
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+
+class GradebookTest(TenantTestCase):
+    """
+    Verifies weighted totals, late penalties and that the cached gradebook
+    follows grading and submitting.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        program = Program.objects.create(name="High School", code="HS")
+        level = AcademicLevel.objects.create(program=program, name="Grade 9", order=1)
+        self.section = Section.objects.create(level=level, name="A")
+        self.subject = Subject.objects.create(level=level, name="Mathematics", code="MTH")
+        self.teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Tea", last_name="Cher"),
+            employee_id="EMP-1",
+            designation="Teacher",
+        )
+
+        self.students = []
+        for index in range(3):
+            student = Student.objects.create(
+                profile=Profile.objects.create(first_name=f"Student{index}", last_name="Test"),
+                enrollment_id=f"STD-{index}",
+            )
+            StudentLevel.objects.create(
+                student=student, level=level, section=self.section, academic_year="2026"
+            )
+            self.students.append(student)
+
+        self.due = timezone.now() - timedelta(days=10)
+        self.quiz = self._assignment("Quiz", total_points=10, penalty=0)
+        self.project = self._assignment("Project", total_points=100, penalty=10)
+
+    def _assignment(self, title, total_points, penalty):
+        content = CourseContent.objects.create(
+            title=title,
+            description="",
+            content_type="assignment",
+            created_by=self.teacher,
+        )
+        content.target_subjects.add(self.subject)
+        return Assignment.objects.create(
+            content=content,
+            due_date=self.due,
+            total_points=total_points,
+            late_penalty_percent=penalty,
+            instructions="",
+        )
+
+    def _grade(self, assignment, student, score, days_late=0):
+        return AssignmentSubmission.objects.create(
+            assignment=assignment,
+            student=student,
+            submitted_at=self.due + timedelta(days=days_late, hours=-1 if not days_late else 1),
+            status="graded",
+            score=score,
+        )
+
+    def test_weighted_totals_and_late_penalty(self):
+        first, second, _ = self.students
+        self._grade(self.quiz, first, 10)
+        self._grade(self.project, first, 50)
+        # Two days and an hour late: 3 started days x 10% penalty
+        self._grade(self.project, second, 100, days_late=2)
+
+        with CaptureQueriesContext(connection) as queries:
+            gradebook = compute_gradebook(self.section.id, self.subject.id)
+        # django-tenants re-issues SET search_path around queries; count only reads
+        selects = [q for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 4)
+
+        rows = {row["student_id"]: row for row in gradebook["students"]}
+        self.assertEqual(rows[first.id]["weighted_percentage"], 54.55)
+        self.assertEqual(rows[first.id]["average_percentage"], 75.0)
+        self.assertEqual(rows[second.id]["earned"], 70.0)
+        self.assertEqual(rows[second.id]["raw_score"], 100.0)
+        self.assertIsNone(rows[self.students[2].id]["weighted_percentage"])
+        self.assertEqual(gradebook["class_average"], 62.27)
+
+    def test_grade_action_invalidates_cache(self):
+        submission = AssignmentSubmission.objects.create(
+            assignment=self.quiz, student=self.students[0], status="submitted"
+        )
+        self.assertIsNone(
+            get_gradebook(self.section.id, self.subject.id)["students"][0]["earned"]
+        )
+
+        admin = User.objects.create_superuser(username="grader", password="x")
+        self.teacher.profile.user_id = admin.id
+        self.teacher.profile.save()
+        api = APIClient(HTTP_HOST=self.domain.domain)
+        api.force_authenticate(admin)
+        response = api.post(
+            f"/api/course-content/submissions/{submission.id}/grade/", {"score": 8}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        gradebook = api.get(
+            "/api/course-content/gradebook/",
+            {"section": str(self.section.id), "subject": str(self.subject.id)},
+        ).json()
+        self.assertEqual(gradebook["students"][0]["earned"], 8.0)
+
+    def test_submitting_refreshes_the_served_gradebook(self):
+        submission = AssignmentSubmission.objects.create(
+            assignment=self.quiz, student=self.students[0]
+        )
+        student_user = User.objects.create_superuser(username="submitter", password="x")
+        profile = self.students[0].profile
+        profile.user_id = student_user.id
+        profile.save()
+
+        api = APIClient(HTTP_HOST=self.domain.domain)
+        api.force_authenticate(User.objects.create_superuser(username="viewer", password="x"))
+        query = {"section": str(self.section.id), "subject": str(self.subject.id)}
+        rows = api.get("/api/course-content/gradebook/", query).json()["students"]
+        self.assertEqual(rows[0]["submitted_count"], 0)
+
+        api.force_authenticate(student_user)
+        response = api.post(
+            f"/api/course-content/submissions/{submission.id}/submit/",
+            {"submission_text": "My answer"},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        api.force_authenticate(User.objects.get(username="viewer"))
+        rows = api.get("/api/course-content/gradebook/", query).json()["students"]
+        self.assertEqual(rows[0]["submitted_count"], 1)
+
+    def test_bulk_grade_is_all_or_nothing(self):
+        submissions = [
+            AssignmentSubmission.objects.create(
+                assignment=self.quiz, student=student, status="submitted"
+            )
+            for student in self.students
+        ]
+        admin = User.objects.create_superuser(username="bulkgrader", password="x")
+        self.teacher.profile.user_id = admin.id
+        self.teacher.profile.save()
+        api = APIClient(HTTP_HOST=self.domain.domain)
+        api.force_authenticate(admin)
+
+        over_limit = [{"submission_id": str(s.id), "score": 11} for s in submissions[:1]]
+        response = api.post(
+            "/api/course-content/submissions/bulk_grade/",
+            {"grades": over_limit + [{"submission_id": str(submissions[1].id), "score": 5}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertFalse(AssignmentSubmission.objects.filter(status="graded").exists())
+
+        response = api.post(
+            "/api/course-content/submissions/bulk_grade/",
+            {
+                "grades": [
+                    {"submission_id": str(s.id), "score": 7, "feedback": "ok"}
+                    for s in submissions
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["graded"], 3)
+        self.assertEqual(
+            AssignmentSubmission.objects.filter(
+                status="graded", score=7, graded_by=self.teacher
+            ).count(),
+            3,
+        )
+
+
+class ChunkedUploadTest(TemporaryMediaMixin, TenantTestCase):
+    """
+    Verifies that an interrupted upload resumes from its offset and that
+    the assembled, hash-verified file can be attached to content.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_superuser(username="uploader", password="x")
+        StaffMember.objects.create(
+            profile=Profile.objects.create(
+                first_name="Up", last_name="Loader", user_id=self.user.id
+            ),
+            employee_id="EMP-UP",
+            designation="Teacher",
+        )
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(self.user)
+        self.payload = os.urandom(300_000)
+
+    def _put(self, upload_id, start, end):
+        return self.api.put(
+            f"/api/course-content/uploads/{upload_id}/chunk/",
+            self.payload[start : end + 1],
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{end}/{len(self.payload)}",
+        )
+
+    def test_resume_and_attach(self):
+        upload = self.api.post(
+            "/api/course-content/uploads/",
+            {
+                "filename": "lecture.mp4",
+                "total_size": len(self.payload),
+                "sha256": hashlib.sha256(self.payload).hexdigest(),
+            },
+            format="json",
+        ).json()
+
+        self.assertEqual(self._put(upload["id"], 0, 99_999).json()["offset"], 100_000)
+        # A retried chunk that does not start at the acknowledged offset is refused
+        conflict = self._put(upload["id"], 0, 99_999)
+        self.assertEqual((conflict.status_code, conflict.json()["offset"]), (409, 100_000))
+
+        done = self._put(upload["id"], 100_000, len(self.payload) - 1).json()
+        self.assertEqual(done["status"], "complete")
+
+        stored = ChunkedUpload.objects.get(id=upload["id"])
+        with stored.file.open("rb") as handle:
+            self.assertEqual(handle.read(), self.payload)
+        self.assertFalse(stored.parts_dir.exists())
+
+        response = self.api.post(
+            "/api/course-content/content/",
+            {
+                "title": "Lecture",
+                "description": "Week 1",
+                "content_type": "video",
+                "upload_id": upload["id"],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(CourseContent.objects.get().file.name, stored.file.name)
+
+    def test_checksum_mismatch_resets_upload(self):
+        upload = self.api.post(
+            "/api/course-content/uploads/",
+            {"filename": "scan.pdf", "total_size": len(self.payload), "sha256": "0" * 64},
+            format="json",
+        ).json()
+        response = self._put(upload["id"], 0, len(self.payload) - 1)
+        self.assertEqual((response.status_code, response.json()["offset"]), (409, 0))
+        self.assertEqual(ChunkedUpload.objects.get(id=upload["id"]).offset, 0)
+
+    def test_interrupted_finalize_completes_on_retry(self):
+        upload = self.api.post(
+            "/api/course-content/uploads/",
+            {"filename": "lecture.mp4", "total_size": len(self.payload)},
+            format="json",
+        ).json()
+        # Every part was accepted, but the process died before the file was stored
+        stored = ChunkedUpload.objects.get(id=upload["id"])
+        stored.parts_dir.mkdir(parents=True)
+        for start, end in ((0, 99_999), (100_000, len(self.payload) - 1)):
+            (stored.parts_dir / f"{start:020d}.part").write_bytes(self.payload[start : end + 1])
+        ChunkedUpload.objects.filter(id=upload["id"]).update(offset=len(self.payload))
+
+        done = self._put(upload["id"], 100_000, len(self.payload) - 1).json()
+        self.assertEqual(done["status"], "complete")
+        stored.refresh_from_db()
+        with stored.file.open("rb") as handle:
+            self.assertEqual(handle.read(), self.payload)
+        self.assertEqual(stored.sha256, hashlib.sha256(self.payload).hexdigest())
+
+    def test_only_own_uploads_complete_without_bytes(self):
+        announce = {
+            "filename": "lecture.mp4",
+            "total_size": len(self.payload),
+            "sha256": hashlib.sha256(self.payload).hexdigest(),
+        }
+        first = self.api.post("/api/course-content/uploads/", announce, format="json").json()
+        self._put(first["id"], 0, len(self.payload) - 1)
+
+        again = self.api.post("/api/course-content/uploads/", announce, format="json").json()
+        self.assertEqual(again["status"], "complete")
+        self.assertEqual(
+            ChunkedUpload.objects.get(id=again["id"]).file.name,
+            ChunkedUpload.objects.get(id=first["id"]).file.name,
+        )
+
+        # Knowing the digest is not enough to obtain another user's file
+        other = APIClient(HTTP_HOST=self.domain.domain)
+        other.force_authenticate(User.objects.create_superuser(username="other", password="x"))
+        guess = other.post("/api/course-content/uploads/", announce, format="json").json()
+        self.assertEqual((guess["status"], guess["offset"]), ("uploading", 0))
+        self.assertFalse(ChunkedUpload.objects.get(id=guess["id"]).file)
+
+
+class ContentAddressedStorageTest(TemporaryMediaMixin, TenantTestCase):
+    """
+    Verifies that identical files share one reference-counted blob
+    and that unreferenced blobs are garbage-collected.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Tea", last_name="Cher"),
+            employee_id="EMP-CAS",
+            designation="Teacher",
+        )
+
+    def _content(self, filename):
+        return CourseContent.objects.create(
+            title=filename,
+            description="",
+            content_type="document",
+            created_by=self.teacher,
+            file=ContentFile(b"%PDF-1.4 same bytes", name=filename),
+        )
+
+    def test_identical_files_share_a_blob(self):
+        first = self._content("Final_Year_Project.pdf")
+        second = self._content("Fianl_Year_Project.pdf")
+
+        self.assertEqual(first.file.name, second.file.name)
+        blob = MediaBlob.objects.get()
+        self.assertEqual((blob.name, blob.ref_count), (first.file.name, 2))
+
+        first.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+
+        second.delete()
+        MediaBlob.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        call_command("gc_media_blobs", "--recount", stdout=StringIO())
+
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(content_addressed_storage.exists(blob.name))
+
+
+class ProtectedDownloadTest(TemporaryMediaMixin, TenantTestCase):
+    """
+    Verifies byte-range and conditional downloads, and the X-Accel hand-off.
+    """
+
+    def setUp(self):
+        super().setUp()
+        teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Tea", last_name="Cher"),
+            employee_id="EMP-DL",
+            designation="Teacher",
+        )
+        self.payload = bytes(range(256)) * 40
+        self.content = CourseContent.objects.create(
+            title="Week 1 Video",
+            description="",
+            content_type="video",
+            created_by=teacher,
+            file=ContentFile(self.payload, name="week1.mp4"),
+        )
+        self.url = f"/api/course-content/content/{self.content.id}/download/"
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="viewer", password="x"))
+
+    def test_range_and_conditional_requests(self):
+        response = self.api.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.payload[100:200])
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(self.payload)}")
+
+        suffix = self.api.get(self.url, HTTP_RANGE="bytes=-10")
+        self.assertEqual(b"".join(suffix.streaming_content), self.payload[-10:])
+
+        unsatisfiable = self.api.get(self.url, HTTP_RANGE=f"bytes={len(self.payload)}-")
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+        full = self.api.get(self.url)
+        self.assertEqual(full.status_code, 200)
+        self.assertEqual(full["Content-Type"], "video/mp4")
+        cached = self.api.get(self.url, HTTP_IF_NONE_MATCH=full["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+    async def test_asgi_streams_without_buffering(self):
+        # AsyncClient always sends "Host: testserver"
+        await Domain.objects.acreate(domain="testserver", tenant=self.tenant, is_primary=False)
+        client = AsyncClient()
+        viewer = await User.objects.aget(username="viewer")
+        client.cookies["access_token"] = str(RefreshToken.for_user(viewer).access_token)
+
+        full = await client.get(self.url)
+        self.assertEqual(full.status_code, 200)
+        # A synchronous iterator would be read into memory whole by Django's ASGI handler
+        self.assertTrue(full.is_async)
+        self.assertEqual(full["Content-Length"], str(len(self.payload)))
+        self.assertEqual(b"".join([block async for block in full.streaming_content]), self.payload)
+
+        part = await client.get(self.url, headers={"range": "bytes=100-199"})
+        self.assertEqual((part.status_code, part["Content-Length"]), (206, "100"))
+        self.assertEqual(
+            b"".join([block async for block in part.streaming_content]), self.payload[100:200]
+        )
+
+    @override_settings(MEDIA_SENDFILE_BACKEND="nginx")
+    def test_nginx_handoff(self):
+        response = self.api.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.content.file.name}"
+        )
+        self.assertEqual(response.content, b"")
+
+    def test_files_and_previews_are_only_linked_through_the_api(self):
+        photo = io.BytesIO()
+        Image.new("RGB", (1600, 900), "navy").save(photo, "PNG")
+        with self.captureOnCommitCallbacks(execute=True):
+            diagram = CourseContent.objects.create(
+                title="Diagram",
+                description="",
+                content_type="document",
+                created_by=self.content.created_by,
+                file=ContentFile(photo.getvalue(), name="diagram.png"),
+            )
+
+        data = self.api.get(f"/api/course-content/content/{diagram.id}/").json()
+        self.assertNotIn("file", data)
+        self.assertTrue(data["download_url"].endswith(f"/content/{diagram.id}/download/"))
+        self.assertEqual(set(data["file_previews"]), {"thumb", "preview"})
+        preview = self.api.get(data["file_previews"]["thumb"])
+        self.assertEqual((preview.status_code, preview["Content-Type"]), (200, "image/webp"))
+        no_preview = f"/api/course-content/content/{self.content.id}/preview/thumb/"
+        self.assertEqual(self.api.get(no_preview).status_code, 404)
+
+        # Previews show the file, so they are kept out of public media like it
+        diagram.refresh_from_db()
+        stored = diagram.derivatives["file"]["thumb"]
+        self.assertTrue(protected_storage.exists(stored))
+        self.assertFalse(default_storage.exists(stored))
+
+        # Students who cannot see the content get neither the file nor its previews
+        student_user = User.objects.create_user(username="stu", password="x")
+        Student.objects.create(
+            profile=Profile.objects.create(
+                first_name="Stu", last_name="Dent", user_id=student_user.id
+            ),
+            enrollment_id="DL-1",
+        )
+        role = Role.objects.get(slug="student")
+        role.permissions.add(Permission.objects.get(codename="view_course_content"))
+        UserRole.objects.create(user=student_user, role=role)
+        self.api.force_authenticate(student_user)
+        self.assertEqual(self.api.get(data["download_url"]).status_code, 403)
+        self.assertEqual(self.api.get(data["file_previews"]["thumb"]).status_code, 403)
+
+
+class FileMetadataTest(TemporaryMediaMixin, TenantTestCase):
+    """
+    Verifies that file metadata is captured on save and served without storage access.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Tea", last_name="Cher"),
+            employee_id="EMP-META",
+            designation="Teacher",
+        )
+
+    def test_metadata_captured_on_upload(self):
+        pdf = pdf_with_text("Chloroplasts", pages=2)
+        content = CourseContent.objects.create(
+            title="Notes",
+            description="",
+            content_type="document",
+            created_by=self.teacher,
+            file=ContentFile(pdf, name="notes.pdf"),
+        )
+        self.assertEqual(content.file_size, len(pdf))
+        self.assertEqual(content.file_mime_type, "application/pdf")
+        self.assertEqual(content.file_sha256, hashlib.sha256(pdf).hexdigest())
+        self.assertEqual(content.file_pages, 2)
+        self.assertIn("Chloroplasts", content.extracted_text)
+
+        # mvhd version 0: timescale 1000, duration 90500 -> 90.5 seconds
+        mvhd = b"\x00" * 4 + b"\x00" * 8 + (1000).to_bytes(4, "big") + (90500).to_bytes(4, "big")
+        moov = (8 + 8 + len(mvhd)).to_bytes(4, "big") + b"moov" + (8 + len(mvhd)).to_bytes(4, "big") + b"mvhd" + mvhd
+        mp4 = (16).to_bytes(4, "big") + b"ftypisom\x00\x00\x00\x00" + moov
+        video = CourseContent.objects.create(
+            title="Video",
+            description="",
+            content_type="video",
+            created_by=self.teacher,
+            file=ContentFile(mp4, name="clip.mp4"),
+        )
+        self.assertEqual((video.file_mime_type, video.file_duration), ("video/mp4", 90.5))
+
+        CourseContent.objects.filter(pk=content.pk).update(file_size=None, file_pages=None)
+        call_command("backfill_file_metadata", stdout=StringIO())
+        content.refresh_from_db()
+        self.assertEqual((content.file_size, content.file_pages), (len(pdf), 2))
+
+    def test_malformed_video_has_no_duration(self):
+        def box(box_type, body=b"", size=None):
+            return (8 + len(body) if size is None else size).to_bytes(4, "big") + box_type + body
+
+        cases = {
+            # 64-bit size smaller than the header would walk backwards forever
+            "zero_largesize.mp4": box(b"free", (0).to_bytes(8, "big"), size=1),
+            "short_largesize.mp4": box(b"free", b"\x00\x00\x01", size=1),
+            "short_box.mp4": box(b"free", size=4),
+            "truncated_mvhd.mp4": box(b"moov", box(b"mvhd", size=108)),
+            "empty.mp4": b"",
+        }
+        for name, data in cases.items():
+            with self.subTest(name):
+                video = CourseContent.objects.create(
+                    title=name,
+                    description="",
+                    content_type="video",
+                    created_by=self.teacher,
+                    file=ContentFile(data, name=name),
+                )
+                self.assertEqual((video.file_size, video.file_duration), (len(data), None))
+
+
+class DerivativeTest(TemporaryMediaMixin, TenantTestCase):
+    """
+    Verifies that uploaded photos get WebP thumbnails exposed by the serializer.
+    """
+
+    def test_profile_photo_thumbnails(self):
+        photo = io.BytesIO()
+        Image.new("RGB", (1200, 800), "teal").save(photo, "JPEG")
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = Profile.objects.create(
+                first_name="Photo",
+                last_name="Graph",
+                profile_image=ContentFile(photo.getvalue(), name="camera.jpg"),
+            )
+
+        profile.refresh_from_db()
+        thumbnails = ProfileSerializer(profile).data["profile_image_thumbnails"]
+        self.assertEqual(set(thumbnails), {"thumb", "small"})
+
+        stored = profile.derivatives["profile_image"]["thumb"]
+        with Image.open(default_storage.open(stored)) as thumb:
+            self.assertEqual((thumb.format, max(thumb.size)), ("WEBP", 64))
+
+        # Replacing the photo invalidates the recorded derivatives until they are regenerated
+        profile.profile_image = ContentFile(photo.getvalue(), name="other.png")
+        profile.save()
+        self.assertEqual(ProfileSerializer(profile).data["profile_image_thumbnails"], {})
+
+
+class FullTextSearchTest(TemporaryMediaMixin, TenantTestCase):
+    """
+    Verifies ranked prefix search over titles, descriptions and PDF text.
+    """
+
+    def setUp(self):
+        super().setUp()
+        teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Tea", last_name="Cher"),
+            employee_id="EMP-FTS",
+            designation="Teacher",
+        )
+        self.in_description = CourseContent.objects.create(
+            title="Week 3 notes",
+            description="Introduction to photosynthesis in plants",
+            content_type="note",
+            created_by=teacher,
+        )
+        self.in_title = CourseContent.objects.create(
+            title="Photosynthesis",
+            description="Chapter summary",
+            content_type="note",
+            created_by=teacher,
+        )
+        self.in_pdf = CourseContent.objects.create(
+            title="Cell biology handout",
+            description="Read before class",
+            content_type="document",
+            created_by=teacher,
+            file=ContentFile(pdf_with_text("Mitochondria powerhouse"), name="cells.pdf"),
+        )
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="searcher", password="x"))
+
+    def _search(self, term):
+        response = self.api.get("/api/course-content/content/", {"search": term})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["id"] for row in response.json()["results"]]
+
+    def test_ranked_prefix_search(self):
+        self.assertEqual(
+            self._search("photosynth"), [str(self.in_title.id), str(self.in_description.id)]
+        )
+        self.assertEqual(self._search("mitochondria"), [str(self.in_pdf.id)])
+        self.assertEqual(self._search("cell hand"), [str(self.in_pdf.id)])
+        self.assertEqual(self._search("&|!"), self._search(""))
+
+
+class BulkEnrollTest(TenantTestCase):
+    """
+    Verifies bulk enrollment resolves section selectors server-side, skips
+    existing enrollments and runs a fixed number of queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        level = AcademicLevel.objects.create(program=program, name="Grade 9", order=1)
+        self.section = Section.objects.create(level=level, name="A")
+        self.subject = Subject.objects.create(level=level, name="Science", code="SCI9")
+
+        self.placed = []
+        for index in range(5):
+            student = Student.objects.create(
+                profile=Profile.objects.create(first_name=f"S{index}", last_name="Test"),
+                enrollment_id=f"BE-{index}",
+            )
+            StudentLevel.objects.create(
+                student=student, level=level, section=self.section, academic_year="2026"
+            )
+            self.placed.append(student)
+        self.outsider = Student.objects.create(
+            profile=Profile.objects.create(first_name="Out", last_name="Sider"),
+            enrollment_id="BE-X",
+        )
+        SubjectEnrollment.objects.create(
+            student=self.placed[0], subject=self.subject, academic_year="2026"
+        )
+
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+
+    def _enroll(self, **payload):
+        payload = {"subject_id": str(self.subject.id), "academic_year": "2026", **payload}
+        return self.api.post(
+            "/api/course-content/subject-enrollments/bulk_enroll/", payload, format="json"
+        )
+
+    def test_section_selector_and_counts(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._enroll(
+                section_ids=[str(self.section.id)],
+                student_ids=[str(self.outsider.id), str(self.placed[1].id)],
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        self.assertEqual(
+            (data["total_requested"], data["newly_enrolled"], data["skipped"]), (6, 5, 1)
+        )
+        self.assertEqual(SubjectEnrollment.objects.filter(subject=self.subject).count(), 6)
+
+        writes = [q for q in queries.captured_queries if q["sql"].startswith("INSERT")]
+        selects = [
+            q for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and "organizations_domain" not in q["sql"]
+        ]
+        self.assertEqual((len(writes), len(selects)), (1, 5))
+
+        response = self._enroll(section_ids=[str(self.section.id)])
+        self.assertEqual(response.json()["newly_enrolled"], 0)
+
+    def test_unknown_student_rejects_everything(self):
+        response = self._enroll(
+            student_ids=[str(self.outsider.id), "00000000-0000-0000-0000-000000000000"]
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SubjectEnrollment.objects.filter(student=self.outsider).exists())
+
+
+class DerivedEnrollmentTest(TenantTestCase):
+    """
+    Verifies core subjects follow section placements and assignments while
+    electives and manual enrollments are left alone.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        level = AcademicLevel.objects.create(program=program, name="Grade 9", order=1)
+        self.section_a = Section.objects.create(level=level, name="A")
+        self.section_b = Section.objects.create(level=level, name="B")
+        self.maths = Subject.objects.create(level=level, name="Maths", code="MTH9")
+        self.physics = Subject.objects.create(level=level, name="Physics", code="PHY9")
+        self.music = Subject.objects.create(
+            level=level, name="Music", code="MUS9", is_elective=True
+        )
+        for section in (self.section_a, self.section_b):
+            SubjectAssignment.objects.create(section=section, subject=self.maths)
+            SubjectAssignment.objects.create(section=section, subject=self.music)
+        SubjectAssignment.objects.create(section=self.section_a, subject=self.physics)
+
+        self.student = Student.objects.create(
+            profile=Profile.objects.create(first_name="Der", last_name="Ived"),
+            enrollment_id="DE-1",
+        )
+        self.placement = StudentLevel.objects.create(
+            student=self.student, level=level, section=self.section_a, academic_year="2026"
+        )
+
+    def _subjects(self, source=None):
+        enrollments = SubjectEnrollment.objects.filter(student=self.student)
+        if source:
+            enrollments = enrollments.filter(source=source)
+        return set(enrollments.values_list("subject__code", flat=True))
+
+    def test_placement_changes_sync_core_subjects(self):
+        self.assertEqual(self._subjects(), {"MTH9", "PHY9"})
+
+        # A manual elective survives every sync
+        SubjectEnrollment.objects.create(
+            student=self.student, subject=self.music, academic_year="2026"
+        )
+        self.placement.section = self.section_b
+        self.placement.save()
+        self.assertEqual(self._subjects(), {"MTH9", "MUS9"})
+        self.assertEqual(self._subjects("manual"), {"MUS9"})
+
+        self.placement.delete()
+        self.assertEqual(self._subjects(), {"MUS9"})
+
+    def test_assignment_and_elective_changes(self):
+        self.physics.is_elective = True
+        self.physics.save()
+        self.assertEqual(self._subjects(), {"MTH9"})
+
+        chemistry = Subject.objects.create(
+            level=self.section_a.level, name="Chemistry", code="CHM9"
+        )
+        SubjectAssignment.objects.create(section=self.section_a, subject=chemistry)
+        self.assertEqual(self._subjects(), {"MTH9", "CHM9"})
+
+    def test_reconcile_command(self):
+        SubjectEnrollment.objects.filter(student=self.student).delete()
+        out = StringIO()
+        call_command("sync_subject_enrollments", schema=self.tenant.schema_name, stdout=out)
+        self.assertIn("2 enrollments derived", out.getvalue())
+        self.assertEqual(self._subjects("section"), {"MTH9", "PHY9"})
+
+
+class ListProjectionTest(TemporaryMediaMixin, TenantTestCase):
+    """
+    Verifies the content and submission lists, served from projections,
+    render exactly what their serializers render, in a fixed number of queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        levels = [
+            AcademicLevel.objects.create(program=program, name=f"Grade {order}", order=order)
+            for order in (9, 10)
+        ]
+        section = Section.objects.create(level=levels[0], name="A")
+        subject = Subject.objects.create(level=levels[0], name="Biology", code="BIO9")
+        teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Tea", middle_name="M", last_name="Cher"),
+            employee_id="EMP-PRJ",
+            designation="Teacher",
+        )
+        student = Student.objects.create(
+            profile=Profile.objects.create(first_name="Stu", last_name="Dent"),
+            enrollment_id="PRJ-1",
+        )
+        other = Student.objects.create(
+            profile=Profile.objects.create(first_name="Oth", last_name="Er"),
+            enrollment_id="PRJ-2",
+        )
+
+        handout = CourseContent.objects.create(
+            title="Handout",
+            description="Read me",
+            content_type="document",
+            created_by=teacher,
+            file=ContentFile(pdf_with_text("Cells"), name="cells.pdf"),
+            is_published=True,
+            publish_date=timezone.now(),
+        )
+        handout.target_programs.add(program)
+        handout.target_levels.add(*levels)
+        handout.target_sections.add(section)
+        handout.target_subjects.add(subject)
+        handout.specific_students.add(student)
+        homework = CourseContent.objects.create(
+            title="Homework", description="Due soon", content_type="assignment", created_by=teacher
+        )
+        assignment = Assignment.objects.create(
+            content=homework, due_date=timezone.now() - timedelta(days=1), instructions="Go"
+        )
+        AssignmentSubmission.objects.create(
+            assignment=assignment,
+            student=student,
+            submitted_at=timezone.now(),
+            submission_file=ContentFile(b"answer", name="answer.txt"),
+            status="graded",
+            score="8.5",
+            graded_by=teacher,
+            graded_at=timezone.now(),
+        )
+        AssignmentSubmission.objects.create(assignment=assignment, student=other)
+
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+        self.request = APIRequestFactory().get("/", HTTP_HOST=self.domain.domain)
+
+    def _list(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        selects = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and "organizations_domain" not in q["sql"]
+        ]
+        return {row["id"]: row for row in response.json()["results"]}, selects
+
+    def _serialized(self, serializer_class, queryset):
+        data = serializer_class(queryset, many=True, context={"request": self.request}).data
+        return {row["id"]: row for row in json.loads(ORJSONRenderer().render(data))}
+
+    def test_content_list_matches_the_serializer(self):
+        rows, selects = self._list("/api/course-content/content/")
+        # the user's profile, count, the page, one query per many-to-many field
+        self.assertEqual(len(selects), 8, selects)
+        expected = self._serialized(CourseContentSerializer, CourseContent.objects.all())
+        self.assertEqual(rows, expected)
+        handout = next(row for row in rows.values() if row["title"] == "Handout")
+        self.assertEqual(len(handout["target_levels_details"]), 2)
+        self.assertEqual(handout["created_by_name"], "Tea M Cher")
+        # Files are linked through the download action, never as media URLs
+        self.assertNotIn("file", handout)
+        self.assertIn(f"/content/{handout['id']}/download/", handout["download_url"])
+
+    def test_submission_list_matches_the_serializer(self):
+        rows, selects = self._list("/api/course-content/submissions/")
+        self.assertEqual(len(selects), 3, selects)
+        expected = self._serialized(
+            AssignmentSubmissionSerializer, AssignmentSubmission.objects.all()
+        )
+        self.assertEqual(rows, expected)
+        self.assertEqual({row["score"] for row in rows.values()}, {"8.50", None})
+        self.assertEqual(
+            {row["download_url"] is None for row in rows.values()}, {True, False}
+        )
+
+    def test_sparse_fields_skip_unused_queries(self):
+        rows, selects = self._list("/api/course-content/content/?fields=id,title,target_subjects")
+        self.assertEqual(len(selects), 4, selects)
+        self.assertEqual({len(row) for row in rows.values()}, {3})
+
+
+class ContentFeedTest(TenantTestCase):
+    """
+    Verifies the async feed shows students only the published content
+    targeted at them, pages without a COUNT and keeps its query count flat.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        level = AcademicLevel.objects.create(program=program, name="Grade 9", order=9)
+        other_level = AcademicLevel.objects.create(program=program, name="Grade 10", order=10)
+        section = Section.objects.create(level=level, name="A")
+        subject = Subject.objects.create(level=other_level, name="Chemistry", code="CHE10")
+        teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Tea", last_name="Cher"),
+            employee_id="EMP-FEED",
+            designation="Teacher",
+        )
+
+        self.student_user = User.objects.create_user(username="stu", password="x")
+        student = Student.objects.create(
+            profile=Profile.objects.create(
+                first_name="Stu", last_name="Dent", user_id=self.student_user.id
+            ),
+            enrollment_id="FEED-1",
+        )
+        StudentLevel.objects.create(
+            student=student, level=level, section=section, academic_year="2026", is_current=True
+        )
+        SubjectEnrollment.objects.create(student=student, subject=subject, academic_year="2026")
+        role = Role.objects.get(slug="student")
+        role.permissions.add(Permission.objects.get(codename="view_course_content"))
+        UserRole.objects.create(user=self.student_user, role=role)
+
+        def content(title, targets=(), published=True):
+            item = CourseContent.objects.create(
+                title=title,
+                description="",
+                content_type="document",
+                created_by=teacher,
+                is_published=published,
+            )
+            for relation, target in targets:
+                getattr(item, relation).add(target)
+            return item
+
+        content("For the program", [("target_programs", program)])
+        content("For the section", [("target_sections", section)])
+        content("For the subject", [("target_subjects", subject)])
+        content("Just for them", [("specific_students", student)])
+        content("For another level", [("target_levels", other_level)])
+        content("Draft", [("target_sections", section)], published=False)
+
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+
+    def test_students_see_their_targeted_content(self):
+        self.api.force_authenticate(self.student_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get("/api/course-content/feed/", {"limit": 3})
+        self.assertEqual(response.status_code, 200, response.content)
+        selects = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and "organizations_domain" not in q["sql"]
+        ]
+        # permission check (3), student, placement, the page, one per many-to-many field (5)
+        self.assertEqual(len(selects), 11, selects)
+
+        page = response.json()
+        self.assertEqual(len(page["results"]), 3)
+        self.assertIsNone(page["previous"])
+        rest = self.api.get(page["next"]).json()
+        self.assertIsNone(rest["next"])
+        titles = {row["title"] for row in page["results"] + rest["results"]}
+        self.assertEqual(
+            titles, {"For the program", "For the section", "For the subject", "Just for them"}
+        )
+
+        # The content list applies the same rules
+        listed = self.api.get("/api/course-content/content/").json()["results"]
+        self.assertEqual({row["title"] for row in listed}, titles)
+
+    def test_placement_without_a_level_matches_no_untargeted_content(self):
+        StudentLevel.objects.update(level=None, section=None)
+        CourseContent.objects.create(
+            title="Untargeted",
+            description="",
+            content_type="document",
+            created_by=StaffMember.objects.get(),
+        )
+        self.api.force_authenticate(self.student_user)
+        response = self.api.get("/api/course-content/feed/")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            {row["title"] for row in response.json()["results"]},
+            {"For the subject", "Just for them"},
+        )
+
+    def test_everyone_else_sees_all_published_content(self):
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+        response = self.api.get("/api/course-content/feed/")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()["results"]), 5)
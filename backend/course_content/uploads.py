@@ -0,0 +1,225 @@
+"""
+Chunked, resumable uploads.
+
+A client creates a ChunkedUpload with the file's size (and optionally its
+SHA-256), then PUTs raw byte ranges with a `Content-Range` header. Chunks are
+streamed to disk without buffering the request; an interrupted upload resumes
+from `offset`. When the last byte arrives the parts are joined, hashed,
+verified and moved into storage. No database lock or transaction is held
+while request bodies are read or files are hashed and copied.
+"""
+
+import hashlib
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from rest_framework import serializers
+from rest_framework.parsers import BaseParser
+
+from .models import ChunkedUpload
+
+COPY_BUFFER_SIZE = 64 * 1024
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class UploadError(Exception):
+    """Raised when a chunk cannot be applied; carries the offset to resume from."""
+
+    def __init__(self, message, offset=None):
+        super().__init__(message)
+        self.offset = offset
+
+
+class RawChunkParser(BaseParser):
+    """Hands the request stream to the view so chunks are never held in memory."""
+
+    media_type = "application/octet-stream"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+def parse_content_range(header):
+    """Returns (start, end, total) from `bytes start-end/total`, end inclusive."""
+    match = CONTENT_RANGE_RE.match(header or "")
+    if not match:
+        raise UploadError("Content-Range header must look like 'bytes 0-1023/4096'")
+    start, end, total = (int(value) for value in match.groups())
+    if end < start:
+        raise UploadError("Content-Range end must not be before its start")
+    return start, end, total
+
+
+def part_name(start):
+    # Zero-padded so the parts sort by offset
+    return f"{start:020d}.part"
+
+
+def check_chunk(upload, start, end, total):
+    """Raises UploadError unless the range is the next chunk of `upload`."""
+    if upload.status == "complete":
+        raise UploadError("Upload is already complete", upload.offset)
+    if total != upload.total_size:
+        raise UploadError("Content-Range total does not match the upload size", upload.offset)
+    if start != upload.offset:
+        raise UploadError(f"Expected a chunk starting at byte {upload.offset}", upload.offset)
+    if end >= total:
+        raise UploadError("Content-Range end is past the end of the file", upload.offset)
+    if end - start + 1 > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError(
+            f"Chunks may not exceed {settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE} bytes",
+            upload.offset,
+        )
+
+
+def append_chunk(upload_id, stream, content_range):
+    """
+    Stores one byte range as a part file and finalizes the upload when it is
+    complete. The body is read into a staging file before any lock is taken;
+    the row lock only guards checking the offset, moving the part into place
+    and advancing the offset, so a slow client never holds it.
+    """
+    upload = ChunkedUpload.objects.get(id=upload_id)
+    if upload.status != "complete" and upload.offset == upload.total_size:
+        # Every byte arrived but finalizing was interrupted; finish it now
+        return finish_upload(upload)
+
+    start, end, total = parse_content_range(content_range)
+    check_chunk(upload, start, end, total)
+
+    length = end - start + 1
+    upload.parts_dir.mkdir(parents=True, exist_ok=True)
+    staged = upload.parts_dir / f".{start}-{uuid.uuid4().hex}"
+    try:
+        written = 0
+        with open(staged, "wb") as handle:
+            while written < length:
+                block = stream.read(min(COPY_BUFFER_SIZE, length - written))
+                if not block:
+                    break
+                handle.write(block)
+                written += len(block)
+        if written != length:
+            raise UploadError(
+                f"Chunk body has {written} bytes but Content-Range announced {length}",
+                upload.offset,
+            )
+
+        with transaction.atomic():
+            upload = ChunkedUpload.objects.select_for_update().get(id=upload_id)
+            # A concurrent chunk for the same range may have won the race
+            check_chunk(upload, start, end, total)
+            os.replace(staged, upload.parts_dir / part_name(start))
+            upload.offset += written
+            upload.save(update_fields=["offset", "updated_at"])
+    finally:
+        staged.unlink(missing_ok=True)
+
+    if upload.offset < upload.total_size:
+        return upload
+    return finish_upload(upload)
+
+
+def finish_upload(upload):
+    """finalize_upload, raising UploadError on a checksum mismatch."""
+    if not finalize_upload(upload):
+        raise UploadError("Checksum mismatch; the upload was reset", 0)
+    upload.refresh_from_db()
+    return upload
+
+
+def finalize_upload(upload):
+    """
+    Joins and hashes the parts and stores the file, outside any transaction;
+    a short locked update then records the result. On a checksum mismatch the
+    parts are discarded, the offset is reset and False is returned.
+    """
+    assembled = upload.parts_dir / f".assembled-{uuid.uuid4().hex}"
+    digest = hashlib.sha256()
+    try:
+        with open(assembled, "wb") as output:
+            for part in sorted(upload.parts_dir.glob("*.part")):
+                with open(part, "rb") as handle:
+                    for block in iter(lambda: handle.read(COPY_BUFFER_SIZE), b""):
+                        digest.update(block)
+                        output.write(block)
+        digest = digest.hexdigest()
+
+        if upload.sha256 and upload.sha256.lower() != digest:
+            with transaction.atomic():
+                upload = ChunkedUpload.objects.select_for_update().get(id=upload.id)
+                if upload.status == "complete":
+                    # Finalized by a concurrent request, which removed the parts
+                    return True
+                upload.discard_parts()
+                upload.offset = 0
+                upload.save(update_fields=["offset", "updated_at"])
+            return False
+
+        with open(assembled, "rb") as handle:
+            content = File(handle)
+            content.sha256 = digest
+            name = upload.file.storage.save(upload.filename, content)
+    finally:
+        assembled.unlink(missing_ok=True)
+
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(id=upload.id)
+        # A concurrent request may have finalized the same upload already
+        if upload.status != "complete":
+            upload.file.name = name
+            upload.sha256 = digest
+            upload.status = "complete"
+            upload.save(update_fields=["sha256", "status", "file", "updated_at"])
+    upload.discard_parts()
+    return True
+
+
+def complete_from_existing_blob(upload):
+    """
+    Finishes an upload without transferring bytes when the same user has
+    already uploaded a file with the announced SHA-256 and size. Limited to
+    the user's own completed uploads: a digest alone is not proof of having
+    the bytes, so it never grants access to someone else's file. Returns
+    True if the upload was completed.
+    """
+    if not upload.sha256:
+        return False
+    previous = (
+        ChunkedUpload.objects.filter(
+            user_id=upload.user_id,
+            status="complete",
+            sha256=upload.sha256.lower(),
+            total_size=upload.total_size,
+        )
+        .exclude(id=upload.id)
+        .exclude(file="")
+        .first()
+    )
+    if not previous:
+        return False
+    upload.file.name = previous.file.name
+    upload.sha256 = previous.sha256
+    upload.offset = upload.total_size
+    upload.status = "complete"
+    upload.save()
+    return True
+
+
+def resolve_upload(upload_id, user):
+    """
+    Returns the stored file name of a completed upload owned by `user`,
+    for assigning to a FileField without copying the bytes again.
+    """
+    upload = ChunkedUpload.objects.filter(
+        id=upload_id, user_id=user.id, status="complete"
+    ).first()
+    if not upload:
+        raise serializers.ValidationError(
+            {"upload_id": "Upload not found or not complete"}
+        )
+    return upload.file.name
@@ -5,6 +5,9 @@ from .views import (
     SubjectEnrollmentViewSet,
     AssignmentViewSet,
     AssignmentSubmissionViewSet,
+    GradebookView,
+    ContentFeedView,
+    ChunkedUploadViewSet,
 )
 
 router = DefaultRouter()
@@ -14,7 +17,10 @@ router.register(
 )
 router.register(r"assignments", AssignmentViewSet, basename="assignment")
 router.register(r"submissions", AssignmentSubmissionViewSet, basename="submission")
+router.register(r"uploads", ChunkedUploadViewSet, basename="upload")
 
 urlpatterns = [
+    path("gradebook/", GradebookView.as_view(), name="gradebook"),
+    path("feed/", ContentFeedView.as_view(), name="content-feed"),
     path("", include(router.urls)),
 ]
@@ -1,21 +1,62 @@
+import os
+
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.db.models import Q
+from django.utils.text import slugify
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-
-from .models import CourseContent, SubjectEnrollment, Assignment, AssignmentSubmission
+from rest_framework.filters import OrderingFilter
+from rest_framework.generics import get_object_or_404
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import (
+    CourseContent,
+    SubjectEnrollment,
+    Assignment,
+    AssignmentSubmission,
+    ChunkedUpload,
+)
 from .serializers import (
     CourseContentSerializer,
     SubjectEnrollmentSerializer,
     AssignmentSerializer,
     AssignmentSubmissionSerializer,
     CreateAssignmentSerializer,
+    BulkGradeSerializer,
+    BulkEnrollSerializer,
+    ChunkedUploadSerializer,
 )
-from students.models import Student
+from students.models import Student, StudentLevel
 from roles.permissions import HasPermission
+from academics.roster import bump_student_sections
+from core.async_views import AsyncAPIView
+from core.mixins import SparseFieldsMixin
+from core.pagination import DefaultPagination
+from core.projections import ProjectionListMixin
+from core.search import FullTextSearchFilter
+from filestore.derivatives import recorded_derivatives
+from filestore.serving import serve_file
+from filestore.storage import protected_storage
+from .gradebook import bump_gradebook_version, get_gradebook
+from .projections import AssignmentSubmissionProjection, CourseContentProjection
+from .uploads import (
+    RawChunkParser,
+    UploadError,
+    append_chunk,
+    complete_from_existing_blob,
+    resolve_upload,
+)
+
+
+def download_name(title, stored_name):
+    """Human-readable file name: the title plus the stored file's extension."""
+    extension = os.path.splitext(stored_name)[1]
+    return f"{slugify(title) or 'file'}{extension}"
 
 
 def can_student_access_content(student, content):
@@ -39,7 +80,7 @@ def can_student_access_content(student, content):
             return True
 
         # Check program targeting
-        if content.target_programs.filter(
+        if current_enrollment.level_id and content.target_programs.filter(
             id=current_enrollment.level.program_id
         ).exists():
             return True
@@ -52,17 +93,62 @@ def can_student_access_content(student, content):
     return False
 
 
-class CourseContentViewSet(viewsets.ModelViewSet):
-    queryset = CourseContent.objects.all().select_related("created_by__profile")
+def current_placement(student_id):
+    """values() of the student's current placement, the one can_student_access_content uses."""
+    return StudentLevel.objects.filter(student_id=student_id, is_current=True).values(
+        "section_id", "level_id", "level__program_id"
+    )
+
+
+def visible_to_student(student_id, placement):
+    """
+    The rules of can_student_access_content as one filter over content,
+    for a student and their current placement (or None).
+    """
+    targets = {
+        "specific_students": student_id,
+        "target_subjects__in": SubjectEnrollment.objects.filter(student_id=student_id).values(
+            "subject_id"
+        ),
+    }
+    if placement:
+        # A NULL id would become an __isnull=True lookup and match untargeted content
+        for lookup, key in (
+            ("target_sections", "section_id"),
+            ("target_levels", "level_id"),
+            ("target_programs", "level__program_id"),
+        ):
+            if placement[key]:
+                targets[lookup] = placement[key]
+
+    # One subquery per relation keeps the outer query free of duplicate rows
+    visible = Q()
+    for lookup, value in targets.items():
+        visible |= Q(id__in=CourseContent.objects.filter(**{lookup: value}).values("id"))
+    return visible
+
+
+class CourseContentViewSet(ProjectionListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    # The search columns can be large; they are only needed inside the database
+    queryset = (
+        CourseContent.objects.all()
+        .select_related("created_by__profile")
+        .defer("extracted_text", "search_vector")
+    )
     serializer_class = CourseContentSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    projection_class = CourseContentProjection
+    # Search results come back in rank order, which a cursor cannot encode
+    pagination_class = DefaultPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ["content_type", "is_published", "is_pinned", "created_by"]
-    search_fields = ["title", "description"]
+    # ?search= ranks by the GIN-indexed search_vector; ?fuzzy=true adds typo tolerance
+    search_vector_field = "search_vector"
+    trigram_fields = ["title"]
     ordering_fields = ["created_at", "updated_at", "publish_date"]
     ordering = ["-is_pinned", "-created_at"]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "download", "preview"]:
             return [permissions.IsAuthenticated(), HasPermission("view_course_content")]
         return [permissions.IsAuthenticated(), HasPermission("manage_course_content")]
 
@@ -83,15 +169,10 @@ class CourseContentViewSet(viewsets.ModelViewSet):
         profile = Profile.objects.filter(user_id=user.id).first()
         if profile and hasattr(profile, "student_record"):
             student = profile.student_record
-            queryset = queryset.filter(is_published=True)
-
-            # Filter based on access control
-            accessible_ids = [
-                content.id
-                for content in queryset
-                if can_student_access_content(student, content)
-            ]
-            queryset = queryset.filter(id__in=accessible_ids)
+            placement = current_placement(student.id).first()
+            queryset = queryset.filter(is_published=True).filter(
+                visible_to_student(student.id, placement)
+            )
 
         return queryset
 
@@ -115,6 +196,75 @@ class CourseContentViewSet(viewsets.ModelViewSet):
             ),
         )
 
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """
+        Serves the content's file after checking the student's visibility.
+        Supports Range and conditional requests; bytes are sent by the web server
+        when MEDIA_SENDFILE_BACKEND is configured.
+        """
+        content = get_object_or_404(CourseContent, pk=pk)
+        if not content.file:
+            return Response(
+                {"error": "This content has no file"}, status=status.HTTP_404_NOT_FOUND
+            )
+        denied = self._deny_student(request, content)
+        if denied:
+            return denied
+
+        return serve_file(
+            request,
+            content.file.storage,
+            content.file.name,
+            filename=download_name(content.title, content.file.name),
+            as_attachment=request.query_params.get("download") == "true",
+        )
+
+    @action(detail=True, methods=["get"], url_path=r"preview/(?P<label>[a-z]+)")
+    def preview(self, request, pk=None, label=None):
+        """
+        Serves a thumbnail or first-page preview of the content's file, with
+        the same visibility check as download.
+        """
+        content = get_object_or_404(CourseContent, pk=pk)
+        previews = recorded_derivatives(
+            content.derivatives, "file", content.file.name if content.file else None
+        )
+        if label not in previews:
+            return Response(
+                {"error": "This content has no such preview"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        denied = self._deny_student(request, content)
+        if denied:
+            return denied
+
+        return serve_file(
+            request,
+            protected_storage,
+            previews[label],
+            filename=download_name(f"{content.title} {label}", previews[label]),
+        )
+
+    def _deny_student(self, request, content):
+        """403 response when the requester is a student who cannot see `content`."""
+        from profiles.models import Profile
+
+        profile = (
+            Profile.objects.filter(user_id=request.user.id)
+            .select_related("student_record")
+            .first()
+        )
+        student = getattr(profile, "student_record", None) if profile else None
+        if student and not (
+            content.is_published and can_student_access_content(student, content)
+        ):
+            return Response(
+                {"error": "You do not have access to this content"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return None
+
     @action(detail=False, methods=["get"])
     def my_content(self, request):
         """Get content created by the current staff member (excluding assignments)"""
@@ -142,7 +292,62 @@ class CourseContentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class SubjectEnrollmentViewSet(viewsets.ModelViewSet):
+class ContentFeedView(AsyncAPIView):
+    """
+    Published content, pinned first and then newest, paged by ?limit=/?offset=.
+    Students get what is targeted at them, everyone else all of it;
+    `?exclude_assignments=true` leaves assignments out as on the content list.
+    Every student client opens and refreshes it, so it is served async.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasPermission("view_course_content")]
+
+    async def get(self, request):
+        queryset = CourseContent.objects.filter(is_published=True)
+        if request.query_params.get("exclude_assignments", "").lower() == "true":
+            queryset = queryset.exclude(content_type="assignment")
+
+        student_id = (
+            await Student.objects.filter(profile__user_id=request.user.id)
+            .values_list("id", flat=True)
+            .afirst()
+        )
+        if student_id:
+            placement = await current_placement(student_id).afirst()
+            queryset = queryset.filter(visible_to_student(student_id, placement))
+
+        pagination = DefaultPagination()
+        limit, offset = pagination.get_limit(request), pagination.get_offset(request)
+        projection = CourseContentProjection({"request": request})
+        # One row past the page tells whether there is a next one, without a COUNT
+        rows = [
+            row
+            async for row in projection.values(
+                queryset.order_by("-is_pinned", "-created_at", "id")
+            )[offset : offset + limit + 1]
+        ]
+
+        url = request.build_absolute_uri()
+        param = pagination.offset_query_param
+        previous = None
+        if offset:
+            previous = (
+                replace_query_param(url, param, offset - limit)
+                if offset > limit
+                else remove_query_param(url, param)
+            )
+        return self.respond(
+            {
+                "next": replace_query_param(url, param, offset + limit)
+                if len(rows) > limit
+                else None,
+                "previous": previous,
+                "results": await projection.arender(rows[:limit]),
+            }
+        )
+
+
+class SubjectEnrollmentViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = SubjectEnrollment.objects.all().select_related(
         "student__profile", "subject__level"
     )
@@ -161,43 +366,93 @@ class SubjectEnrollmentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["post"])
     def bulk_enroll(self, request):
         """
-        Enroll multiple students in a subject
+        Enroll many students in a subject with a fixed number of queries.
         Payload: {
             "subject_id": "uuid",
-            "student_ids": ["uuid1", "uuid2"],
-            "academic_year": "2081"
+            "academic_year": "2081",
+            "student_ids": ["uuid1", "uuid2"],   # and/or
+            "section_ids": ["uuid"],             # everyone currently in these sections
+            "level_ids": ["uuid"]                # everyone currently in these levels
         }
+        Unknown student IDs reject the whole request; students who are
+        already enrolled are skipped and counted.
         """
-        subject_id = request.data.get("subject_id")
-        student_ids = request.data.get("student_ids", [])
-        academic_year = request.data.get("academic_year")
+        serializer = BulkEnrollSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        from academics.models import Subject
 
-        if not all([subject_id, student_ids, academic_year]):
+        if not Subject.objects.filter(id=data["subject_id"]).exists():
             return Response(
-                {"error": "subject_id, student_ids, and academic_year are required"},
+                {"error": "Subject not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Explicit IDs and selectors resolved in one query
+        selected = Q(id__in=data["student_ids"])
+        if data["section_ids"]:
+            selected |= Q(
+                enrollments__is_current=True,
+                enrollments__section_id__in=data["section_ids"],
+            )
+        if data["level_ids"]:
+            selected |= Q(
+                enrollments__is_current=True,
+                enrollments__level_id__in=data["level_ids"],
+            )
+        student_ids = set(
+            Student.objects.filter(selected).values_list("id", flat=True).distinct()
+        )
+        unknown = set(data["student_ids"]) - student_ids
+        if unknown:
+            return Response(
+                {
+                    "error": "Some students do not exist",
+                    "student_ids": sorted(str(student_id) for student_id in unknown),
+                },
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        created_count = 0
-        for student_id in student_ids:
-            _, created = SubjectEnrollment.objects.get_or_create(
-                student_id=student_id,
-                subject_id=subject_id,
-                academic_year=academic_year,
+        enrollments = SubjectEnrollment.objects.filter(
+            subject_id=data["subject_id"], academic_year=data["academic_year"]
+        )
+        with transaction.atomic():
+            enrolled = set(
+                enrollments.filter(student_id__in=student_ids).values_list(
+                    "student_id", flat=True
+                )
+            )
+            new = [
+                SubjectEnrollment(
+                    student_id=student_id,
+                    subject_id=data["subject_id"],
+                    academic_year=data["academic_year"],
+                )
+                for student_id in student_ids - enrolled
+            ]
+            # The unique (student, subject, academic_year) constraint settles
+            # races with concurrent requests; ids are generated here, so
+            # counting them afterwards gives the rows this request inserted
+            SubjectEnrollment.objects.bulk_create(
+                new, batch_size=1000, ignore_conflicts=True
             )
-            if created:
-                created_count += 1
+            created = enrollments.filter(id__in=[e.id for e in new]).count() if new else 0
+
+        # bulk_create sends no signals; refresh the rosters listing these subjects
+        bump_student_sections(e.student_id for e in new)
 
         return Response(
             {
-                "message": f"Enrolled {created_count} students",
+                "message": f"Enrolled {created} students",
                 "total_requested": len(student_ids),
-                "newly_enrolled": created_count,
+                "newly_enrolled": created,
+                "skipped": len(student_ids) - created,
             }
         )
 
 
-class AssignmentViewSet(viewsets.ModelViewSet):
+class AssignmentViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Assignment.objects.all().select_related("content__created_by__profile")
     serializer_class = AssignmentSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
@@ -222,14 +477,14 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         profile = Profile.objects.filter(user_id=user.id).first()
         if profile and hasattr(profile, "student_record"):
             student = profile.student_record
-            accessible_content_ids = [
-                content.id
-                for content in CourseContent.objects.filter(
-                    content_type="assignment", is_published=True
+            placement = current_placement(student.id).first()
+            queryset = queryset.filter(
+                content__in=CourseContent.objects.filter(
+                    visible_to_student(student.id, placement),
+                    content_type="assignment",
+                    is_published=True,
                 )
-                if can_student_access_content(student, content)
-            ]
-            queryset = queryset.filter(content_id__in=accessible_content_ids)
+            )
 
         return queryset
 
@@ -237,7 +492,9 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         """
         Create assignment with content and auto-create pending submissions
         """
-        serializer = CreateAssignmentSerializer(data=request.data)
+        serializer = CreateAssignmentSerializer(
+            data=request.data, context={"request": request}
+        )
         serializer.is_valid(raise_exception=True)
 
         from profiles.models import Profile
@@ -344,11 +601,14 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         return students
 
 
-class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
+class AssignmentSubmissionViewSet(ProjectionListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = AssignmentSubmission.objects.all().select_related(
         "assignment__content", "student__profile", "graded_by__profile"
     )
     serializer_class = AssignmentSubmissionSerializer
+    projection_class = AssignmentSubmissionProjection
+    # submitted_at is NULL until a student submits, so it cannot anchor a cursor
+    pagination_class = DefaultPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ["assignment", "student", "status"]
     ordering_fields = ["submitted_at", "score"]
@@ -375,6 +635,41 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """
+        Serves a submission file to its student or to graders.
+        """
+        submission = get_object_or_404(
+            AssignmentSubmission.objects.select_related(
+                "assignment__content", "student__profile"
+            ),
+            pk=pk,
+        )
+        if submission.student.profile.user_id != request.user.id and not HasPermission(
+            "grade_assignment"
+        ).has_permission(request, self):
+            return Response(
+                {"error": "You do not have access to this submission"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        if not submission.submission_file:
+            return Response(
+                {"error": "This submission has no file"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return serve_file(
+            request,
+            submission.submission_file.storage,
+            submission.submission_file.name,
+            filename=download_name(
+                f"{submission.student.enrollment_id} {submission.assignment.content.title}",
+                submission.submission_file.name,
+            ),
+            as_attachment=True,
+        )
+
     @action(detail=True, methods=["post"])
     def submit(self, request, pk=None):
         """
@@ -389,8 +684,13 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Update submission
-        submission.submission_file = request.data.get("submission_file")
+        # Update submission; large files arrive as a completed chunked upload
+        upload_id = request.data.get("upload_id")
+        submission.submission_file = (
+            resolve_upload(upload_id, request.user)
+            if upload_id
+            else request.data.get("submission_file")
+        )
         submission.submission_text = request.data.get("submission_text", "")
         submission.submission_url = request.data.get("submission_url", "")
         submission.submitted_at = timezone.now()
@@ -400,21 +700,30 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(submission)
         return Response(serializer.data)
 
+    def _get_staff_member(self, request):
+        """Staff record of the requesting user, resolved with a single query."""
+        from profiles.models import Profile
+
+        profile = (
+            Profile.objects.filter(user_id=request.user.id)
+            .select_related("staff_record")
+            .first()
+        )
+        return getattr(profile, "staff_record", None) if profile else None
+
     @action(detail=True, methods=["post"])
     def grade(self, request, pk=None):
         """
         Grade a submission
         """
         submission = self.get_object()
-        from profiles.models import Profile
 
-        profile = Profile.objects.filter(user_id=request.user.id).first()
-        if not profile or not hasattr(profile, "staff_record"):
+        staff_member = self._get_staff_member(request)
+        if not staff_member:
             return Response(
                 {"error": "Staff profile not found"},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        staff_member = profile.staff_record
 
         score = request.data.get("score")
         feedback = request.data.get("feedback", "")
@@ -433,3 +742,163 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(submission)
         return Response(serializer.data)
+
+    @action(detail=False, methods=["post"])
+    def bulk_grade(self, request):
+        """
+        Grade many submissions in one transaction.
+        Payload: {
+            "grades": [{"submission_id": "uuid", "score": 8.5, "feedback": "..."}]
+        }
+        Either every entry is applied or none is.
+        """
+        serializer = BulkGradeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        entries = serializer.validated_data["grades"]
+
+        staff_member = self._get_staff_member(request)
+        if not staff_member:
+            return Response(
+                {"error": "Staff profile not found"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        submissions = {
+            submission.id: submission
+            for submission in AssignmentSubmission.objects.filter(
+                id__in=[entry["submission_id"] for entry in entries]
+            ).select_related("assignment")
+        }
+
+        errors = []
+        for entry in entries:
+            submission = submissions.get(entry["submission_id"])
+            if not submission:
+                errors.append(
+                    {"submission_id": entry["submission_id"], "error": "Submission not found"}
+                )
+            elif entry["score"] > submission.assignment.total_points:
+                errors.append(
+                    {
+                        "submission_id": entry["submission_id"],
+                        "error": f"Score exceeds total points ({submission.assignment.total_points})",
+                    }
+                )
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        graded_at = timezone.now()
+        for entry in entries:
+            submission = submissions[entry["submission_id"]]
+            submission.score = entry["score"]
+            submission.feedback = entry["feedback"]
+            submission.graded_by = staff_member
+            submission.graded_at = graded_at
+            submission.status = "graded"
+            submission.updated_at = graded_at
+
+        graded = list(submissions.values())
+        with transaction.atomic():
+            AssignmentSubmission.objects.bulk_update(
+                graded,
+                ["score", "feedback", "graded_by", "graded_at", "status", "updated_at"],
+                batch_size=500,
+            )
+        # bulk_update sends no signals; refresh the gradebooks and the rosters
+        # showing these statuses
+        bump_gradebook_version()
+        bump_student_sections(s.student_id for s in graded)
+
+        return Response(
+            {
+                "message": f"Graded {len(graded)} submissions",
+                "graded": len(graded),
+                "assignments": len({s.assignment_id for s in graded}),
+                "graded_at": graded_at,
+            }
+        )
+
+
+class GradebookView(APIView):
+    """
+    Grades of every student of a section in one subject.
+    Computed with aggregate queries and cached until a submission is graded.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasPermission("grade_assignment")]
+
+    def get(self, request):
+        section_id = request.query_params.get("section")
+        subject_id = request.query_params.get("subject")
+        if not section_id or not subject_id:
+            return Response(
+                {"error": "section and subject are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        from academics.models import Section, Subject
+
+        try:
+            section = Section.objects.get(id=section_id)
+            subject = Subject.objects.get(id=subject_id)
+        except (Section.DoesNotExist, Subject.DoesNotExist, ValueError, ValidationError):
+            return Response(
+                {"error": "Section or subject not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(get_gradebook(section.id, subject.id))
+
+
+class ChunkedUploadViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Resumable uploads for files beyond the multipart limit.
+    1. POST /uploads/ {"filename", "total_size", "sha256"?}
+       (already `complete` if the same user uploaded a file with that digest before)
+    2. PUT /uploads/{id}/chunk/ with raw bytes and `Content-Range: bytes start-end/total`
+       (GET /uploads/{id}/ returns the `offset` to resume from)
+    3. Pass the completed upload's id as `upload_id` when creating content or submitting.
+    """
+
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return ChunkedUpload.objects.filter(user_id=self.request.user.id)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.save(user_id=request.user.id)
+        # Re-uploads of the user's own earlier file complete instantly
+        complete_from_existing_blob(upload)
+        return Response(
+            self.get_serializer(upload).data, status=status.HTTP_201_CREATED
+        )
+
+    def destroy(self, request, *args, **kwargs):
+        upload = self.get_object()
+        if upload.status == "complete":
+            return Response(
+                {"error": "Completed uploads cannot be cancelled"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        upload.discard_parts()
+        upload.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=["put"], parser_classes=[RawChunkParser])
+    def chunk(self, request, pk=None):
+        upload = self.get_object()
+        try:
+            upload = append_chunk(
+                upload.id, request.data, request.headers.get("Content-Range")
+            )
+        except UploadError as e:
+            return Response(
+                {"error": str(e), "offset": e.offset},
+                status=status.HTTP_409_CONFLICT
+                if e.offset is not None
+                else status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(self.get_serializer(upload).data)
@@ -11,23 +11,26 @@ then
     echo "PostgreSQL started"
 fi
 
-# Run migrations
-# DEV TIP: Uncomment the next 3 lines and run 'docker compose down -v' to hard-reset migrations
-# echo "Development Mode: Cleaning old migration files to ensure sync with current models..."
-# find . -path "*/migrations/*.py" -not -name "__init__.py" -delete
-# find . -path "*/migrations/*.pyc" -delete
+# Run migrations (SKIP_MIGRATIONS=1 for extra servers sharing an already migrated database)
+if [ "$SKIP_MIGRATIONS" != "1" ]
+then
+    # DEV TIP: Uncomment the next 3 lines and run 'docker compose down -v' to hard-reset migrations
+    # echo "Development Mode: Cleaning old migration files to ensure sync with current models..."
+    # find . -path "*/migrations/*.py" -not -name "__init__.py" -delete
+    # find . -path "*/migrations/*.pyc" -delete
 
-echo "Generating fresh migrations..."
-python manage.py makemigrations --noinput
+    echo "Generating fresh migrations..."
+    python manage.py makemigrations --noinput
 
-echo "Syncing SHARED apps (Public Schema)..."
-python manage.py migrate_schemas --shared --noinput
+    echo "Syncing SHARED apps (Public Schema)..."
+    python manage.py migrate_schemas --shared --noinput
 
-echo "Seeding public tenant..."
-python seed_public.py
+    echo "Seeding public tenant..."
+    python seed_public.py
 
-echo "Syncing TENANT apps (All Schemas)..."
-python manage.py migrate_schemas --tenant --noinput
+    echo "Syncing TENANT apps (All Schemas)..."
+    python manage.py migrate_schemas --tenant --noinput
+fi
 
 # Note: Test data population should be run manually for specific tenants
 # Example: python manage.py populate_test_data --schema=your_tenant_name
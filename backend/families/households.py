@@ -0,0 +1,131 @@
+"""
+Households: students and guardians connected through StudentParentRelation.
+
+Two students are siblings when they share a guardian, and a guardian's
+household is every child reachable through shared guardians (a step-parent
+linked to one child still belongs with the other children). Walking that
+graph is a single recursive query: starting from the given students and
+parents, each round follows the relations of every student and parent
+reached so far until nothing new turns up. The final SELECT joins the names
+and relation metadata, so a batch of households costs one query.
+"""
+
+from django.db import connection
+
+from profiles.models import Profile
+from students.models import Student
+from .models import Parent, StudentParentRelation
+
+HOUSEHOLD_SQL = """
+    WITH RECURSIVE reached(student_id, parent_id) AS (
+        SELECT student_id, parent_id FROM {relation}
+        WHERE student_id = ANY(%(student_ids)s::uuid[]) OR parent_id = ANY(%(parent_ids)s::uuid[])
+      UNION
+        SELECT r.student_id, r.parent_id
+        FROM {relation} r
+        JOIN reached ON r.student_id = reached.student_id OR r.parent_id = reached.parent_id
+    )
+    SELECT reached.student_id,
+           st.enrollment_id,
+           st.status,
+           sp.first_name AS student_first_name,
+           sp.last_name AS student_last_name,
+           reached.parent_id,
+           pp.first_name AS parent_first_name,
+           pp.last_name AS parent_last_name,
+           pp.phone,
+           r.relation_type,
+           r.is_primary_contact,
+           r.can_pickup
+    FROM reached
+    JOIN {relation} r ON r.student_id = reached.student_id AND r.parent_id = reached.parent_id
+    JOIN {student} st ON st.id = reached.student_id
+    JOIN {profile} sp ON sp.id = st.profile_id
+    JOIN {parent} pa ON pa.id = reached.parent_id
+    JOIN {profile} pp ON pp.id = pa.profile_id
+    ORDER BY sp.first_name, sp.last_name, pp.first_name, pp.last_name
+"""
+
+
+def _tables():
+    quote = connection.ops.quote_name
+    return {
+        "relation": quote(StudentParentRelation._meta.db_table),
+        "student": quote(Student._meta.db_table),
+        "parent": quote(Parent._meta.db_table),
+        "profile": quote(Profile._meta.db_table),
+    }
+
+
+def load_households(student_ids=(), parent_ids=()):
+    """
+    Households of the given students and parents, one entry per connected
+    group (asking for two siblings returns their household once). Each
+    household lists its students and its guardians, every guardian with the
+    children it is linked to. Students without any guardian have no
+    household and are left out.
+    """
+    params = {
+        "student_ids": [str(student_id) for student_id in student_ids],
+        "parent_ids": [str(parent_id) for parent_id in parent_ids],
+    }
+    if not params["student_ids"] and not params["parent_ids"]:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(HOUSEHOLD_SQL.format(**_tables()), params)
+        columns = [column.name for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    # Union-find over the edges: every row links a student with a guardian
+    root = {}
+
+    def find(node):
+        while root.setdefault(node, node) != node:
+            root[node] = root[root[node]]
+            node = root[node]
+        return node
+
+    for row in rows:
+        root[find(("student", row["student_id"]))] = find(("parent", row["parent_id"]))
+
+    households = {}
+    for row in rows:
+        household = households.setdefault(
+            find(("parent", row["parent_id"])), {"students": {}, "guardians": {}}
+        )
+        household["students"].setdefault(
+            row["student_id"],
+            {
+                "id": row["student_id"],
+                "enrollment_id": row["enrollment_id"],
+                "first_name": row["student_first_name"],
+                "last_name": row["student_last_name"],
+                "status": row["status"],
+            },
+        )
+        guardian = household["guardians"].setdefault(
+            row["parent_id"],
+            {
+                "id": row["parent_id"],
+                "first_name": row["parent_first_name"],
+                "last_name": row["parent_last_name"],
+                "phone": row["phone"],
+                "children": [],
+            },
+        )
+        guardian["children"].append(
+            {
+                "student_id": row["student_id"],
+                "relation": row["relation_type"],
+                "is_primary": row["is_primary_contact"],
+                "can_pickup": row["can_pickup"],
+            }
+        )
+
+    return [
+        {
+            "students": list(household["students"].values()),
+            "guardians": list(household["guardians"].values()),
+        }
+        for household in households.values()
+    ]
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from families.utils import merge_duplicate_parents
+
+
+class Command(BaseCommand):
+    help = (
+        "Merges parents entered more than once (same phone and name) into the oldest "
+        "record, relinking their children and removing the duplicate profiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            type=str,
+            help="Tenant schema to deduplicate (default: every tenant)",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Show what would be merged without writing"
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options.get("schema"):
+            tenants = tenants.filter(schema_name=options["schema"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['schema']}' does not exist.")
+
+        prefix = "[dry run] " if options["dry_run"] else ""
+        for tenant in tenants:
+            with tenant_context(tenant):
+                result = merge_duplicate_parents(dry_run=options["dry_run"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{prefix}{tenant.name} ({tenant.schema_name}): {result['merged']} duplicates "
+                    f"of {result['parents']} parents merged, {result['relinked']} children relinked"
+                )
+            )
@@ -3,11 +3,26 @@ from .models import Parent, StudentParentRelation
 from profiles.serializers import ProfileSerializer
 
 
+def _name(profile):
+    return f"{profile.first_name} {profile.last_name}"
+
+
 class StudentParentRelationSerializer(serializers.ModelSerializer):
+    student_name = serializers.SerializerMethodField()
+    student_enrollment_id = serializers.CharField(source="student.enrollment_id", read_only=True)
+    parent_name = serializers.SerializerMethodField()
+    parent_phone = serializers.CharField(source="parent.profile.phone", read_only=True)
+
     class Meta:
         model = StudentParentRelation
         fields = "__all__"
 
+    def get_student_name(self, obj):
+        return _name(obj.student.profile)
+
+    def get_parent_name(self, obj):
+        return _name(obj.parent.profile)
+
 
 class ParentSerializer(serializers.ModelSerializer):
     profile_details = ProfileSerializer(source="profile", read_only=True)
@@ -26,14 +41,18 @@ class ParentSerializer(serializers.ModelSerializer):
         )
 
     def get_children(self, obj):
-        from students.serializers import StudentSerializer
-
-        relations = obj.student_links.all()
+        # student_links is prefetched with the students' profiles (ParentViewSet)
         return [
             {
                 "relation_type": rel.relation_type,
                 "is_primary": rel.is_primary_contact,
-                "student": StudentSerializer(rel.student).data,
+                "can_pickup": rel.can_pickup,
+                "student": {
+                    "id": rel.student_id,
+                    "enrollment_id": rel.student.enrollment_id,
+                    "name": _name(rel.student.profile),
+                    "status": rel.student.status,
+                },
             }
-            for rel in relations
+            for rel in obj.student_links.all()
         ]
@@ -1,3 +1,404 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIClient
+
+from academics.models import AcademicLevel, Program
+from accounts.models import User
+from profiles.models import Profile
+from students.models import Student
+from .models import Parent, StudentParentRelation
+from .utils import merge_duplicate_parents
+
+
+class NestedParentUpdateTest(TenantTestCase):
+    """
+    Verifies student edits diff the submitted parents against the linked
+    ones and write only the changes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        self.level = AcademicLevel.objects.create(program=program, name="Grade 9", order=9)
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+
+        response = self.api.post(
+            "/api/students/enroll/",
+            {
+                "first_name": "Kid",
+                "last_name": "Family",
+                "gender": "female",
+                "date_of_birth": "2012-04-01",
+                "level_id": str(self.level.id),
+                "academic_year": "2026",
+                "parents": [
+                    {
+                        "first_name": "Dad",
+                        "last_name": "Family",
+                        "phone": "9800000001",
+                        "relation": "father",
+                    },
+                    {
+                        "first_name": "Mom",
+                        "last_name": "Family",
+                        "phone": "9800000002",
+                        "relation": "mother",
+                    },
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.student = Student.objects.get(id=response.json()["student_id"])
+        self.url = f"/api/students/detail/{self.student.id}/"
+
+    def _parents(self):
+        return {p["relation"]: p for p in self.api.get(self.url).json()["parents"]}
+
+    def test_diff_update(self):
+        parents = self._parents()
+        father, mother = parents["father"], parents["mother"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.put(
+                self.url,
+                {
+                    "parents": [
+                        # Changed phone; the unchanged mother is dropped
+                        {"parent_id": father["parent_id"], "phone": "9811111111"},
+                        {"first_name": "Gran", "last_name": "Family", "relation": "guardian"},
+                    ]
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        writes = [
+            q["sql"].split(" ", 3)[:3]
+            for q in queries.captured_queries
+            if q["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+
+        parents = self._parents()
+        self.assertEqual(set(parents), {"father", "guardian"})
+        self.assertEqual(parents["father"]["phone"], "9811111111")
+        self.assertEqual(parents["father"]["parent_id"], father["parent_id"])
+        # The removed mother had nothing else pointing at her
+        self.assertFalse(Parent.objects.filter(id=mother["parent_id"]).exists())
+        self.assertFalse(Profile.objects.filter(first_name="Mom").exists())
+        # Beyond saving the student and its profile: one bulk INSERT per table
+        # for the guardian, one UPDATE for the father's phone, then the
+        # relation delete and the orphan cleanup
+        self.assertEqual(
+            writes[2:],
+            [
+                ["INSERT", "INTO", '"profiles_profile"'],
+                ["INSERT", "INTO", '"families_parent"'],
+                ["INSERT", "INTO", '"families_studentparentrelation"'],
+                ["UPDATE", '"profiles_profile"', "SET"],
+                ["DELETE", "FROM", '"families_studentparentrelation"'],
+                ["DELETE", "FROM", '"families_parent"'],
+                ["DELETE", "FROM", '"profiles_profile"'],
+            ],
+        )
+
+    def test_resubmitting_linked_parents_without_ids_keeps_them(self):
+        before = self._parents()
+        resubmitted = [
+            {key: value for key, value in parent.items() if key != "parent_id"}
+            for parent in before.values()
+        ]
+        resubmitted[0]["occupation"] = "Farmer"
+        # An older duplicate of the father would win a plain phone-and-name match
+        duplicate = Parent.objects.create(
+            profile=Profile.objects.create(first_name="Dad", last_name="Family", phone="9800000001")
+        )
+        Profile.objects.filter(id=duplicate.profile_id).update(
+            created_at=self.student.profile.created_at - timedelta(days=365)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.put(self.url, {"parents": resubmitted}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertFalse(
+            [q for q in queries.captured_queries if q["sql"].startswith(("INSERT", "DELETE"))]
+        )
+        after = self._parents()
+        self.assertEqual(
+            {relation: parent["parent_id"] for relation, parent in after.items()},
+            {relation: parent["parent_id"] for relation, parent in before.items()},
+        )
+        changed = Parent.objects.get(id=before[resubmitted[0]["relation"]]["parent_id"])
+        self.assertEqual(changed.occupation, "Farmer")
+
+    def test_linking_an_existing_parent_and_rejecting_unknown_ids(self):
+        sibling = Student.objects.create(
+            profile=Profile.objects.create(first_name="Sib", last_name="Family"),
+            enrollment_id="SIB-1",
+        )
+        father = self._parents()["father"]
+        response = self.api.put(
+            f"/api/students/detail/{sibling.id}/",
+            {"parents": [{"parent_id": father["parent_id"], "relation": "father"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            StudentParentRelation.objects.filter(parent_id=father["parent_id"]).count(), 2
+        )
+
+        response = self.api.put(
+            self.url,
+            {"parents": [{"parent_id": "00000000-0000-0000-0000-000000000000"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self._parents()), 2)
+
+
+class HouseholdTest(TenantTestCase):
+    """
+    Verifies admissions reuse a parent entered before, duplicates can be
+    merged, and households are resolved through shared guardians in one query.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        self.level = AcademicLevel.objects.create(program=program, name="Grade 9", order=9)
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+
+    def _enroll(self, first_name, parents):
+        response = self.api.post(
+            "/api/students/enroll/",
+            {
+                "first_name": first_name,
+                "last_name": "Thapa",
+                "gender": "male",
+                "date_of_birth": "2012-04-01",
+                "level_id": str(self.level.id),
+                "academic_year": "2026",
+                "parents": parents,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["student_id"]
+
+    def _parent(self, first_name, phone, last_name="Thapa"):
+        return Parent.objects.create(
+            profile=Profile.objects.create(first_name=first_name, last_name=last_name, phone=phone)
+        )
+
+    def _link(self, student_id, parent, relation="mother"):
+        StudentParentRelation.objects.create(
+            student_id=student_id, parent=parent, relation_type=relation
+        )
+
+    def test_admission_reuses_the_parent_with_the_same_phone_and_name(self):
+        mother = {
+            "first_name": "Sita",
+            "last_name": "Thapa",
+            "phone": "9800000001",
+            "relation": "mother",
+        }
+        first = self._enroll("Ram", [mother])
+        second = self._enroll("Hari", [{**mother, "first_name": "SITA "}])
+
+        parent = Parent.objects.get()
+        self.assertEqual(
+            set(parent.student_links.values_list("student_id", flat=True)),
+            {uuid.UUID(first), uuid.UUID(second)},
+        )
+        # Same name on another phone is another person
+        self._enroll("Gita", [{**mother, "phone": "9800000009"}])
+        self.assertEqual(Parent.objects.count(), 2)
+
+    def test_merge_duplicate_parents(self):
+        ram = self._enroll("Ram", [])
+        hari = self._enroll("Hari", [])
+        original = self._parent("Sita", "9800000001")
+        duplicate = self._parent("sita", "9800000001")
+        self._link(ram, original)
+        self._link(ram, duplicate)
+        self._link(hari, duplicate)
+
+        self.assertEqual(merge_duplicate_parents(dry_run=True)["merged"], 1)
+        self.assertEqual(Parent.objects.count(), 2)
+
+        result = merge_duplicate_parents()
+        self.assertEqual(result, {"parents": 1, "merged": 1, "relinked": 1})
+        self.assertEqual(list(Parent.objects.all()), [original])
+        self.assertEqual(original.student_links.count(), 2)
+        self.assertFalse(Profile.objects.filter(first_name="sita").exists())
+
+    def test_merge_keeps_the_keepers_link_with_the_flags_of_the_others(self):
+        ram = self._enroll("Ram", [])
+        original = self._parent("Sita", "9800000001")
+        duplicates = [self._parent("sita", "9800000001"), self._parent("SITA", "9800000001")]
+        StudentParentRelation.objects.create(
+            student_id=ram, parent=duplicates[1], relation_type="guardian", is_primary_contact=True
+        )
+        self._link(ram, original)
+        StudentParentRelation.objects.filter(parent=original).update(can_pickup=False)
+        StudentParentRelation.objects.create(
+            student_id=ram, parent=duplicates[0], relation_type="other", can_pickup=True
+        )
+
+        self.assertEqual(merge_duplicate_parents()["merged"], 2)
+        link = StudentParentRelation.objects.get()
+        self.assertEqual(link.parent, original)
+        self.assertEqual(link.relation_type, "mother")
+        self.assertTrue(link.is_primary_contact)
+        self.assertTrue(link.can_pickup)
+
+    def test_merge_keeps_the_parent_with_a_portal_account(self):
+        ram = self._enroll("Ram", [])
+        original = self._parent("Sita", "9800000001")
+        with_account = self._parent("sita", "9800000001")
+        with_account.profile.user_id = User.objects.create_user(username="sita", password="x").id
+        with_account.profile.save()
+        self._link(ram, original)
+
+        result = merge_duplicate_parents()
+        self.assertEqual(result, {"parents": 1, "merged": 1, "relinked": 1})
+        self.assertEqual(list(Parent.objects.all()), [with_account])
+        self.assertEqual(
+            list(with_account.student_links.values_list("student_id", flat=True)),
+            [uuid.UUID(ram)],
+        )
+
+        # A second account holder with the same key is another login; it is never folded away
+        other = self._parent("SITA", "9800000001")
+        other.profile.user_id = User.objects.create_user(username="sita2", password="x").id
+        other.profile.save()
+        self.assertEqual(merge_duplicate_parents()["merged"], 0)
+        self.assertEqual(Parent.objects.count(), 2)
+
+    def test_household_through_shared_guardians(self):
+        ram, hari, shyam, other = (
+            self._enroll(name, []) for name in ("Ram", "Hari", "Shyam", "Other")
+        )
+        mother = self._parent("Sita", "9800000001")
+        stepfather = self._parent("Gopal", "9800000002")
+        stranger = self._parent("Maya", "9800000003", last_name="Rai")
+        self._link(ram, mother)
+        self._link(hari, mother)
+        # Shyam is only linked through Hari's stepfather
+        self._link(hari, stepfather, "father")
+        self._link(shyam, stepfather, "father")
+        self._link(other, stranger)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(
+                "/api/families/households/", {"student": f"{ram},{shyam}"}
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        statements = [
+            q["sql"]
+            for q in queries.captured_queries
+            if not q["sql"].startswith("SET") and "organizations_domain" not in q["sql"]
+        ]
+        self.assertEqual(len(statements), 1)
+
+        households = response.json()
+        self.assertEqual(len(households), 1)
+        self.assertEqual(
+            {s["first_name"] for s in households[0]["students"]}, {"Ram", "Hari", "Shyam"}
+        )
+        guardians = {g["first_name"]: g for g in households[0]["guardians"]}
+        self.assertEqual(set(guardians), {"Sita", "Gopal"})
+        self.assertEqual(
+            {c["student_id"] for c in guardians["Gopal"]["children"]}, {hari, shyam}
+        )
+
+        response = self.api.get("/api/families/households/", {"parent": str(stranger.id)})
+        self.assertEqual([s["id"] for s in response.json()[0]["students"]], [other])
+
+        response = self.api.get("/api/families/households/", {"student": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+
+class FamilyListingTest(TenantTestCase):
+    """
+    Verifies the parent and relation listings are paginated, filterable and
+    load a page with a fixed number of queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+        portal_user = User.objects.create_user(username="parent0", password="x")
+        self.students = []
+        for i in range(4):
+            parent = Parent.objects.create(
+                profile=Profile.objects.create(
+                    first_name=f"Parent{i}",
+                    last_name="Family",
+                    phone=f"98000000{i:02d}",
+                    user_id=portal_user.id if i == 0 else None,
+                )
+            )
+            for j in range(2):
+                student = Student.objects.create(
+                    profile=Profile.objects.create(first_name=f"Kid{i}{j}", last_name="Family"),
+                    enrollment_id=f"K-{i}{j}",
+                )
+                StudentParentRelation.objects.create(
+                    student=student, parent=parent, relation_type="mother" if j else "father"
+                )
+                self.students.append(student)
+
+    def _selects(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        selects = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and "organizations_domain" not in q["sql"]
+        ]
+        return response.json(), selects
+
+    def test_parent_page_has_a_fixed_query_count(self):
+        data, selects = self._selects("/api/families/parents/", {"limit": 3})
+        # count, parents + profiles, children + profiles, portal users
+        self.assertEqual(len(selects), 4, selects)
+        self.assertEqual(data["count"], 4)
+        self.assertEqual(len(data["results"]), 3)
+        first = data["results"][0]
+        self.assertEqual(first["profile_details"]["username"], "parent0")
+        self.assertEqual(
+            sorted(child["student"]["name"] for child in first["children"]),
+            ["Kid00 Family", "Kid01 Family"],
+        )
+
+    def test_parent_filters(self):
+        data, _ = self._selects("/api/families/parents/", {"student": str(self.students[3].id)})
+        self.assertEqual([p["profile_details"]["first_name"] for p in data["results"]], ["Parent1"])
+
+        data, _ = self._selects("/api/families/parents/", {"search": "9800000002"})
+        self.assertEqual([p["profile_details"]["first_name"] for p in data["results"]], ["Parent2"])
+
+        data, _ = self._selects("/api/families/parents/", {"relation_type": "father"})
+        self.assertEqual(data["count"], 4)
+
+    def test_relation_page_has_a_fixed_query_count(self):
+        data, selects = self._selects("/api/families/relations/", {"limit": 5})
+        # count, relations with both profiles
+        self.assertEqual(len(selects), 2, selects)
+        self.assertEqual(data["count"], 8)
+        self.assertEqual(data["results"][0]["student_name"], "Kid00 Family")
+        self.assertEqual(data["results"][0]["parent_name"], "Parent0 Family")
+
+        data, _ = self._selects(
+            "/api/families/relations/",
+            {"parent": str(self.students[0].parent_links.get().parent_id), "relation_type": "mother"},
+        )
+        self.assertEqual([r["student_name"] for r in data["results"]], ["Kid01 Family"])
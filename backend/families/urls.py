@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ParentViewSet, StudentParentRelationViewSet
+from .views import HouseholdView, ParentViewSet, StudentParentRelationViewSet
 
 router = DefaultRouter()
 router.register(r"parents", ParentViewSet)
 router.register(r"relations", StudentParentRelationViewSet)
 
 urlpatterns = [
+    path("households/", HouseholdView.as_view(), name="households"),
     path("", include(router.urls)),
 ]
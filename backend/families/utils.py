@@ -0,0 +1,331 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from profiles.models import Profile
+from .models import Parent, StudentParentRelation
+
+# Keys of a submitted parent entry -> attribute on the object they live on
+PROFILE_FIELDS = {
+    "first_name": "first_name",
+    "middle_name": "middle_name",
+    "last_name": "last_name",
+    "phone": "phone",
+    "gender": "gender",
+    "address": "address",
+}
+PARENT_FIELDS = {"occupation": "occupation"}
+RELATION_FIELDS = {
+    "relation": "relation_type",
+    "is_primary": "is_primary_contact",
+    "can_pickup": "can_pickup",
+}
+
+
+def parent_key(phone, first_name, last_name):
+    """Identity used to spot the same parent entered twice: phone plus name."""
+    return (phone.strip(), first_name.strip().upper(), last_name.strip().upper())
+
+
+def match_existing_parents(entries):
+    """
+    Existing parents for entries that carry a phone and a full name, keyed by
+    `parent_key`, in one query over profile_phone_name_idx. When a parent is
+    already duplicated, the oldest record wins.
+    """
+    keys = {
+        parent_key(entry["phone"], entry["first_name"], entry["last_name"])
+        for entry in entries
+        if entry.get("phone", "").strip()
+        and entry.get("first_name", "").strip()
+        and entry.get("last_name", "").strip()
+    }
+    if not keys:
+        return {}
+    matches = (
+        Parent.objects.select_related("profile")
+        .filter(
+            reduce(
+                or_,
+                (
+                    Q(
+                        profile__phone=phone,
+                        profile__last_name__iexact=last,
+                        profile__first_name__iexact=first,
+                    )
+                    for phone, first, last in keys
+                ),
+            )
+        )
+        .order_by("-profile__created_at")
+    )
+    # Oldest last, so it overwrites younger duplicates
+    return {
+        parent_key(parent.profile.phone, parent.profile.first_name, parent.profile.last_name): parent
+        for parent in matches
+    }
+
+
+def _apply(obj, mapping, entry, changed):
+    """Copies the submitted values that differ onto `obj`, recording which fields moved."""
+    for key, attr in mapping.items():
+        if key in entry and getattr(obj, attr) != entry[key]:
+            setattr(obj, attr, entry[key])
+            changed.setdefault(obj.pk, (obj, set()))[1].add(attr)
+
+
+def _bulk_update(model, changed, extra_fields=()):
+    if not changed:
+        return 0
+    objects = [obj for obj, _ in changed.values()]
+    fields = set(extra_fields).union(*(fields for _, fields in changed.values()))
+    model.objects.bulk_update(objects, sorted(fields))
+    return len(objects)
+
+
+@transaction.atomic
+def sync_student_parents(student, entries):
+    """
+    Makes the student's parents match `entries` (the list the edit form sends).
+
+    Entries with a `parent_id` of a linked parent update that parent, its
+    profile and the relation; a `parent_id` of another family's parent links
+    that existing parent (siblings share guardians); entries without one
+    update the linked parent with the same phone and name (older clients
+    resubmit linked parents without their ids), else link the parent with
+    the same phone and name if there is one, and otherwise create a new
+    parent. Linked parents missing from the list are unlinked,
+    and their profiles deleted when nothing else refers to them. Only changed
+    rows are written, with one bulk statement per table.
+    """
+    relations = {
+        relation.parent_id: relation
+        for relation in student.parent_links.select_related("parent__profile")
+    }
+
+    entries = _resolve_linked(entries, relations)
+    matches = match_existing_parents([entry for entry in entries if not entry.get("parent_id")])
+    if matches:
+        entries = [_resolve_match(entry, matches) for entry in entries]
+
+    submitted = [entry["parent_id"] for entry in entries if entry.get("parent_id")]
+    if len(submitted) != len(set(submitted)):
+        raise serializers.ValidationError({"parents": "Each parent may only appear once."})
+
+    unlinked_ids = [parent_id for parent_id in submitted if parent_id not in relations]
+    existing = {parent.id: parent for parent in matches.values()}
+    missing = [parent_id for parent_id in unlinked_ids if parent_id not in existing]
+    if missing:
+        existing.update(Parent.objects.select_related("profile").in_bulk(missing))
+    unknown = set(unlinked_ids) - set(existing)
+    if unknown:
+        raise serializers.ValidationError(
+            {"parents": f"Parents not found: {', '.join(sorted(map(str, unknown)))}"}
+        )
+
+    changed_profiles, changed_parents, changed_relations = {}, {}, {}
+    new_relations = []
+    new_entries = []
+    for entry in entries:
+        parent_id = entry.get("parent_id")
+        if not parent_id:
+            new_entries.append(entry)
+            continue
+
+        relation = relations.get(parent_id)
+        if relation:
+            parent = relation.parent
+            _apply(relation, RELATION_FIELDS, entry, changed_relations)
+        else:
+            parent = existing[parent_id]
+            new_relations.append(_relation(student, parent, entry))
+        _apply(parent.profile, PROFILE_FIELDS, entry, changed_profiles)
+        _apply(parent, PARENT_FIELDS, entry, changed_parents)
+
+    if new_entries:
+        profiles = Profile.objects.bulk_create(
+            [
+                Profile(
+                    first_name=entry.get("first_name", ""),
+                    middle_name=entry.get("middle_name", ""),
+                    last_name=entry.get("last_name", ""),
+                    phone=entry.get("phone", ""),
+                    gender=entry.get("gender", "other"),
+                    address=entry.get("address", ""),
+                )
+                for entry in new_entries
+            ]
+        )
+        parents = Parent.objects.bulk_create(
+            [
+                Parent(profile=profile, occupation=entry.get("occupation", ""))
+                for profile, entry in zip(profiles, new_entries)
+            ]
+        )
+        new_relations.extend(
+            _relation(student, parent, entry) for parent, entry in zip(parents, new_entries)
+        )
+    StudentParentRelation.objects.bulk_create(new_relations)
+
+    now = timezone.now()
+    for profile, _ in changed_profiles.values():
+        profile.updated_at = now
+    updated = len(
+        set(changed_profiles)
+        | {parent.profile_id for parent, _ in changed_parents.values()}
+        | {relation.parent.profile_id for relation, _ in changed_relations.values()}
+    )
+    _bulk_update(Profile, changed_profiles, extra_fields=["updated_at"])
+    _bulk_update(Parent, changed_parents)
+    _bulk_update(StudentParentRelation, changed_relations)
+
+    removed_parent_ids = [parent_id for parent_id in relations if parent_id not in submitted]
+    if removed_parent_ids:
+        StudentParentRelation.objects.filter(
+            student=student, parent_id__in=removed_parent_ids
+        ).delete()
+        # Parents left without children and without an account or another role
+        Profile.objects.filter(
+            parent_record__id__in=removed_parent_ids,
+            parent_record__student_links__isnull=True,
+            user_id__isnull=True,
+            student_record__isnull=True,
+            staff_record__isnull=True,
+        ).delete()
+
+    return {
+        "created": len(new_entries),
+        "linked": len(new_relations) - len(new_entries),
+        "updated": updated,
+        "removed": len(removed_parent_ids),
+    }
+
+
+def _resolve_linked(entries, relations):
+    """Gives entries without a `parent_id` the id of the linked parent with the same phone and name."""
+    linked = {}
+    for parent_id, relation in relations.items():
+        profile = relation.parent.profile
+        linked.setdefault(parent_key(profile.phone, profile.first_name, profile.last_name), parent_id)
+    claimed = {entry["parent_id"] for entry in entries if entry.get("parent_id")}
+
+    resolved = []
+    for entry in entries:
+        if not entry.get("parent_id") and (entry.get("first_name") or entry.get("last_name")):
+            parent_id = linked.get(
+                parent_key(
+                    entry.get("phone", ""), entry.get("first_name", ""), entry.get("last_name", "")
+                )
+            )
+            if parent_id and parent_id not in claimed:
+                claimed.add(parent_id)
+                entry = {**entry, "parent_id": parent_id}
+        resolved.append(entry)
+    return resolved
+
+
+def _resolve_match(entry, matches):
+    if entry.get("parent_id") or not entry.get("phone"):
+        return entry
+    parent = matches.get(
+        parent_key(entry["phone"], entry.get("first_name", ""), entry.get("last_name", ""))
+    )
+    return {**entry, "parent_id": parent.id} if parent else entry
+
+
+def _relation(student, parent, entry):
+    return StudentParentRelation(
+        student=student,
+        parent=parent,
+        relation_type=entry.get("relation", "other"),
+        is_primary_contact=entry.get("is_primary", False),
+        can_pickup=entry.get("can_pickup", True),
+    )
+
+
+@transaction.atomic
+def merge_duplicate_parents(dry_run=False):
+    """
+    Folds parents entered more than once (same `parent_key`) into one record,
+    the oldest with a portal account or else the oldest: their children are
+    relinked to it (a child linked to several of them keeps the keeper's link,
+    else the oldest duplicate's, with the primary-contact and pickup flags of
+    the other links OR'ed in), the duplicates are deleted, and so are their
+    profiles when nothing else refers to them. A duplicate with a portal account of its own is left
+    alone, so no one who signs in loses their parent record. Returns the
+    counts; with `dry_run` nothing is written.
+    """
+    groups = defaultdict(list)
+    rows = (
+        Parent.objects.exclude(profile__phone="")
+        .order_by("profile__created_at", "id")
+        .values_list(
+            "id",
+            "profile_id",
+            "profile__user_id",
+            "profile__phone",
+            "profile__first_name",
+            "profile__last_name",
+        )
+    )
+    for parent_id, profile_id, user_id, phone, first_name, last_name in rows:
+        groups[parent_key(phone, first_name, last_name)].append((parent_id, profile_id, user_id))
+
+    duplicates, duplicate_profiles, rank = {}, [], {}
+    for group in groups.values():
+        keeper = next((row for row in group if row[2]), group[0])
+        rank[keeper[0]] = -1
+        for position, (parent_id, profile_id, user_id) in enumerate(group):
+            rank.setdefault(parent_id, position)
+            if parent_id != keeper[0] and not user_id:
+                duplicates[parent_id] = keeper[0]
+                duplicate_profiles.append(profile_id)
+
+    relinked, updated, dropped = 0, [], []
+    if duplicates:
+        # Each child's links to one person, grouped under the keeper
+        links = defaultdict(list)
+        for relation in StudentParentRelation.objects.filter(
+            parent_id__in=set(duplicates) | set(duplicates.values())
+        ):
+            keeper = duplicates.get(relation.parent_id, relation.parent_id)
+            links[(relation.student_id, keeper)].append(relation)
+        for (_, keeper), group in links.items():
+            # The keeper's own link survives, else the oldest duplicate's
+            group.sort(key=lambda relation: rank[relation.parent_id])
+            survivor, others = group[0], group[1:]
+            flags = (survivor.is_primary_contact, survivor.can_pickup)
+            for relation in others:
+                survivor.is_primary_contact |= relation.is_primary_contact
+                survivor.can_pickup |= relation.can_pickup
+                dropped.append(relation.pk)
+            if survivor.parent_id != keeper:
+                survivor.parent_id = keeper
+                relinked += 1
+            elif flags == (survivor.is_primary_contact, survivor.can_pickup):
+                continue
+            updated.append(survivor)
+
+    if duplicates and not dry_run:
+        StudentParentRelation.objects.filter(pk__in=dropped).delete()
+        StudentParentRelation.objects.bulk_update(
+            updated, ["parent", "is_primary_contact", "can_pickup"]
+        )
+        Parent.objects.filter(id__in=duplicates).delete()
+        Profile.objects.filter(
+            id__in=duplicate_profiles,
+            user_id__isnull=True,
+            student_record__isnull=True,
+            staff_record__isnull=True,
+        ).delete()
+
+    return {
+        "parents": len(set(duplicates.values())),
+        "merged": len(duplicates),
+        "relinked": relinked,
+    }
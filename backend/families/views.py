@@ -1,16 +1,123 @@
-from rest_framework import viewsets, permissions
+import uuid
+
+from django.db.models import Prefetch
+from django_filters import rest_framework as django_filters
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, viewsets, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.mixins import SparseFieldsMixin
+from core.pagination import DefaultPagination
+from profiles.utils import attach_users
+from .households import load_households
 from .models import Parent, StudentParentRelation
 from .serializers import ParentSerializer, StudentParentRelationSerializer
 from roles.permissions import HasPermission
 
 
-class ParentViewSet(viewsets.ModelViewSet):
-    queryset = Parent.objects.all().select_related("profile")
+class FamilyPermissionsMixin:
+    def get_permissions(self):
+        if self.action == "create":
+            return [permissions.IsAuthenticated(), HasPermission("add_family")]
+        if self.action in ["update", "partial_update"]:
+            return [permissions.IsAuthenticated(), HasPermission("change_family")]
+        if self.action == "destroy":
+            return [permissions.IsAuthenticated(), HasPermission("delete_family")]
+        return [permissions.IsAuthenticated(), HasPermission("view_family")]
+
+
+class ParentFilter(django_filters.FilterSet):
+    student = django_filters.UUIDFilter(field_name="student_links__student")
+    relation_type = django_filters.CharFilter(
+        field_name="student_links__relation_type", distinct=True
+    )
+
+    class Meta:
+        model = Parent
+        fields = ["student", "relation_type"]
+
+
+class ParentViewSet(FamilyPermissionsMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    """
+    Parents with their profile and children. A page costs a fixed number of
+    queries: count, parents with profiles, children with their profiles, and
+    the portal users of the page.
+    """
+
+    queryset = (
+        Parent.objects.all()
+        .select_related("profile")
+        .prefetch_related(
+            Prefetch(
+                "student_links",
+                queryset=StudentParentRelation.objects.select_related("student__profile"),
+            )
+        )
+        .order_by("profile__first_name", "profile__last_name", "id")
+    )
     serializer_class = ParentSerializer
-    permission_classes = [permissions.IsAuthenticated, HasPermission("manage_students")]
+    pagination_class = DefaultPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filterset_class = ParentFilter
+    search_fields = ["profile__first_name", "profile__last_name", "^profile__phone"]
 
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            attach_users([parent.profile for parent in page])
+        return page
 
-class StudentParentRelationViewSet(viewsets.ModelViewSet):
-    queryset = StudentParentRelation.objects.all()
+
+class StudentParentRelationViewSet(
+    FamilyPermissionsMixin, SparseFieldsMixin, viewsets.ModelViewSet
+):
+    queryset = (
+        StudentParentRelation.objects.all()
+        .select_related("student__profile", "parent__profile")
+        .order_by("student__profile__first_name", "student__profile__last_name", "id")
+    )
     serializer_class = StudentParentRelationSerializer
-    permission_classes = [permissions.IsAuthenticated, HasPermission("manage_students")]
+    pagination_class = DefaultPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {
+        "student": ["exact"],
+        "parent": ["exact"],
+        "relation_type": ["exact"],
+        "is_primary_contact": ["exact"],
+        "can_pickup": ["exact"],
+    }
+
+
+class HouseholdView(APIView):
+    """
+    Households of the given students and/or parents
+    (`?student=<id>,<id>&parent=<id>`): siblings and guardians resolved in
+    one query, each household listed once however many of its members were
+    asked for.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, HasPermission("view_family")]
+
+    def get(self, request):
+        try:
+            student_ids = self._ids(request, "student")
+            parent_ids = self._ids(request, "parent")
+        except ValueError:
+            return Response(
+                {"error": "Invalid student or parent id"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if not student_ids and not parent_ids:
+            return Response(
+                {"error": "Pass at least one student or parent id"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(load_households(student_ids, parent_ids))
+
+    @staticmethod
+    def _ids(request, param):
+        return [
+            uuid.UUID(value.strip())
+            for values in request.query_params.getlist(param)
+            for value in values.split(",")
+            if value.strip()
+        ]
@@ -0,0 +1,17 @@
+from django.contrib import admin
+from django.db import connection
+from .models import MediaBlob
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ("name", "size", "ref_count", "created_at", "updated_at")
+    search_fields = ("name", "sha256")
+    readonly_fields = ("name", "sha256", "size", "ref_count", "created_at", "updated_at")
+
+    # Blobs are shared by all schools; only visible from the public dashboard
+    def has_module_permission(self, request):
+        return connection.schema_name == "public"
+
+    def has_view_permission(self, request, obj=None):
+        return connection.schema_name == "public"
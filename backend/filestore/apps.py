@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class FilestoreConfig(AppConfig):
+    name = "filestore"
+
+    def ready(self):
+        import filestore.signals
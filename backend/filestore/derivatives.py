@@ -0,0 +1,225 @@
+"""
+Resized WebP derivatives of uploaded images and first-page previews of PDFs.
+
+After a tracked file changes, a job is queued on a thread pool once the
+transaction commits. It writes the derivatives to
+`derivatives/<key>/<label>.webp` and records their names in the owning row's
+`derivatives` JSON column, e.g.
+    {"profile_image": {"source": "profiles/photos/a.jpg", "thumb": "derivatives/…/thumb.webp"}}
+Serializers read that column, so listing rows never touches the files.
+
+Derivatives of PROTECTED_FIELDS go to `protected_storage` instead of public
+media: they show what the file shows, so they are served by the same
+permission-checked view as the file itself and never get a media URL.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, connections, transaction
+from django_tenants.utils import schema_context
+from PIL import Image, ImageOps
+
+from .serving import BLOB_NAME_RE
+from .storage import protected_storage
+
+logger = logging.getLogger(__name__)
+
+# (app_label, model, field) -> {label: longest edge in pixels}
+DERIVATIVE_SPECS = {
+    ("profiles", "Profile", "profile_image"): {"thumb": 64, "small": 256},
+    ("profiles", "InstitutionProfile", "logo"): {"thumb": 128, "small": 512},
+    ("profiles", "InstitutionProfile", "banner"): {"small": 640, "large": 1280},
+    ("course_content", "CourseContent", "file"): {"thumb": 256, "preview": 1024},
+}
+
+# Fields whose files are only sent after an access check
+PROTECTED_FIELDS = {("course_content", "CourseContent", "file")}
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tif", ".tiff"}
+WEBP_QUALITY = 80
+
+_executor = None
+
+
+def derivative_fields():
+    """Yields (model, field_name, sizes) for DERIVATIVE_SPECS."""
+    for (app_label, model_name, field_name), sizes in DERIVATIVE_SPECS.items():
+        yield apps.get_model(app_label, model_name), field_name, sizes
+
+
+def derivative_storage(model, field_name):
+    """Where the derivatives of `model.<field_name>` are written."""
+    if (model._meta.app_label, model.__name__, field_name) in PROTECTED_FIELDS:
+        return protected_storage
+    return default_storage
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.DERIVATIVE_WORKERS, thread_name_prefix="derivatives"
+        )
+    return _executor
+
+
+def derivative_key(name):
+    """Blobs are keyed by digest so schools share derivatives of identical files."""
+    match = BLOB_NAME_RE.match(name)
+    return match.group(1) if match else hashlib.sha256(name.encode()).hexdigest()
+
+
+def supports_derivatives(name):
+    extension = os.path.splitext(name)[1].lower()
+    return extension in IMAGE_EXTENSIONS or extension == ".pdf"
+
+
+def schedule_derivatives(instance, field_name):
+    """
+    Queues derivative generation for `instance.<field_name>` after commit.
+    With DERIVATIVE_WORKERS = 0 the job runs inline (tests, management commands).
+    """
+    name = getattr(instance, field_name).name
+    job = (
+        connection.schema_name,
+        instance._meta.label,
+        instance.pk,
+        field_name,
+        name,
+    )
+
+    def submit():
+        if settings.DERIVATIVE_WORKERS:
+            get_executor().submit(_run_job, *job)
+        else:
+            generate_derivatives(*job)
+
+    transaction.on_commit(submit)
+
+
+def _run_job(*job):
+    try:
+        generate_derivatives(*job)
+    except Exception:
+        logger.exception("Derivative generation failed for %s", job)
+    finally:
+        # Worker threads own their connections; do not leak them
+        connections.close_all()
+
+
+def generate_derivatives(schema_name, model_label, pk, field_name, name):
+    """Renders the derivatives of one file and records them on its row."""
+    model = apps.get_model(model_label)
+    sizes = DERIVATIVE_SPECS[(model._meta.app_label, model.__name__, field_name)]
+    storage = derivative_storage(model, field_name)
+
+    with schema_context(schema_name):
+        key = derivative_key(name)
+        entry = {"source": name}
+        entry.update({label: f"derivatives/{key}/{label}.webp" for label in sizes})
+        missing = [label for label in sizes if not storage.exists(entry[label])]
+
+        if missing:
+            field_file = getattr(model.objects.get(pk=pk), field_name)
+            source = render_source(field_file.storage, name)
+            if source is None:
+                return None
+            for label in missing:
+                storage.save(entry[label], ContentFile(resize_webp(source, sizes[label])))
+
+        # Only record if the row still points at the same file; the lock keeps
+        # jobs for other fields of the same row from overwriting each other
+        with transaction.atomic():
+            row = model.objects.select_for_update().filter(pk=pk, **{field_name: name})
+            derivatives = row.values_list("derivatives", flat=True).first()
+            if derivatives is None:
+                return None
+            derivatives[field_name] = entry
+            row.update(derivatives=derivatives)
+        return entry
+
+
+def render_source(storage, name):
+    """Opens an image, or rasterizes the first page of a PDF; None if unsupported."""
+    extension = os.path.splitext(name)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        with storage.open(name, "rb") as handle:
+            image = Image.open(handle)
+            image.load()
+        return ImageOps.exif_transpose(image)
+    if extension == ".pdf":
+        return render_pdf_first_page(storage, name)
+    return None
+
+
+def render_pdf_first_page(storage, name):
+    """
+    Rasterizes page 1 with poppler's `pdftoppm` when it is installed.
+    Pillow cannot render PDFs, so without poppler PDFs simply get no preview.
+    """
+    pdftoppm = shutil.which("pdftoppm")
+    if not pdftoppm:
+        return None
+
+    with tempfile.TemporaryDirectory() as workdir:
+        source = os.path.join(workdir, "source.pdf")
+        with storage.open(name, "rb") as handle, open(source, "wb") as target:
+            shutil.copyfileobj(handle, target)
+        output = os.path.join(workdir, "page")
+        result = subprocess.run(
+            [pdftoppm, "-f", "1", "-l", "1", "-png", "-singlefile", "-scale-to", "1600", source, output],
+            capture_output=True,
+            timeout=60,
+        )
+        if result.returncode != 0:
+            logger.warning("pdftoppm failed for %s: %s", name, result.stderr[:200])
+            return None
+        with Image.open(f"{output}.png") as image:
+            image.load()
+            return image.copy()
+
+
+def resize_webp(image, edge):
+    """Fits the image into an `edge` x `edge` box (never upscaling) and encodes WebP."""
+    resized = image.copy()
+    if resized.mode not in ("RGB", "RGBA"):
+        resized = resized.convert("RGBA" if "transparency" in resized.info else "RGB")
+    resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def derivative_urls(instance, field_name, request=None):
+    """{label: url} of the recorded derivatives of `instance.<field_name>`."""
+    return derivative_urls_from(
+        instance.derivatives, field_name, getattr(instance, field_name).name, request
+    )
+
+
+def recorded_derivatives(derivatives, field_name, source_name):
+    """{label: stored name} of the derivatives recorded for the current file."""
+    entry = (derivatives or {}).get(field_name) or {}
+    if not source_name or entry.get("source") != source_name:
+        return {}
+    return {label: name for label, name in entry.items() if label != "source"}
+
+
+def derivative_urls_from(derivatives, field_name, source_name, request=None):
+    """derivative_urls from the raw `derivatives` and file name columns."""
+    urls = {}
+    for label, name in recorded_derivatives(derivatives, field_name, source_name).items():
+        url = default_storage.url(name)
+        urls[label] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from course_content.models import ChunkedUpload
+from filestore.models import MediaBlob
+from filestore.storage import content_addressed_storage
+from filestore.utils import recount_references
+
+
+class Command(BaseCommand):
+    help = "Deletes content-addressed blobs that no CourseContent, submission or upload references."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recompute reference counts by scanning every tenant before collecting",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Keep unreferenced blobs touched within this many hours (default: 24)",
+        )
+        parser.add_argument(
+            "--upload-max-age-hours",
+            type=int,
+            default=settings.CHUNKED_UPLOAD_MAX_AGE_HOURS,
+            help="Purge chunked uploads older than this many hours first",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be deleted without deleting anything",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        now = timezone.now()
+
+        # 1. Expired chunked uploads: content/submissions keep their own references
+        upload_cutoff = now - timedelta(hours=options["upload_max_age_hours"])
+        purged = 0
+        for tenant in Organization.objects.exclude(schema_name="public"):
+            with tenant_context(tenant):
+                for upload in ChunkedUpload.objects.filter(updated_at__lt=upload_cutoff):
+                    purged += 1
+                    if not dry_run:
+                        upload.discard_parts()
+                        upload.delete()
+        self.stdout.write(f"Expired chunked uploads: {purged}")
+
+        # 2. Optional full recount to repair drift
+        if options["recount"] and not dry_run:
+            corrected = recount_references()
+            self.stdout.write(f"Reference counts corrected: {corrected}")
+
+        # 3. Collect unreferenced blobs outside the grace period
+        blob_cutoff = now - timedelta(hours=options["grace_hours"])
+        candidates = MediaBlob.objects.filter(ref_count__lte=0, updated_at__lt=blob_cutoff)
+
+        deleted = freed = 0
+        for name, size in candidates.values_list("name", "size").iterator():
+            if dry_run:
+                deleted += 1
+                freed += size
+                continue
+            with transaction.atomic():
+                # Re-check under the row lock an upload of the same bytes would take
+                blob = (
+                    MediaBlob.objects.select_for_update()
+                    .filter(name=name, ref_count__lte=0, updated_at__lt=blob_cutoff)
+                    .first()
+                )
+                if not blob:
+                    continue
+                content_addressed_storage.delete(blob.name)
+                blob.delete()
+            deleted += 1
+            freed += blob.size
+
+        action = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(f"{action} {deleted} blobs ({freed / 1024 / 1024:.1f} MB)")
+        )
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from filestore.derivatives import (
+    derivative_fields,
+    generate_derivatives,
+    supports_derivatives,
+)
+
+
+class Command(BaseCommand):
+    help = "Generates missing thumbnails and PDF previews for existing profile photos, logos, banners and course files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            type=str,
+            help="Tenant schema to process (default: every tenant)",
+        )
+
+    def handle(self, *args, **options):
+        tenants = Organization.objects.exclude(schema_name="public")
+        if options.get("schema"):
+            tenants = tenants.filter(schema_name=options["schema"])
+            if not tenants.exists():
+                raise CommandError(f"Tenant '{options['schema']}' does not exist.")
+
+        for tenant in tenants:
+            generated = skipped = 0
+            with tenant_context(tenant):
+                for model, field_name, _ in derivative_fields():
+                    rows = (
+                        model.objects.exclude(**{field_name: ""})
+                        .exclude(**{f"{field_name}__isnull": True})
+                        .values_list("pk", field_name, "derivatives")
+                    )
+                    for pk, name, derivatives in rows.iterator():
+                        recorded = (derivatives or {}).get(field_name) or {}
+                        if recorded.get("source") == name or not supports_derivatives(name):
+                            continue
+                        try:
+                            entry = generate_derivatives(
+                                tenant.schema_name, model._meta.label, pk, field_name, name
+                            )
+                        except (FileNotFoundError, OSError) as e:
+                            self.stderr.write(f"  {name}: {e}")
+                            entry = None
+                        if entry:
+                            generated += 1
+                        else:
+                            skipped += 1
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{tenant.name} ({tenant.schema_name}): {generated} files processed, "
+                    f"{skipped} skipped"
+                )
+            )
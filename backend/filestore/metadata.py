@@ -0,0 +1,144 @@
+"""
+File metadata captured once at upload time, so list endpoints never stat
+(or HEAD) the stored file again.
+"""
+
+import hashlib
+import mimetypes
+import os
+import struct
+
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+from .serving import BLOB_NAME_RE
+from .text import TEXT_EXTENSIONS, pdf_text, plain_text
+
+READ_BLOCK_SIZE = 64 * 1024
+MP4_CONTAINERS = {b"moov"}
+MP4_EXTENSIONS = {".mp4", ".m4v", ".m4a", ".mov"}
+# version/flags, then the creation and modification times, timescale and duration
+MVHD_SIZES = {0: 4 + 8 + 8, 1: 4 + 16 + 12}
+
+
+def file_metadata(field_file):
+    """
+    Returns {size, mime_type, sha256, pages, duration, text} for a FieldFile,
+    reading the uncommitted upload when the file has not been stored yet.
+    Content-addressed blobs take size and digest from their MediaBlob row.
+
+    The file is opened once: a single pass hashes it, and a PDF is parsed
+    once for both its page count and its text. The digest of an uncommitted
+    upload is kept on the File so ContentAddressedStorage does not hash the
+    bytes again when the field is saved.
+    """
+    name = field_file.name or ""
+    extension = os.path.splitext(name)[1].lower()
+    metadata = {
+        "size": None,
+        "mime_type": mimetypes.guess_type(name)[0] or "application/octet-stream",
+        "sha256": "",
+        "pages": None,
+        "duration": None,
+        "text": "",
+    }
+
+    blob = None
+    match = BLOB_NAME_RE.match(name)
+    if match and field_file._committed:
+        from .models import MediaBlob
+
+        blob = MediaBlob.objects.filter(name=name).first()
+        if blob:
+            metadata["size"], metadata["sha256"] = blob.size, blob.sha256
+
+    is_pdf = extension == ".pdf"
+    is_mp4 = extension in MP4_EXTENSIONS
+    is_text = extension in TEXT_EXTENSIONS
+    if blob and not (is_pdf or is_mp4 or is_text):
+        return metadata
+
+    handle = field_file.file if not field_file._committed else field_file.storage.open(name, "rb")
+    try:
+        handle.seek(0)
+        if not blob:
+            metadata["size"], metadata["sha256"] = _size_and_digest(handle)
+            if not field_file._committed:
+                handle.sha256 = metadata["sha256"]
+        if is_pdf:
+            handle.seek(0)
+            metadata["pages"], metadata["text"] = _pdf_pages_and_text(handle)
+        elif is_mp4:
+            handle.seek(0)
+            try:
+                metadata["duration"] = mp4_duration(handle)
+            except (struct.error, IndexError, ValueError):
+                metadata["duration"] = None
+        elif is_text:
+            handle.seek(0)
+            metadata["text"] = plain_text(handle)
+        handle.seek(0)
+    finally:
+        if field_file._committed:
+            handle.close()
+    return metadata
+
+
+def _size_and_digest(handle):
+    digest = hashlib.sha256()
+    size = 0
+    for block in iter(lambda: handle.read(READ_BLOCK_SIZE), b""):
+        digest.update(block)
+        size += len(block)
+    return size, digest.hexdigest()
+
+
+def _pdf_pages_and_text(handle):
+    try:
+        reader = PdfReader(handle)
+        pages = len(reader.pages)
+    except (PdfReadError, ValueError, KeyError, TypeError):
+        return None, ""
+    return pages, pdf_text(reader)
+
+
+def mp4_duration(handle):
+    """
+    Duration in seconds from the `mvhd` box of an MP4/QuickTime file; None when
+    there is none. Every box must be at least as long as its header, so the
+    walk always moves forward, and short reads end it instead of being unpacked.
+    """
+    end = None
+    while True:
+        header = handle.read(8)
+        if len(header) < 8:
+            return None
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            largesize = handle.read(8)
+            if len(largesize) < 8:
+                return None
+            size = struct.unpack(">Q", largesize)[0]
+            header_size = 16
+        elif size == 0:
+            return None
+        if size < header_size:
+            return None
+
+        if box_type in MP4_CONTAINERS:
+            end = handle.tell() - header_size + size
+            continue
+        if box_type == b"mvhd":
+            body = handle.read(min(size - header_size, MVHD_SIZES[1]))
+            if not body or body[0] not in MVHD_SIZES or len(body) < MVHD_SIZES[body[0]]:
+                return None
+            if body[0] == 1:
+                timescale, duration = struct.unpack_from(">IQ", body, 20)
+            else:
+                timescale, duration = struct.unpack_from(">II", body, 12)
+            return round(duration / timescale, 3) if timescale else None
+
+        handle.seek(handle.tell() - header_size + size)
+        if end is not None and handle.tell() >= end:
+            return None
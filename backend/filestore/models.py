@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    One stored file, named by the SHA-256 of its bytes and shared by every
+    tenant that uploads the same content.
+    `ref_count` is the number of rows (in any tenant schema) pointing at it;
+    unreferenced blobs are removed by `gc_media_blobs`.
+    """
+
+    # Storage path, e.g. blobs/3f/a2/3fa2...c1.pdf
+    name = models.CharField(max_length=255, primary_key=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.BigIntegerField()
+    ref_count = models.IntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["ref_count", "updated_at"], name="filestore_blob_gc_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
@@ -0,0 +1,188 @@
+"""
+Protected file delivery.
+
+Views check visibility first and then call `serve_file`. Depending on
+MEDIA_SENDFILE_BACKEND the bytes are sent by:
+  - "nginx":  an X-Accel-Redirect to an `internal` location aliasing MEDIA_ROOT
+  - "apache": an X-Sendfile header with the absolute path (mod_xsendfile)
+  - "":       Django itself. Under WSGI a FileResponse, which servers with
+              `wsgi.file_wrapper` (gunicorn) hand to os.sendfile; under ASGI
+              an async iterator reading one block at a time in a worker
+              thread, since Django would otherwise read a synchronous
+              iterator into memory whole before sending it
+The web server handles Range requests in the first two modes; the Django
+fallback supports single byte ranges, If-Range and conditional GETs.
+"""
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+STREAM_BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+BLOB_NAME_RE = re.compile(r"^blobs/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})")
+
+
+class RangedFile:
+    """
+    Read-only view of `length` bytes of an open file starting at `start`.
+    Exposes fileno() so sendfile-capable servers still bypass Python, while
+    the plain read() path never returns bytes past the range.
+    """
+
+    def __init__(self, handle, start, length):
+        self.handle = handle
+        self.remaining = length
+        handle.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.handle.fileno()
+
+    def close(self):
+        self.handle.close()
+
+
+def file_etag(storage, name, size, modified):
+    """Content-addressed blobs are tagged by their digest, others by size and mtime."""
+    match = BLOB_NAME_RE.match(name)
+    if match:
+        return quote_etag(match.group(1))
+    return quote_etag(f"{size:x}-{int(modified.timestamp()):x}")
+
+
+def parse_range(header, size):
+    """
+    Returns (start, end) inclusive for a single satisfiable byte range,
+    None when the header should be ignored, or False when unsatisfiable.
+    Multi-range requests are answered with the whole file.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def serve_file(request, storage, name, filename=None, as_attachment=False):
+    """
+    Sends a stored file after the caller has authorized the request.
+    `filename` is the download name shown to the user.
+    """
+    filename = filename or os.path.basename(name)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    try:
+        size = storage.size(name)
+        modified = storage.get_modified_time(name)
+    except (FileNotFoundError, OSError):
+        return HttpResponse(status=404)
+
+    etag = file_etag(storage, name, size, modified)
+    last_modified = int(modified.timestamp())
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is not None:
+        return not_modified
+
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if backend == "nginx":
+        response = HttpResponse(content_type=content_type)
+        # The internal location aliases MEDIA_ROOT; storages may live below it
+        relative = os.path.relpath(storage.path(name), settings.MEDIA_ROOT).replace(os.sep, "/")
+        response["X-Accel-Redirect"] = quote(
+            settings.MEDIA_SENDFILE_PREFIX.rstrip("/") + "/" + relative
+        )
+    elif backend == "apache":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = storage.path(name)
+    else:
+        response = _stream(request, storage, name, size, etag, modified, content_type)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = "private, max-age=0, must-revalidate"
+    response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    return response
+
+
+def _stream(request, storage, name, size, etag, modified, content_type):
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    # A stale If-Range validator means the client must get the whole new file
+    if range_header and (not if_range or if_range in (etag, http_date(modified.timestamp()))):
+        byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    handle = storage.open(name, "rb")
+    if byte_range is None:
+        start, end, status = 0, size - 1, 200
+        content = handle
+    else:
+        start, end = byte_range
+        status = 206
+        content = RangedFile(handle, start, end - start + 1)
+
+    # DRF views pass their Request, which wraps Django's
+    asgi = isinstance(getattr(request, "_request", request), ASGIRequest)
+    if asgi:
+        response = StreamingHttpResponse(
+            _read_blocks(content), status=status, content_type=content_type
+        )
+    else:
+        response = FileResponse(content, status=status, content_type=content_type)
+        response.block_size = STREAM_BLOCK_SIZE
+    # FileResponse only knows the length of a whole file
+    if asgi or status == 206:
+        response["Content-Length"] = end - start + 1
+    if status == 206:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
+async def _read_blocks(content):
+    """Yields STREAM_BLOCK_SIZE blocks, reading off the event loop; closes `content` when done."""
+    read = sync_to_async(content.read, thread_sensitive=False)
+    try:
+        while True:
+            block = await read(STREAM_BLOCK_SIZE)
+            if not block:
+                break
+            yield block
+    finally:
+        await sync_to_async(content.close, thread_sensitive=False)()
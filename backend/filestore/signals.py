@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .derivatives import derivative_fields, schedule_derivatives, supports_derivatives
+from .utils import adjust_references, blob_models
+
+# Reference counting for content-addressed blobs: every tracked row that starts,
+# stops or switches pointing at a blob moves the blob's counter.
+TRACKED_FIELDS = defaultdict(list)
+for model, field_name in blob_models():
+    TRACKED_FIELDS[model].append(field_name)
+
+
+def current_blobs(sender, instance):
+    return {
+        field_name: getattr(instance, field_name).name or ""
+        for field_name in TRACKED_FIELDS[sender]
+    }
+
+
+def remember_previous_blobs(sender, instance, **kwargs):
+    if instance._state.adding:
+        instance._previous_blobs = {}
+        return
+    instance._previous_blobs = (
+        sender.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS[sender]).first()
+        or {}
+    )
+
+
+def update_blob_references(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_blobs", {})
+    for field_name, new_name in current_blobs(sender, instance).items():
+        old_name = previous.get(field_name) or ""
+        if old_name != new_name:
+            adjust_references(old_name, -1)
+            adjust_references(new_name, 1)
+    instance._previous_blobs = current_blobs(sender, instance)
+
+
+def release_blob_references(sender, instance, **kwargs):
+    for name in current_blobs(sender, instance).values():
+        adjust_references(name, -1)
+
+
+for model in TRACKED_FIELDS:
+    pre_save.connect(remember_previous_blobs, sender=model)
+    post_save.connect(update_blob_references, sender=model)
+    post_delete.connect(release_blob_references, sender=model)
+
+
+# Derivatives: regenerate whenever a tracked file no longer matches the
+# source recorded in the row's `derivatives` column.
+DERIVATIVE_FIELDS = defaultdict(list)
+for model, field_name, _ in derivative_fields():
+    DERIVATIVE_FIELDS[model].append(field_name)
+
+
+def refresh_derivatives(sender, instance, **kwargs):
+    recorded = instance.derivatives or {}
+    stale = []
+    for field_name in DERIVATIVE_FIELDS[sender]:
+        name = getattr(instance, field_name).name or ""
+        if (recorded.get(field_name) or {}).get("source", "") == name:
+            continue
+        if name and supports_derivatives(name):
+            schedule_derivatives(instance, field_name)
+        elif field_name in recorded:
+            stale.append(field_name)
+
+    if stale:
+        for field_name in stale:
+            recorded.pop(field_name)
+        sender.objects.filter(pk=instance.pk).update(derivatives=recorded)
+
+
+for model in DERIVATIVE_FIELDS:
+    post_save.connect(refresh_derivatives, sender=model)
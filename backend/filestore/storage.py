@@ -0,0 +1,101 @@
+"""
+Content-addressed storage.
+
+Files are stored under the SHA-256 of their bytes, so an identical upload
+from another teacher or school resolves to the existing blob instead of a new
+copy. Only fields that opt in with `storage=content_addressed_storage` use it;
+their rows are reference-counted through `filestore.signals`.
+"""
+
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils import timezone
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    prefix = "blobs"
+
+    def blob_name(self, digest, name):
+        extension = os.path.splitext(name)[1].lower()
+        return f"{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save; never suffix it
+        return name
+
+    def _save(self, name, content):
+        from .models import MediaBlob
+
+        # filestore.metadata and finalize_upload record the digest they already computed
+        sha256 = getattr(content, "sha256", None)
+        if sha256:
+            size = content.size
+        else:
+            digest = hashlib.sha256()
+            size = 0
+            for chunk in content.chunks():
+                digest.update(chunk)
+                size += len(chunk)
+            content.seek(0)
+            sha256 = digest.hexdigest()
+
+        name = self.blob_name(sha256, name)
+
+        # Copy new bytes before taking the lock, so only a rename happens under it
+        staged = None
+        if not self.exists(name):
+            staged = super()._save(f"{self.prefix}/.staging/{uuid.uuid4().hex}", content)
+        try:
+            # The row lock orders this write against gc_media_blobs deleting the same blob
+            with transaction.atomic():
+                _, created = MediaBlob.objects.select_for_update().get_or_create(
+                    name=name, defaults={"sha256": sha256, "size": size}
+                )
+                if not created:
+                    # Bump updated_at so a blob re-uploaded during GC's grace period survives
+                    MediaBlob.objects.filter(name=name).update(updated_at=timezone.now())
+                if not self.exists(name):
+                    if staged is None:
+                        # Collected since the check above
+                        staged = super()._save(
+                            f"{self.prefix}/.staging/{uuid.uuid4().hex}", content
+                        )
+                    os.makedirs(os.path.dirname(self.path(name)), exist_ok=True)
+                    os.replace(self.path(staged), self.path(name))
+                    staged = None
+        finally:
+            if staged:
+                self.delete(staged)
+        return name
+
+
+class ProtectedStorage(FileSystemStorage):
+    """
+    MEDIA_ROOT/protected/: derived files of access-controlled uploads, such as
+    previews of course content. Like blobs/ it has no public URL; views check
+    access and send the files with filestore.serving.serve_file.
+    """
+
+    prefix = "protected"
+
+    # Properties rather than FileSystemStorage's cached values, so the
+    # location follows MEDIA_ROOT when settings are overridden
+    @property
+    def base_location(self):
+        return os.path.join(settings.MEDIA_ROOT, self.prefix)
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    def url(self, name):
+        raise ValueError(f"{name} is protected; link the view that serves it instead")
+
+
+content_addressed_storage = ContentAddressedStorage()
+protected_storage = ProtectedStorage()
@@ -0,0 +1,40 @@
+"""
+Plain-text extraction of uploaded documents for full-text indexing.
+"""
+
+import logging
+
+from pypdf.errors import PdfReadError
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGES = 50
+MAX_CHARS = 200_000
+TEXT_EXTENSIONS = {".txt", ".md", ".csv"}
+
+
+def plain_text(handle):
+    """The text of a plain-text file, truncated to MAX_CHARS."""
+    return _clean(handle.read(MAX_CHARS * 4).decode("utf-8", errors="ignore"))
+
+
+def pdf_text(reader):
+    """The text of the first MAX_PAGES pages of a parsed PDF, truncated to MAX_CHARS."""
+    try:
+        parts = []
+        length = 0
+        for page in reader.pages[:MAX_PAGES]:
+            part = page.extract_text() or ""
+            parts.append(part)
+            length += len(part)
+            if length >= MAX_CHARS:
+                break
+        return _clean("\n".join(parts))
+    except (PdfReadError, ValueError, KeyError, TypeError) as e:
+        logger.warning("Could not extract PDF text: %s", e)
+        return ""
+
+
+def _clean(text):
+    # NUL bytes are not allowed in PostgreSQL text columns
+    return text.replace("\x00", "")[:MAX_CHARS]
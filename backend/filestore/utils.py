@@ -0,0 +1,61 @@
+from collections import Counter
+
+from django.apps import apps
+from django.db.models import F
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from .models import MediaBlob
+
+# (app_label, model, field) of every FileField stored in content-addressed storage.
+# Each row pointing at a blob holds one reference to it.
+BLOB_FIELDS = [
+    ("course_content", "CourseContent", "file"),
+    ("course_content", "AssignmentSubmission", "submission_file"),
+    ("course_content", "ChunkedUpload", "file"),
+]
+
+
+def blob_models():
+    """Yields (model, field_name) pairs for BLOB_FIELDS."""
+    for app_label, model_name, field_name in BLOB_FIELDS:
+        yield apps.get_model(app_label, model_name), field_name
+
+
+def adjust_references(name, change):
+    """Moves the reference counter of a blob; names outside the blob store are ignored."""
+    if name:
+        MediaBlob.objects.filter(name=name).update(ref_count=F("ref_count") + change)
+
+
+def count_references():
+    """
+    Counts references to every blob by scanning the blob fields of all tenants.
+    Returns a Counter of {blob name: references}.
+    """
+    counts = Counter()
+    for tenant in Organization.objects.exclude(schema_name="public"):
+        with tenant_context(tenant):
+            for model, field_name in blob_models():
+                counts.update(
+                    model.objects.filter(**{f"{field_name}__startswith": "blobs/"})
+                    .values_list(field_name, flat=True)
+                    .iterator()
+                )
+    return counts
+
+
+def recount_references():
+    """
+    Rewrites every MediaBlob.ref_count from a full scan, repairing drift left by
+    bulk operations that bypass signals. Returns the number of corrected blobs.
+    """
+    counts = count_references()
+    drifted = []
+    for blob in MediaBlob.objects.iterator():
+        actual = counts.get(blob.name, 0)
+        if blob.ref_count != actual:
+            blob.ref_count = actual
+            drifted.append(blob)
+    MediaBlob.objects.bulk_update(drifted, ["ref_count"], batch_size=1000)
+    return len(drifted)
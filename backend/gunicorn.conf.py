@@ -0,0 +1,39 @@
+"""
+Gunicorn settings for serving the project.
+
+ASGI, the default (Uvicorn workers, one event loop each):
+    gunicorn config.asgi:application -c gunicorn.conf.py
+
+WSGI with a thread per request, the baseline loadtest.py compares against:
+    GUNICORN_WORKER_CLASS=gthread GUNICORN_THREADS=8 \
+        gunicorn config.wsgi:application -c gunicorn.conf.py
+
+Under ASGI, Uvicorn reads requests and writes responses on the event loop,
+so a client on a slow network holds a socket, not a thread. Views still
+run their blocking work in threads: synchronous DRF views in Django's
+thread pool, and the queries of async views (core.async_views), which
+Django's async ORM runs through sync_to_async. Protected downloads stream
+block by block from a worker thread when MEDIA_SENDFILE_BACKEND is empty;
+set it to "nginx" or "apache" in production so file bytes never pass
+through Python. A WSGI worker serves at most `threads` requests at a time,
+however long each client takes to read its response.
+"""
+
+import multiprocessing
+
+from decouple import config
+
+bind = config("GUNICORN_BIND", default="0.0.0.0:8000")
+workers = config("GUNICORN_WORKERS", cast=int, default=multiprocessing.cpu_count() * 2 + 1)
+worker_class = config("GUNICORN_WORKER_CLASS", default="uvicorn_worker.UvicornWorker")
+# Only used by the gthread worker class
+threads = config("GUNICORN_THREADS", cast=int, default=1)
+# Idle connections kept open for clients on slow or flaky networks
+keepalive = config("GUNICORN_KEEPALIVE", cast=int, default=5)
+timeout = config("GUNICORN_TIMEOUT", cast=int, default=60)
+graceful_timeout = 30
+# Recycle workers now and then so slow leaks cannot build up
+max_requests = config("GUNICORN_MAX_REQUESTS", cast=int, default=2000)
+max_requests_jitter = 200
+accesslog = "-"
+errorlog = "-"
@@ -0,0 +1,184 @@
+"""
+Load test: how many concurrent slow clients a deployment holds.
+
+Each virtual client loops over the given paths on fresh connections. With
+--client-delay it behaves like a phone on a slow uplink: the request line
+goes out at once and the rest of the request only after the delay. A
+thread-per-request server (gunicorn gthread) keeps a thread waiting for
+each such client; Uvicorn workers wait on the event loop instead. Every
+target is run at each concurrency level for --duration seconds.
+
+    docker compose --profile serve up -d     # ASGI on :8001, WSGI baseline on :8002
+    python loadtest.py --host=<school>.localhost --username=<user> --password=<pass> \\
+        --target asgi=http://localhost:8001 --target wsgi=http://localhost:8002 \\
+        --concurrency 10,100,400 --client-delay 500
+
+Only the standard library is needed, so it runs from any machine; raise the
+open file limit (ulimit -n) for high concurrency levels.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ["/api/auth/me/", "/api/course-content/feed/?limit=20"]
+
+
+async def fetch(base_url, host, path, method="GET", cookie=None, body=None, client_delay=0.0):
+    """One HTTP/1.1 request on a new connection: (status, [(header, value)], body)."""
+    url = urlsplit(base_url)
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {host or url.netloc}",
+            "Accept: application/json",
+            "Connection: close",
+        ]
+        if cookie:
+            lines.append(f"Cookie: {cookie}")
+        if body is not None:
+            lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+
+        writer.write(f"{lines[0]}\r\n".encode())
+        await writer.drain()
+        if client_delay:
+            await asyncio.sleep(client_delay)
+        writer.write("\r\n".join(lines[1:]).encode() + b"\r\n\r\n" + (body or b""))
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin1").split("\r\n")
+    headers = [tuple(part.strip() for part in line.split(":", 1)) for line in header_lines]
+    return int(status_line.split()[1]), headers, payload
+
+
+async def login(base_url, host, username, password):
+    """The Cookie header of a logged-in session on `base_url`."""
+    body = json.dumps({"username": username, "password": password}).encode()
+    status, headers, payload = await fetch(
+        base_url, host, "/api/auth/login/", method="POST", body=body
+    )
+    if status != 200:
+        raise SystemExit(f"{base_url}: login failed ({status}): {payload[:200]!r}")
+    cookies = SimpleCookie()
+    for name, value in headers:
+        if name.lower() == "set-cookie":
+            cookies.load(value)
+    return "; ".join(f"{name}={morsel.value}" for name, morsel in cookies.items())
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_level(base_url, options, cookie, concurrency):
+    """Runs `concurrency` clients for the test duration: (latencies, errors)."""
+    latencies, errors = [], 0
+    deadline = time.monotonic() + options.duration
+
+    async def client(number):
+        nonlocal errors
+        turn = number
+        while time.monotonic() < deadline:
+            path = options.path[turn % len(options.path)]
+            turn += 1
+            start = time.monotonic()
+            try:
+                status, _, _ = await asyncio.wait_for(
+                    fetch(
+                        base_url,
+                        options.host,
+                        path,
+                        cookie=cookie,
+                        client_delay=options.client_delay / 1000,
+                    ),
+                    options.timeout,
+                )
+            except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+                errors += 1
+                # Refused or reset connections fail instantly; don't spin on them
+                await asyncio.sleep(0.1)
+                continue
+            if status == 200:
+                latencies.append(time.monotonic() - start)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(client(number) for number in range(concurrency)))
+    return sorted(latencies), errors
+
+
+async def main(options):
+    targets = []
+    for target in options.target:
+        name, _, base_url = target.partition("=")
+        if not base_url:
+            raise SystemExit(f"--target expects NAME=URL, got {target!r}")
+        cookie = options.cookie
+        if options.username:
+            cookie = await login(base_url, options.host, options.username, options.password)
+        targets.append((name, base_url, cookie))
+
+    print(
+        f"{'target':<10} {'clients':>7} {'ok':>7} {'errors':>7} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for concurrency in options.concurrency:
+        for name, base_url, cookie in targets:
+            latencies, errors = await run_level(base_url, options, cookie, concurrency)
+            print(
+                f"{name:<10} {concurrency:>7} {len(latencies):>7} {errors:>7} "
+                f"{len(latencies) / options.duration:>8.1f} "
+                f"{percentile(latencies, 0.50) * 1000:>8.0f} "
+                f"{percentile(latencies, 0.95) * 1000:>8.0f} "
+                f"{percentile(latencies, 0.99) * 1000:>8.0f}"
+            )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="NAME=URL of a server to test, e.g. asgi=http://localhost:8001 (repeatable)",
+    )
+    parser.add_argument("--host", help="Host header selecting the school, e.g. demo.localhost")
+    parser.add_argument("--username", help="Log in as this user on each target")
+    parser.add_argument("--password", default="")
+    parser.add_argument("--cookie", help="Cookie header to send instead of logging in")
+    parser.add_argument(
+        "--path",
+        action="append",
+        help=f"Path to request (repeatable; default: {', '.join(DEFAULT_PATHS)})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[10, 50, 200],
+        help="Comma-separated numbers of concurrent clients (default: 10,50,200)",
+    )
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per level")
+    parser.add_argument(
+        "--client-delay",
+        type=float,
+        default=0,
+        help="Milliseconds each client takes to finish sending its request",
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds before a request fails")
+    options = parser.parse_args()
+    options.path = options.path or DEFAULT_PATHS
+    return options
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
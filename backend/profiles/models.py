@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models, connection
+from django.db.models.functions import Upper
 from django.conf import settings
 import uuid
 
@@ -37,12 +40,26 @@ class Profile(models.Model):
     profile_image = models.ImageField(
         upload_to="profiles/photos/", null=True, blank=True
     )
+    # Resized WebP versions, filled in by filestore.derivatives
+    derivatives = models.JSONField(default=dict, blank=True)
 
     # Memorable Local Identity
     local_username = models.CharField(
         max_length=150, unique=True, null=True, blank=True
     )
 
+    # People search (see search.views): names are not stemmed, so the
+    # 'simple' configuration keeps "Shrestha" a prefix of itself
+    search_vector = models.GeneratedField(
+        expression=SearchVector(
+            "first_name", "middle_name", "last_name", "local_username",
+            weight="A", config="simple",
+        )
+        + SearchVector("phone", "alt_phone", weight="B", config="simple"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -53,11 +70,25 @@ class Profile(models.Model):
             models.Index(
                 fields=["user_id", "local_username"], name="profile_user_username_idx"
             ),
+            GinIndex(fields=["search_vector"], name="profile_search_vector_idx"),
+            models.Index(
+                fields=["phone"], name="profile_phone_prefix_idx", opclasses=["varchar_pattern_ops"]
+            ),
+            # Parent deduplication (families.utils): same phone, same name
+            models.Index(
+                "phone", Upper("last_name"), Upper("first_name"), name="profile_phone_name_idx"
+            ),
         ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    @property
+    def full_name(self):
+        return " ".join(
+            part for part in (self.first_name, self.middle_name, self.last_name) if part
+        )
+
     @property
     def user(self):
         """Helper to fetch the global User object manually."""
@@ -84,6 +115,8 @@ class InstitutionProfile(models.Model):
 
     logo = models.ImageField(upload_to="institution/logos/", null=True, blank=True)
     banner = models.ImageField(upload_to="institution/banners/", null=True, blank=True)
+    # Resized WebP versions, filled in by filestore.derivatives
+    derivatives = models.JSONField(default=dict, blank=True)
     tagline = models.CharField(max_length=255, blank=True)
     mission = models.TextField(blank=True)
     vision = models.TextField(blank=True)
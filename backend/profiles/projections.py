@@ -0,0 +1,84 @@
+from accounts.models import User
+from core.projections import OMIT, Projection, datetime_value, file_url
+from filestore.derivatives import derivative_urls_from
+from .models import Profile
+
+
+class ProfileProjection(Projection):
+    """ProfileSerializer as a projection; portal users are loaded once per page."""
+
+    columns = {
+        "id": "id",
+        "user_id": "user_id",
+        "local_username": "local_username",
+        "first_name": "first_name",
+        "middle_name": "middle_name",
+        "last_name": "last_name",
+        "gender": "gender",
+        "date_of_birth": "date_of_birth",
+        "blood_group": "blood_group",
+        "phone": "phone",
+        "alt_phone": "alt_phone",
+        "address": "address",
+        "created_at": ("created_at", datetime_value),
+        "updated_at": ("updated_at", datetime_value),
+    }
+    computed = {
+        "username": ("user_id",),
+        "email": ("user_id",),
+        "profile_image": ("profile_image",),
+        "profile_image_thumbnails": ("profile_image", "derivatives"),
+    }
+    fields = (
+        "id",
+        "user_id",
+        "username",
+        "local_username",
+        "email",
+        "first_name",
+        "middle_name",
+        "last_name",
+        "gender",
+        "date_of_birth",
+        "blood_group",
+        "phone",
+        "alt_phone",
+        "address",
+        "profile_image",
+        "profile_image_thumbnails",
+        "created_at",
+        "updated_at",
+    )
+
+    storage = Profile._meta.get_field("profile_image").storage
+
+    def prepare(self, rows):
+        self.users = {}
+        if "username" in self.fields or "email" in self.fields:
+            user_ids = {self.field(row, "user_id") for row in rows} - {None}
+            if user_ids:
+                self.users = User.objects.in_bulk(user_ids)
+
+    def _user(self, row):
+        return self.users.get(self.field(row, "user_id"))
+
+    def get_username(self, row):
+        user = self._user(row)
+        return user.username if user else OMIT
+
+    def get_email(self, row):
+        user = self._user(row)
+        return user.email if user else OMIT
+
+    def get_profile_image(self, row):
+        return file_url(
+            self.storage, self.field(row, "profile_image"), self.context.get("request")
+        )
+
+    def get_profile_image_thumbnails(self, row):
+        return derivative_urls_from(
+            self.field(row, "derivatives"),
+            "profile_image",
+            self.field(row, "profile_image"),
+            self.context.get("request"),
+        )
@@ -1,11 +1,13 @@
 from rest_framework import serializers
 from .models import Profile, InstitutionProfile
 from django.db import connection
+from filestore.derivatives import derivative_urls
 
 
 class ProfileSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source="user.email", read_only=True)
     username = serializers.CharField(source="user.username", read_only=True)
+    profile_image_thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
@@ -25,17 +27,23 @@ class ProfileSerializer(serializers.ModelSerializer):
             "alt_phone",
             "address",
             "profile_image",
+            "profile_image_thumbnails",
             "created_at",
             "updated_at",
         )
         read_only_fields = ("id", "user_id", "email", "username")
 
+    def get_profile_image_thumbnails(self, obj):
+        return derivative_urls(obj, "profile_image", self.context.get("request"))
+
 
 class InstitutionProfileSerializer(serializers.ModelSerializer):
     # These fields come from the Organization model in the public schema
     name = serializers.CharField(required=False)
     phone = serializers.CharField(required=False, allow_blank=True)
     email = serializers.EmailField(required=False, allow_blank=True)
+    logo_thumbnails = serializers.SerializerMethodField()
+    banner_thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = InstitutionProfile
@@ -45,7 +53,9 @@ class InstitutionProfileSerializer(serializers.ModelSerializer):
             "phone",
             "email",
             "logo",
+            "logo_thumbnails",
             "banner",
+            "banner_thumbnails",
             "tagline",
             "mission",
             "vision",
@@ -59,6 +69,12 @@ class InstitutionProfileSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("id",)
 
+    def get_logo_thumbnails(self, obj):
+        return derivative_urls(obj, "logo", self.context.get("request"))
+
+    def get_banner_thumbnails(self, obj):
+        return derivative_urls(obj, "banner", self.context.get("request"))
+
     def to_representation(self, instance):
         """Add organization data to the output."""
         data = super().to_representation(instance)
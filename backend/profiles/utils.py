@@ -5,13 +5,15 @@ from .models import Profile
 from django_tenants.utils import tenant_context
 
 
-def get_global_audit_results():
+def get_global_audit_results(tenants=None):
     """
-    Performs a platform-wide scan across all tenants.
+    Performs a platform-wide scan across all tenants (or only the given ones).
     Returns a dictionary of findings.
     """
     valid_user_ids = set(User.objects.values_list("id", flat=True))
-    tenants = Organization.objects.exclude(schema_name="public")
+    if tenants is None:
+        tenants = Organization.objects.all()
+    tenants = tenants.exclude(schema_name="public")
 
     findings = {}
 
@@ -45,3 +47,16 @@ def cleanup_orphans_for_tenant(tenant_schema):
         count = orphans.count()
         orphans.delete()
         return count
+
+
+def attach_users(profiles):
+    """
+    Loads the global Users of `profiles` in one query and caches them on each
+    profile, so `profile.user` never queries again (None when the user is gone).
+    """
+    profiles = [profile for profile in profiles if profile.user_id]
+    if not profiles:
+        return
+    users = User.objects.in_bulk({profile.user_id for profile in profiles})
+    for profile in profiles:
+        profile._user_cache = users.get(profile.user_id)
@@ -286,4 +286,17 @@ SYSTEM_PERMISSIONS = [
         "module": "Course Content",
         "description": "Enroll students in subjects",
     },
+    # Attendance
+    {
+        "codename": "view_attendance",
+        "name": "View Attendance",
+        "module": "Attendance",
+        "description": "View attendance sheets and monthly summaries",
+    },
+    {
+        "codename": "mark_attendance",
+        "name": "Mark Attendance",
+        "module": "Attendance",
+        "description": "Take attendance for a section",
+    },
 ]
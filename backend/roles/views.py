@@ -6,9 +6,10 @@ from django.utils.text import slugify
 from .models import Role, Permission
 from .serializers import RoleSerializer, PermissionSerializer
 from .permissions import HasPermission
+from core.mixins import SparseFieldsMixin
 
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     serializer_class = RoleSerializer
 
     def get_permissions(self):
@@ -67,7 +68,7 @@ class RoleViewSet(viewsets.ModelViewSet):
         role.delete()
 
 
-class PermissionListView(generics.ListAPIView):
+class PermissionListView(SparseFieldsMixin, generics.ListAPIView):
     permission_classes = [IsAuthenticated, HasPermission("view_role")]
     serializer_class = PermissionSerializer
     queryset = Permission.objects.all().order_by("module", "name")
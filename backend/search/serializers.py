@@ -0,0 +1,79 @@
+from rest_framework import serializers
+
+from filestore.derivatives import derivative_urls
+from profiles.models import Profile
+
+# type -> reverse one-to-one on Profile
+RECORDS = {
+    "student": "student_record",
+    "staff": "staff_record",
+    "parent": "parent_record",
+}
+
+
+class PersonHitSerializer(serializers.ModelSerializer):
+    """
+    One person in the tenant with whichever records they have. Built from a
+    single joined row, so rendering a page never queries again.
+    """
+
+    full_name = serializers.CharField(read_only=True)
+    types = serializers.SerializerMethodField()
+    student = serializers.SerializerMethodField()
+    staff = serializers.SerializerMethodField()
+    parent = serializers.SerializerMethodField()
+    profile_image_thumbnails = serializers.SerializerMethodField()
+    rank = serializers.FloatField(source="search_rank", read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = (
+            "id",
+            "full_name",
+            "local_username",
+            "phone",
+            "types",
+            "student",
+            "staff",
+            "parent",
+            "profile_image_thumbnails",
+            "rank",
+        )
+
+    def _record(self, obj, name):
+        """The person's `name` record, if the caller may see that type (context "types")."""
+        if name not in self.context.get("types", RECORDS):
+            return None
+        return getattr(obj, RECORDS[name], None)
+
+    def get_types(self, obj):
+        return [name for name in RECORDS if self._record(obj, name)]
+
+    def get_student(self, obj):
+        student = self._record(obj, "student")
+        if not student:
+            return None
+        return {
+            "id": student.id,
+            "enrollment_id": student.enrollment_id,
+            "status": student.status,
+        }
+
+    def get_staff(self, obj):
+        staff = self._record(obj, "staff")
+        if not staff:
+            return None
+        return {
+            "id": staff.id,
+            "employee_id": staff.employee_id,
+            "designation": staff.designation,
+        }
+
+    def get_parent(self, obj):
+        parent = self._record(obj, "parent")
+        if not parent:
+            return None
+        return {"id": parent.id}
+
+    def get_profile_image_thumbnails(self, obj):
+        return derivative_urls(obj, "profile_image", self.context.get("request"))
@@ -0,0 +1,107 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from families.models import Parent
+from profiles.models import Profile
+from roles.models import Permission, Role, UserRole
+from staff.models import StaffMember
+from students.models import Student
+
+
+class PeopleSearchTest(TenantTestCase):
+    """
+    Verifies typed, ranked hits across students, staff and parents.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.student = Student.objects.create(
+            profile=Profile.objects.create(
+                first_name="Aarav", last_name="Shrestha", phone="9812345678"
+            ),
+            enrollment_id="STU-2026-001",
+        )
+        self.teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Sita", last_name="Sharma"),
+            employee_id="EMP-042",
+            designation="Teacher",
+        )
+        # One person who is both a parent and a staff member
+        both = Profile.objects.create(
+            first_name="Ram", last_name="Shrestha", local_username="ram.shrestha"
+        )
+        self.parent = Parent.objects.create(profile=both)
+        StaffMember.objects.create(profile=both, employee_id="EMP-077", designation="Driver")
+        Profile.objects.create(first_name="Shreya", last_name="Nobody")
+
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="desk", password="x"))
+
+    def _search(self, **params):
+        response = self.api.get("/api/search/people/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_name_prefix_returns_typed_hits(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self._search(search="shre")
+        # Besides the middleware's tenant lookup, the whole page is one SELECT
+        selects = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and "organizations_domain" not in q["sql"]
+        ]
+        self.assertEqual(len(selects), 1, selects)
+
+        hits = {hit["full_name"]: hit for hit in data["results"]}
+        # Profiles without a student, staff or parent record are not people here
+        self.assertEqual(set(hits), {"Aarav Shrestha", "Ram Shrestha"})
+        self.assertEqual(hits["Aarav Shrestha"]["types"], ["student"])
+        self.assertEqual(hits["Aarav Shrestha"]["student"]["enrollment_id"], "STU-2026-001")
+        self.assertEqual(hits["Ram Shrestha"]["types"], ["staff", "parent"])
+        self.assertIsNone(data["next"])
+
+    def test_identifier_and_phone_prefixes(self):
+        self.assertEqual(
+            [hit["id"] for hit in self._search(search="stu-2026")["results"]],
+            [str(self.student.profile_id)],
+        )
+        self.assertEqual(
+            [hit["id"] for hit in self._search(search="EMP-04")["results"]],
+            [str(self.teacher.profile_id)],
+        )
+        self.assertEqual(
+            [hit["id"] for hit in self._search(search="98123")["results"]],
+            [str(self.student.profile_id)],
+        )
+
+    def test_type_filter_and_paging(self):
+        data = self._search(search="shrestha", type="parent")
+        self.assertEqual([hit["full_name"] for hit in data["results"]], ["Ram Shrestha"])
+
+        data = self._search(search="shrestha", limit=1)
+        self.assertEqual(len(data["results"]), 1)
+        self.assertIsNotNone(data["next"])
+
+        self.assertEqual(self._search(search="")["results"], [])
+
+    def test_hits_show_only_visible_types(self):
+        role = Role.objects.create(name="Front desk", slug="front-desk")
+        role.permissions.add(Permission.objects.get(codename="view_family"))
+        user = User.objects.create_user(username="frontdesk", password="x")
+        UserRole.objects.create(user=user, role=role)
+        self.api.force_authenticate(user)
+
+        hits = self._search(search="shrestha")["results"]
+        self.assertEqual([hit["full_name"] for hit in hits], ["Ram Shrestha"])
+        self.assertEqual(hits[0]["types"], ["parent"])
+        self.assertIsNone(hits[0]["staff"])
+        self.assertEqual(hits[0]["parent"]["id"], str(self.parent.id))
+
+        # Employee IDs are not searchable without view_staff
+        self.assertEqual(self._search(search="EMP-07")["results"], [])
+        response = self.api.get("/api/search/people/", {"search": "x", "type": "staff"})
+        self.assertEqual(response.status_code, 403)
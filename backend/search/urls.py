@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import PeopleSearchView
+
+urlpatterns = [
+    path("people/", PeopleSearchView.as_view(), name="people-search"),
+]
@@ -0,0 +1,95 @@
+from django.db.models import Q
+from rest_framework import generics
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+
+from core.pagination import FetchAheadPagination
+from core.search import FullTextSearchFilter
+from profiles.models import Profile
+from roles.permissions import HasPermission
+from .serializers import PersonHitSerializer
+
+# type -> (reverse one-to-one on Profile, permission needed to see it, identifier prefix field)
+PERSON_TYPES = {
+    "student": ("student_record", "view_student", "student_record__enrollment_id"),
+    "staff": ("staff_record", "view_staff", "staff_record__employee_id"),
+    "parent": ("parent_record", "view_family", None),
+}
+
+
+class PeopleSearchView(generics.ListAPIView):
+    """
+    GET /api/search/people/?search=<text>[&type=student,staff][&fuzzy=true]
+
+    Ranked search over profile names, local usernames and phone numbers,
+    plus prefix matches on enrollment and employee IDs. Hits are limited to
+    the person types the caller may view and come back in one query; a hit
+    shows, and is matched on the identifiers of, only those types.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = PersonHitSerializer
+    pagination_class = FetchAheadPagination
+    filter_backends = [FullTextSearchFilter]
+    search_vector_field = "search_vector"
+    search_config = "simple"
+    trigram_fields = ["first_name", "last_name"]
+
+    @property
+    def search_prefix_fields(self):
+        identifiers = [PERSON_TYPES[name][2] for name in self.get_visible_types()]
+        return [field for field in identifiers if field] + ["phone"]
+
+    def get_visible_types(self):
+        if hasattr(self, "_visible_types"):
+            return self._visible_types
+        requested = self.request.query_params.get("type")
+        requested = set(requested.split(",")) if requested else set(PERSON_TYPES)
+        visible = [
+            name
+            for name, (_, codename, _) in PERSON_TYPES.items()
+            if name in requested
+            and HasPermission(codename).has_permission(self.request, self)
+        ]
+        if not visible and requested & set(PERSON_TYPES):
+            raise PermissionDenied("You cannot view any of the requested people.")
+        self._visible_types = visible
+        return visible
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["types"] = self.get_visible_types()
+        return context
+
+    def get_queryset(self):
+        visible = self.get_visible_types()
+        if not visible or not self.request.query_params.get("search", "").strip():
+            # Never fall back to listing everyone
+            return Profile.objects.none()
+
+        has_record = Q()
+        for name in visible:
+            has_record |= Q(**{f"{PERSON_TYPES[name][0]}__isnull": False})
+
+        return (
+            Profile.objects.filter(has_record)
+            .select_related("student_record", "staff_record", "parent_record")
+            .only(
+                "id",
+                "first_name",
+                "middle_name",
+                "last_name",
+                "local_username",
+                "phone",
+                "profile_image",
+                "derivatives",
+                "student_record__id",
+                "student_record__enrollment_id",
+                "student_record__status",
+                "staff_record__id",
+                "staff_record__employee_id",
+                "staff_record__designation",
+                "parent_record__id",
+            )
+            .order_by("last_name", "first_name", "id")
+        )
@@ -0,0 +1,46 @@
+from core.projections import Projection
+from profiles.projections import ProfileProjection
+
+
+class InstructorProjection(Projection):
+    columns = {
+        "id": "id",
+        "staff_member": "staff_member_id",
+        "specialization": "specialization",
+        "license_number": "license_number",
+        "bio": "bio",
+    }
+    fields = ("id", "staff_member", "specialization", "license_number", "bio")
+
+
+class StaffMemberProjection(Projection):
+    """StaffMemberSerializer as a projection: profile and instructor come from the same row."""
+
+    columns = {
+        "id": "id",
+        "profile": "profile_id",
+        "employee_id": "employee_id",
+        "designation": "designation",
+        "department": "department",
+        "joining_date": "joining_date",
+        "is_active": "is_active",
+        "qualification": "qualification",
+        "experience_years": "experience_years",
+    }
+    nested = {
+        "profile_details": (ProfileProjection, "profile__"),
+        "instructor_data": (InstructorProjection, "instructor_record__"),
+    }
+    fields = (
+        "id",
+        "profile",
+        "profile_details",
+        "employee_id",
+        "designation",
+        "department",
+        "joining_date",
+        "is_active",
+        "qualification",
+        "experience_years",
+        "instructor_data",
+    )
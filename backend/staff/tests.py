@@ -1,3 +1,62 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import User
+from core.renderers import ORJSONRenderer
+from profiles.models import Profile
+from .models import Instructor, StaffMember
+from .serializers import StaffMemberSerializer
+
+
+class StaffListProjectionTest(TenantTestCase):
+    """
+    Verifies the staff list, served from a projection, renders exactly what
+    StaffMemberSerializer renders, in a fixed number of queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user(username="teacher", email="t@example.com", password="x")
+        teacher = StaffMember.objects.create(
+            profile=Profile.objects.create(user_id=user.id, first_name="Tea", last_name="Cher"),
+            employee_id="EMP-1",
+            designation="Teacher",
+        )
+        Instructor.objects.create(staff_member=teacher, specialization="Biology")
+        StaffMember.objects.create(
+            profile=Profile.objects.create(first_name="Acc", last_name="Ountant", phone="555"),
+            employee_id="EMP-2",
+            designation="Accountant",
+            experience_years=4,
+        )
+
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+        self.request = APIRequestFactory().get("/", HTTP_HOST=self.domain.domain)
+
+    def test_list_matches_the_serializer(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get("/api/staff/members/")
+        self.assertEqual(response.status_code, 200, response.content)
+        selects = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and "organizations_domain" not in q["sql"]
+        ]
+        # the cursor page (profile and instructor joined), the page's portal users
+        self.assertEqual(len(selects), 2, selects)
+
+        rows = {row["id"]: row for row in response.json()["results"]}
+        data = StaffMemberSerializer(
+            StaffMember.objects.all(), many=True, context={"request": self.request}
+        ).data
+        expected = {row["id"]: row for row in json.loads(ORJSONRenderer().render(data))}
+        self.assertEqual(rows, expected)
+        self.assertEqual(
+            {row["employee_id"]: row["instructor_data"] is None for row in rows.values()},
+            {"EMP-1": False, "EMP-2": True},
+        )
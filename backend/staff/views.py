@@ -9,11 +9,16 @@ from .serializers import (
     InstructorDetailSerializer,
 )
 from roles.permissions import HasPermission
+from core.mixins import SparseFieldsMixin
+from core.projections import ProjectionListMixin
+from .projections import StaffMemberProjection
 
 
-class StaffMemberViewSet(viewsets.ModelViewSet):
+class StaffMemberViewSet(ProjectionListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = StaffMember.objects.all().select_related("profile")
     serializer_class = StaffMemberSerializer
+    # Lists render profile, portal user and instructor data from one joined row
+    projection_class = StaffMemberProjection
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -33,45 +38,8 @@ class StaffMemberViewSet(viewsets.ModelViewSet):
             return StaffMemberUpdateSerializer
         return StaffMemberSerializer
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            self._prefetch_users(page)
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        self._prefetch_users(queryset)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-
-    def _prefetch_users(self, staff_list):
-        """
-        Manually fetch global users and attach them to profiles
-        to prevent N+1 queries during serialization.
-        """
-        from django.apps import apps
-
-        User = apps.get_model("accounts", "User")
-
-        # Collect IDs
-        user_ids = [s.profile.user_id for s in staff_list if s.profile.user_id]
-
-        if not user_ids:
-            return
-
-        # Bulk fetch
-        users = User.objects.filter(id__in=user_ids)
-        user_map = {u.id: u for u in users}
-
-        # Attach to instances
-        for staff in staff_list:
-            if staff.profile.user_id in user_map:
-                staff.profile._user_cache = user_map[staff.profile.user_id]
-
 
-class InstructorViewSet(viewsets.ModelViewSet):
+class InstructorViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Instructor.objects.all().select_related("staff_member__profile")
     serializer_class = InstructorDetailSerializer
 
@@ -0,0 +1,50 @@
+"""
+Composite loaders that fetch everything an endpoint renders up front.
+"""
+
+from django.db.models import Prefetch
+
+from families.models import StudentParentRelation
+from profiles.utils import attach_users
+from .models import AcademicHistory, Student, StudentLevel
+
+
+def load_student_detail(pk):
+    """
+    A student with everything the detail/edit form shows, in five queries:
+    student + profile, current placement (+ level, section), parent links
+    (+ parent profiles), academic history and the public-schema user.
+
+    The result carries `current_enrollment`, `parent_relations` and
+    `latest_history` (None when absent). Raises Student.DoesNotExist.
+    """
+    student = (
+        Student.objects.select_related("profile")
+        .prefetch_related(
+            Prefetch(
+                "enrollments",
+                queryset=StudentLevel.objects.filter(is_current=True).select_related(
+                    "level", "section"
+                ),
+                to_attr="current_enrollments",
+            ),
+            Prefetch(
+                "parent_links",
+                queryset=StudentParentRelation.objects.select_related("parent__profile"),
+                to_attr="parent_relations",
+            ),
+            Prefetch(
+                "academic_history",
+                queryset=AcademicHistory.objects.order_by("id"),
+                to_attr="history",
+            ),
+        )
+        .get(pk=pk)
+    )
+    attach_users([student.profile])
+
+    student.current_enrollment = (
+        student.current_enrollments[0] if student.current_enrollments else None
+    )
+    student.latest_history = student.history[0] if student.history else None
+    return student
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import tenant_context
+
+from organizations.models import Organization
+from students.promotion import promote_students
+
+
+class Command(BaseCommand):
+    help = (
+        "Rolls current student placements over to the next academic year, promoting "
+        "each student to the next level of their program and graduating final levels."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schema", type=str, required=True, help="Tenant schema to promote")
+        parser.add_argument("--from-year", required=True, help="Academic year being closed")
+        parser.add_argument("--to-year", required=True, help="Academic year being opened")
+        parser.add_argument("--program", type=str, help="Only promote this program (code)")
+        parser.add_argument(
+            "--hold-back",
+            nargs="*",
+            default=[],
+            help="Enrollment IDs of students who repeat their level",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Show the per-level counts without writing"
+        )
+
+    def handle(self, *args, **options):
+        if options["from_year"] == options["to_year"]:
+            raise CommandError("--to-year must differ from --from-year.")
+
+        tenant = Organization.objects.filter(schema_name=options["schema"]).first()
+        if not tenant or tenant.schema_name == "public":
+            raise CommandError(f"Tenant '{options['schema']}' does not exist.")
+
+        with tenant_context(tenant):
+            from academics.models import AcademicLevel, Program
+            from students.models import Student
+
+            program_id = None
+            if options.get("program"):
+                program_id = (
+                    Program.objects.filter(code=options["program"]).values_list("id", flat=True).first()
+                )
+                if not program_id:
+                    raise CommandError(f"Program '{options['program']}' does not exist.")
+
+            hold_back = list(
+                Student.objects.filter(enrollment_id__in=options["hold_back"]).values_list("id", flat=True)
+            )
+            if len(hold_back) != len(set(options["hold_back"])):
+                raise CommandError("Some --hold-back enrollment IDs do not exist.")
+
+            summary = promote_students(
+                options["from_year"],
+                options["to_year"],
+                program_id=program_id,
+                hold_back=hold_back,
+                dry_run=options["dry_run"],
+            )
+            level_names = dict(AcademicLevel.objects.values_list("id", "name"))
+
+        prefix = "[dry run] " if options["dry_run"] else ""
+        for row in summary:
+            self.stdout.write(
+                f"{prefix}{row['action']}: {row['students']} students "
+                f"({level_names[row['from_level_id']]} -> "
+                f"{level_names.get(row['to_level_id'], 'graduated')})"
+            )
+        total = sum(row["students"] for row in summary)
+        self.stdout.write(self.style.SUCCESS(f"{prefix}{tenant.schema_name}: {total} students rolled over"))
@@ -0,0 +1,154 @@
+"""
+Year-end promotion of StudentLevel placements.
+
+A rollover from one academic year to the next is a single SQL statement
+whose data-modifying CTEs all work off the same plan:
+  plan       current placements of active students in `from_year`, each with
+             the next AcademicLevel of its program by `order` and the section
+             of that level with the same name (e.g. "A" stays "A")
+  placed     INSERTs the `to_year` rows (held-back students keep their level)
+  graduated  marks students without a next level as graduated
+  retired    flips `is_current` off on the `from_year` rows
+Students who already have a `to_year` placement are left alone, so running
+the promotion twice is harmless. In the same transaction the new placements
+get their core subject enrollments (course_content.enrollments). A dry run
+evaluates only the plan.
+"""
+
+from django.db import connection, transaction
+
+from academics.models import AcademicLevel, Section
+from .models import Student, StudentLevel
+
+PLAN_SQL = """
+    SELECT sl.id AS row_id,
+           sl.student_id,
+           sl.level_id AS from_level_id,
+           sl.section_id AS from_section_id,
+           CASE WHEN sl.student_id = ANY(%(hold_back)s::uuid[]) THEN sl.level_id ELSE nxt.id END
+               AS to_level_id,
+           CASE WHEN sl.student_id = ANY(%(hold_back)s::uuid[]) THEN sl.section_id ELSE nsec.id END
+               AS to_section_id
+    FROM {student_level} sl
+    JOIN {student} st ON st.id = sl.student_id
+    JOIN {level} cur ON cur.id = sl.level_id
+    LEFT JOIN LATERAL (
+        SELECT l.id FROM {level} l
+        WHERE l.program_id = cur.program_id AND l."order" > cur."order"
+        ORDER BY l."order"
+        LIMIT 1
+    ) nxt ON TRUE
+    LEFT JOIN {section} cs ON cs.id = sl.section_id
+    LEFT JOIN {section} nsec ON nsec.level_id = nxt.id AND nsec.name = cs.name
+    WHERE sl.academic_year = %(from_year)s
+      AND sl.is_current
+      AND st.status = 'active'
+      AND (%(program_id)s::uuid IS NULL OR cur.program_id = %(program_id)s::uuid)
+      AND (cardinality(%(level_ids)s::uuid[]) = 0 OR sl.level_id = ANY(%(level_ids)s::uuid[]))
+      AND NOT EXISTS (
+          SELECT 1 FROM {student_level} nxt_year
+          WHERE nxt_year.student_id = sl.student_id AND nxt_year.academic_year = %(to_year)s
+      )
+"""
+
+SUMMARY_SQL = """
+    SELECT CASE
+               WHEN to_level_id IS NULL THEN 'graduate'
+               WHEN to_level_id = from_level_id THEN 'repeat'
+               ELSE 'promote'
+           END AS action,
+           from_level_id,
+           to_level_id,
+           COUNT(*) AS students,
+           array_remove(array_agg(DISTINCT from_section_id), NULL) AS from_sections,
+           array_remove(array_agg(DISTINCT to_section_id), NULL) AS to_sections
+    FROM plan
+    GROUP BY 1, 2, 3
+"""
+
+APPLY_SQL = """
+    WITH plan AS ({plan}),
+    placed AS (
+        INSERT INTO {student_level} (student_id, level_id, section_id, academic_year, is_current)
+        SELECT student_id, to_level_id, to_section_id, %(to_year)s, TRUE
+        FROM plan WHERE to_level_id IS NOT NULL
+        ON CONFLICT (student_id, academic_year) DO NOTHING
+        RETURNING student_id
+    ),
+    graduated AS (
+        UPDATE {student} SET status = 'graduated', updated_at = now()
+        WHERE id IN (SELECT student_id FROM plan WHERE to_level_id IS NULL)
+        RETURNING id
+    ),
+    retired AS (
+        UPDATE {student_level} SET is_current = FALSE
+        WHERE id IN (SELECT row_id FROM plan)
+        RETURNING id
+    )
+    {summary}
+"""
+
+
+def _tables():
+    quote = connection.ops.quote_name
+    return {
+        "student_level": quote(StudentLevel._meta.db_table),
+        "student": quote(Student._meta.db_table),
+        "level": quote(AcademicLevel._meta.db_table),
+        "section": quote(Section._meta.db_table),
+    }
+
+
+def promote_students(
+    from_year,
+    to_year,
+    program_id=None,
+    level_ids=(),
+    hold_back=(),
+    dry_run=False,
+):
+    """
+    Rolls current `from_year` placements over to `to_year`.
+
+    `program_id` / `level_ids` narrow the rollover, `hold_back` lists student
+    IDs that repeat their level. Returns one summary row per
+    (action, from level, to level) with the student count; with `dry_run`
+    nothing is written.
+    """
+    tables = _tables()
+    plan = PLAN_SQL.format(**tables)
+    params = {
+        "from_year": from_year,
+        "to_year": to_year,
+        "program_id": str(program_id) if program_id else None,
+        "level_ids": [str(level_id) for level_id in level_ids],
+        "hold_back": [str(student_id) for student_id in hold_back],
+    }
+
+    if dry_run:
+        sql = f"WITH plan AS ({plan}) {SUMMARY_SQL}"
+    else:
+        sql = APPLY_SQL.format(plan=plan, summary=SUMMARY_SQL, **tables)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [column.name for column in cursor.description]
+            summary = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        if not dry_run:
+            _after_rollover(summary)
+    return sorted(summary, key=lambda row: (row["action"], str(row["from_level_id"])))
+
+
+def _after_rollover(summary):
+    """
+    Raw SQL sends no signals: derive the core subjects of the new placements
+    and bump the rosters the rows moved between.
+    """
+    from academics.roster import bump_section_versions
+    from course_content.enrollments import sync_subject_enrollments
+
+    from_sections = {section for row in summary for section in row["from_sections"]}
+    to_sections = {section for row in summary for section in row["to_sections"]}
+    sync_subject_enrollments(section_ids=to_sections)
+    bump_section_versions(from_sections | to_sections)
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from .models import Student, AcademicHistory, StudentLevel
 from profiles.models import Profile
-from families.models import Parent, StudentParentRelation
+from families.models import StudentParentRelation
 from django.db import transaction
 import uuid
 from django.apps import apps
@@ -11,6 +11,32 @@ User = apps.get_model("accounts", "User")
 
 
 from academics.models import AcademicLevel, Section
+from families.utils import sync_student_parents
+
+
+class ParentEntrySerializer(serializers.Serializer):
+    """
+    One parent in the enrollment/edit form. `parent_id` identifies a parent
+    that is already linked (or one to link); omit it to create a new parent.
+    """
+
+    parent_id = serializers.UUIDField(required=False, allow_null=True)
+    first_name = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    middle_name = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    gender = serializers.ChoiceField(
+        choices=[("male", "Male"), ("female", "Female"), ("other", "Other")],
+        required=False,
+    )
+    address = serializers.CharField(required=False, allow_blank=True)
+    occupation = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    relation = serializers.ChoiceField(
+        choices=StudentParentRelation._meta.get_field("relation_type").choices,
+        required=False,
+    )
+    is_primary = serializers.BooleanField(required=False)
+    can_pickup = serializers.BooleanField(required=False)
 
 
 class StudentEnrollmentSerializer(serializers.Serializer):
@@ -38,9 +64,7 @@ class StudentEnrollmentSerializer(serializers.Serializer):
     last_grade_passed = serializers.CharField(required=False, allow_blank=True)
 
     # Parent Info (Nested)
-    parents = serializers.ListField(
-        child=serializers.DictField(), required=False, default=[]
-    )
+    parents = ParentEntrySerializer(many=True, required=False, default=list)
 
     def validate_email(self, value):
         if value:
@@ -105,28 +129,8 @@ class StudentEnrollmentSerializer(serializers.Serializer):
             is_current=True,
         )
 
-        # 6. Handle Parents
-        for p_data in parents_data:
-            # Create Parent Profile (usually no email for kids' parents initially)
-            p_profile = Profile.objects.create(
-                first_name=p_data.get("first_name", ""),
-                middle_name=p_data.get("middle_name", ""),
-                last_name=p_data.get("last_name", ""),
-                phone=p_data.get("phone", ""),
-                gender=p_data.get("gender", "other"),
-                address=p_data.get("address", ""),
-            )
-
-            parent = Parent.objects.create(
-                profile=p_profile, occupation=p_data.get("occupation", "")
-            )
-
-            StudentParentRelation.objects.create(
-                student=student,
-                parent=parent,
-                relation_type=p_data.get("relation", "other"),
-                is_primary_contact=p_data.get("is_primary", False),
-            )
+        # 6. Handle Parents (new ones, or existing ones linked by parent_id)
+        sync_student_parents(student, parents_data)
 
         return student
 
@@ -188,9 +192,9 @@ class StudentEnrollmentSerializer(serializers.Serializer):
                         is_current=True,
                     )
 
-        # 4. Handle Parents - TODO: Complex Nested Update
-        # For now, we skip updating parents via this endpoint to avoid complexity
-        # and recommend a dedicated Family Management API.
+        # 4. Handle Parents: only the differences are written
+        if "parents" in validated_data:
+            sync_student_parents(instance, validated_data["parents"])
 
         return instance
 
@@ -292,3 +296,21 @@ class BulkAccountCreationSerializer(serializers.Serializer):
         profile.save()
 
         return user
+
+
+class PromotionSerializer(serializers.Serializer):
+    from_year = serializers.CharField(max_length=20)
+    to_year = serializers.CharField(max_length=20)
+    program_id = serializers.UUIDField(required=False, allow_null=True)
+    level_ids = serializers.ListField(child=serializers.UUIDField(), required=False)
+    hold_back = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        help_text="Student IDs that repeat their current level",
+    )
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        if data["from_year"] == data["to_year"]:
+            raise serializers.ValidationError("to_year must differ from from_year")
+        return data
@@ -1,3 +1,179 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.test import APIClient
+
+from academics.models import AcademicLevel, Program, Section
+from accounts.models import User
+from families.models import Parent, StudentParentRelation
+from profiles.models import Profile
+from .models import AcademicHistory, Student, StudentLevel
+from .promotion import promote_students
+
+
+class PromotionTest(TenantTestCase):
+    """
+    Verifies the year-end rollover runs as one statement, maps sections by
+    name, graduates final levels and keeps held-back students in place.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        self.levels = [
+            AcademicLevel.objects.create(program=program, name=f"Grade {order}", order=order)
+            for order in (9, 10, 11)
+        ]
+        self.sections = {
+            (level.order, name): Section.objects.create(level=level, name=name)
+            for level in self.levels
+            for name in ("A", "B")
+        }
+
+        self.students = {}
+        placements = [("g9a", 9, "A"), ("g9b", 9, "B"), ("held", 9, "A"), ("g11", 11, "A")]
+        for key, order, section in placements:
+            student = Student.objects.create(
+                profile=Profile.objects.create(first_name=key, last_name="Test"),
+                enrollment_id=f"P-{key}",
+            )
+            StudentLevel.objects.create(
+                student=student,
+                level=self.levels[order - 9],
+                section=self.sections[(order, section)],
+                academic_year="2026",
+            )
+            self.students[key] = student
+
+    def _current(self, key):
+        return StudentLevel.objects.get(student=self.students[key], is_current=True)
+
+    def test_dry_run_writes_nothing(self):
+        summary = promote_students("2026", "2027", hold_back=[self.students["held"].id], dry_run=True)
+        counts = {row["action"]: row["students"] for row in summary}
+        self.assertEqual(counts, {"promote": 2, "repeat": 1, "graduate": 1})
+        self.assertFalse(StudentLevel.objects.filter(academic_year="2027").exists())
+
+    def test_rollover_is_one_statement(self):
+        with CaptureQueriesContext(connection) as queries:
+            promote_students("2026", "2027", hold_back=[self.students["held"].id])
+        statements = [
+            q["sql"]
+            for q in queries.captured_queries
+            if not q["sql"].startswith(("SET", "SAVEPOINT", "RELEASE"))
+        ]
+        # The rollover, then deriving the new sections' core subjects (insert + delete)
+        self.assertEqual(len(statements), 3)
+        self.assertTrue(statements[0].lstrip().startswith("WITH plan AS"))
+
+        promoted = self._current("g9b")
+        self.assertEqual(promoted.academic_year, "2027")
+        self.assertEqual(promoted.level, self.levels[1])
+        self.assertEqual(promoted.section, self.sections[(10, "B")])
+
+        held = self._current("held")
+        self.assertEqual((held.academic_year, held.level), ("2027", self.levels[0]))
+
+        graduate = self.students["g11"]
+        graduate.refresh_from_db()
+        self.assertEqual(graduate.status, "graduated")
+        self.assertFalse(graduate.enrollments.filter(is_current=True).exists())
+
+        # Already rolled over: a second run changes nothing
+        self.assertEqual(promote_students("2026", "2027"), [])
+        self.assertEqual(StudentLevel.objects.filter(academic_year="2027").count(), 3)
+
+    def test_endpoint_and_command(self):
+        api = APIClient(HTTP_HOST=self.domain.domain)
+        api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+        response = api.post(
+            "/api/students/promote/",
+            {"from_year": "2026", "to_year": "2027", "dry_run": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            (response.json()["promoted"], response.json()["graduated"]), (3, 1)
+        )
+
+        call_command(
+            "promote_students",
+            schema=self.tenant.schema_name,
+            from_year="2026",
+            to_year="2027",
+            hold_back=["P-held"],
+            stdout=StringIO(),
+        )
+        self.assertEqual(self._current("held").level, self.levels[0])
+        self.assertEqual(self._current("g9a").level, self.levels[1])
+
+
+class StudentDetailTest(TenantTestCase):
+    """
+    Verifies the detail endpoint loads everything with a fixed number of queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        program = Program.objects.create(name="High School", code="HS")
+        level = AcademicLevel.objects.create(program=program, name="Grade 9", order=9)
+        section = Section.objects.create(level=level, name="A")
+
+        account = User.objects.create_user(
+            username="detail.student", password="x", email="detail@example.com"
+        )
+        self.student = Student.objects.create(
+            profile=Profile.objects.create(
+                first_name="Detail", last_name="Student", user_id=account.id
+            ),
+            enrollment_id="D-1",
+        )
+        StudentLevel.objects.create(
+            student=self.student,
+            level=level,
+            section=section,
+            academic_year="2025",
+            is_current=False,
+        )
+        StudentLevel.objects.create(
+            student=self.student, level=level, section=section, academic_year="2026"
+        )
+        AcademicHistory.objects.create(
+            student=self.student, previous_school="Old School", last_grade_passed="8"
+        )
+        for relation in ("father", "mother"):
+            parent = Parent.objects.create(
+                profile=Profile.objects.create(first_name=relation.title(), last_name="Student")
+            )
+            StudentParentRelation.objects.create(
+                student=self.student, parent=parent, relation_type=relation
+            )
+
+        self.api = APIClient(HTTP_HOST=self.domain.domain)
+        self.api.force_authenticate(User.objects.create_superuser(username="admin", password="x"))
+
+    def test_detail_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(f"/api/students/detail/{self.student.id}/")
+        self.assertEqual(response.status_code, 200, response.content)
+
+        selects = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and "organizations_domain" not in q["sql"]
+        ]
+        # Student + profile, current placement, parents, history, user
+        self.assertEqual(len(selects), 5, selects)
+
+        data = response.json()
+        self.assertEqual(data["email"], "detail@example.com")
+        self.assertEqual((data["academic_year"], data["section"]), ("2026", "A"))
+        self.assertEqual({p["relation"] for p in data["parents"]}, {"father", "mother"})
+        self.assertEqual(data["previous_school"], "Old School")
+
+    def test_missing_student(self):
+        response = self.api.get("/api/students/detail/00000000-0000-0000-0000-000000000000/")
+        self.assertEqual(response.status_code, 404)
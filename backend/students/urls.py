@@ -5,6 +5,7 @@ from .views import (
     PortalActivationView,
     CredentialDistributionView,
     StudentDetailView,
+    PromotionView,
 )
 
 urlpatterns = [
@@ -19,4 +20,5 @@ urlpatterns = [
         "credentials/", CredentialDistributionView.as_view(), name="student-credentials"
     ),
     path("detail/<uuid:pk>/", StudentDetailView.as_view(), name="student-detail"),
+    path("promote/", PromotionView.as_view(), name="student-promote"),
 ]
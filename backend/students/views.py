@@ -4,8 +4,10 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from roles.permissions import HasPermission
-from .serializers import StudentEnrollmentSerializer
+from .serializers import StudentEnrollmentSerializer, PromotionSerializer
 from .models import Student
+from .promotion import promote_students
+from .loaders import load_student_detail
 
 
 class StudentEnrollmentView(APIView):
@@ -181,21 +183,21 @@ class StudentDetailView(APIView):
 
     def get(self, request, pk):
         try:
-            student = Student.objects.select_related("profile").get(id=pk)
+            student = load_student_detail(pk)
         except Student.DoesNotExist:
             return Response(
                 {"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        current = student.enrollments.filter(is_current=True).first()
+        current = student.current_enrollment
 
         # We need parents for the edit form
         parents_data = []
-        relations = student.parent_links.select_related("parent__profile").all()
-        for rel in relations:
+        for rel in student.parent_relations:
             p_profile = rel.parent.profile
             parents_data.append(
                 {
+                    "parent_id": rel.parent_id,
                     "first_name": p_profile.first_name,
                     "last_name": p_profile.last_name,
                     "phone": p_profile.phone,
@@ -214,7 +216,7 @@ class StudentDetailView(APIView):
             "enrollment_id": student.enrollment_id,
             "gender": student.profile.gender,
             "date_of_birth": student.profile.date_of_birth,
-            "email": student.profile.user.email if student.profile.user_id else None,
+            "email": student.profile.user.email if student.profile.user else None,
             "phone": student.profile.phone,
             "address": student.profile.address,
             # Academic
@@ -230,7 +232,7 @@ class StudentDetailView(APIView):
         }
 
         # Add previous academic history if exists
-        history = student.academic_history.first()
+        history = student.latest_history
         if history:
             data["previous_school"] = history.previous_school
             data["last_grade_passed"] = history.last_grade_passed
@@ -282,6 +284,7 @@ class StudentDetailView(APIView):
 
             User = apps.get_model("accounts", "User")
             UserRole = apps.get_model("roles", "UserRole")
+            TenantMembership = apps.get_model("accounts", "TenantMembership")
 
             # Remove student role in THIS tenant's schema
             UserRole.objects.filter(
@@ -289,12 +292,60 @@ class StudentDetailView(APIView):
                 role__slug="student",
             ).delete()
 
-            # Check for orphans - if user has NO roles in THIS tenant
-            # Note: UserRole is now tenant-scoped, so this check is schema-specific
-            if not UserRole.objects.filter(user__id=user_id).exists():
+            # Check for orphans - only drop the global identity once the user
+            # belongs to no school at all (membership index spans every tenant)
+            if not TenantMembership.objects.filter(user_id=user_id).exists():
                 try:
                     User.objects.get(id=user_id).delete()
                 except User.DoesNotExist:
                     pass
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PromotionView(APIView):
+    """
+    Year-end rollover of current placements to the next level of each program.
+    Students in a program's final level graduate; `hold_back` students repeat.
+    Pass `dry_run: true` to preview the per-level counts without writing.
+    """
+
+    permission_classes = [IsAuthenticated, HasPermission("change_student")]
+
+    def post(self, request):
+        serializer = PromotionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        summary = promote_students(
+            data["from_year"],
+            data["to_year"],
+            program_id=data.get("program_id"),
+            level_ids=data.get("level_ids", []),
+            hold_back=data.get("hold_back", []),
+            dry_run=data["dry_run"],
+        )
+        totals = {"promote": 0, "repeat": 0, "graduate": 0}
+        for row in summary:
+            totals[row["action"]] += row["students"]
+
+        return Response(
+            {
+                "dry_run": data["dry_run"],
+                "from_year": data["from_year"],
+                "to_year": data["to_year"],
+                "promoted": totals["promote"],
+                "repeated": totals["repeat"],
+                "graduated": totals["graduate"],
+                "levels": [
+                    {
+                        "action": row["action"],
+                        "from_level": row["from_level_id"],
+                        "to_level": row["to_level_id"],
+                        "students": row["students"],
+                    }
+                    for row in summary
+                ],
+            }
+        )
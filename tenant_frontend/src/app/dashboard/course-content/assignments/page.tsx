@@ -14,14 +14,22 @@ import { Plus, LoaderCircle, FileText } from "lucide-react";
 import { CreateAssignmentDialog } from "@/components/dashboard/course-content/CreateAssignmentDialog";
 import { SubmitAssignmentDialog } from "@/components/dashboard/course-content/SubmitAssignmentDialog";
 import { AssignmentCard } from "@/components/dashboard/course-content/AssignmentCard";
+import { LoadMoreButton } from "@/components/dashboard/LoadMoreButton";
 
 export default function AssignmentsPage() {
     const { can, isOwner, activeRole } = usePermissions();
     const canCreate = isOwner || can("create_assignment");
     const isStudent = activeRole === 'student';
 
-    const { data: assignments, isLoading: loadingAssignments } = useAssignments();
-    const { data: mySubmissions, isLoading: loadingSubmissions } = useMySubmissions();
+    const {
+        data: assignments,
+        isLoading: loadingAssignments,
+        hasNextPage,
+        isFetchingNextPage,
+        fetchNextPage
+    } = useAssignments();
+    // Staff would get every school submission here; only students match their own
+    const { data: mySubmissions, isLoading: loadingSubmissions } = useMySubmissions(isStudent);
     const { mutate: createAssignment, isPending: isCreating } = useCreateAssignment();
     const { mutate: submitAssignment, isPending: isSubmitting } = useSubmitAssignment();
 
@@ -134,6 +142,11 @@ export default function AssignmentsPage() {
                     </div>
                 )}
             </div>
+            <LoadMoreButton
+                hasNextPage={hasNextPage}
+                isFetchingNextPage={isFetchingNextPage}
+                fetchNextPage={fetchNextPage}
+            />
         </div>
     );
 }
@@ -1,21 +1,26 @@
 "use client";
 
 import { useState } from "react";
-import { useSubmissions, useGradeSubmission, useAssignments } from "@/hooks/useCourseContent";
+import { useSubmissions, useGradeSubmission, useAssignmentOptions } from "@/hooks/useCourseContent";
 import { LoaderCircle } from "lucide-react";
 import { GradingDialog } from "@/components/dashboard/course-content/GradingDialog";
 import { SubmissionsTable } from "@/components/dashboard/course-content/SubmissionsTable";
 import { AssignmentFilter } from "@/components/dashboard/course-content/AssignmentFilter";
+import { LoadMoreButton } from "@/components/dashboard/LoadMoreButton";
 
 export default function GradingPage() {
     const [selectedAssignment, setSelectedAssignment] = useState<string>("");
     const [isGradingDialogOpen, setIsGradingDialogOpen] = useState(false);
     const [currentSubmission, setCurrentSubmission] = useState<any>(null);
 
-    const { data: assignments, isLoading: loadingAssignments } = useAssignments();
-    const { data: submissions, isLoading: loadingSubmissions } = useSubmissions(
-        selectedAssignment || undefined
-    );
+    const { data: assignments, isLoading: loadingAssignments } = useAssignmentOptions();
+    const {
+        data: submissions,
+        isLoading: loadingSubmissions,
+        hasNextPage,
+        isFetchingNextPage,
+        fetchNextPage
+    } = useSubmissions(selectedAssignment || undefined);
     const { mutate: gradeSubmission, isPending: isGrading } = useGradeSubmission();
 
     const handleGrade = (data: { score: number; feedback: string }) => {
@@ -77,6 +82,11 @@ export default function GradingPage() {
                 onGradeClick={openGradingDialog}
                 selectedAssignment={selectedAssignment}
             />
+            <LoadMoreButton
+                hasNextPage={hasNextPage}
+                isFetchingNextPage={isFetchingNextPage}
+                fetchNextPage={fetchNextPage}
+            />
         </div>
     );
 }
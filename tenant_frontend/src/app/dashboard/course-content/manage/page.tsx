@@ -12,9 +12,10 @@ import { Plus, LoaderCircle } from "lucide-react";
 import { UploadContentDialog } from "@/components/dashboard/course-content/UploadContentDialog";
 import { ContentTable } from "@/components/dashboard/course-content/ContentTable";
 import { DeleteConfirmDialog } from "@/components/dashboard/course-content/DeleteConfirmDialog";
+import { LoadMoreButton } from "@/components/dashboard/LoadMoreButton";
 
 export default function ManageContentPage() {
-    const { data: content, isLoading } = useMyCourseContent();
+    const { data: content, isLoading, hasNextPage, isFetchingNextPage, fetchNextPage } = useMyCourseContent();
     const { mutate: createContent, isPending: isCreating } = useCreateContent();
     const { mutate: deleteContent } = useDeleteContent();
 
@@ -73,6 +74,11 @@ export default function ManageContentPage() {
                 content={content || []}
                 onDeleteClick={setContentToDelete}
             />
+            <LoadMoreButton
+                hasNextPage={hasNextPage}
+                isFetchingNextPage={isFetchingNextPage}
+                fetchNextPage={fetchNextPage}
+            />
 
             <DeleteConfirmDialog
                 open={!!contentToDelete}
@@ -5,12 +5,13 @@ import { LoaderCircle, FileText } from "lucide-react";
 import { useState } from "react";
 import { MaterialsFilters } from "@/components/dashboard/course-content/MaterialsFilters";
 import { MaterialCard } from "@/components/dashboard/course-content/MaterialCard";
+import { LoadMoreButton } from "@/components/dashboard/LoadMoreButton";
 
 export default function StudyMaterialsPage() {
     const [searchQuery, setSearchQuery] = useState("");
     const [contentTypeFilter, setContentTypeFilter] = useState<string>("all");
 
-    const { data: content, isLoading } = useCourseContent(
+    const { data: content, isLoading, hasNextPage, isFetchingNextPage, fetchNextPage } = useCourseContent(
         contentTypeFilter !== "all" ? contentTypeFilter : undefined,
         true // Exclude assignments - this is a study materials page
     );
@@ -62,6 +63,11 @@ export default function StudyMaterialsPage() {
                     </div>
                 )}
             </div>
+            <LoadMoreButton
+                hasNextPage={hasNextPage}
+                isFetchingNextPage={isFetchingNextPage}
+                fetchNextPage={fetchNextPage}
+            />
         </div>
     );
 }
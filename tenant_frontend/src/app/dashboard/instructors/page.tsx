@@ -12,9 +12,10 @@ import {
     TableRow,
 } from "@/components/ui/table";
 import { Button } from "@/components/ui/button";
+import { LoadMoreButton } from "@/components/dashboard/LoadMoreButton";
 
 export default function FacultyDirectoryPage() {
-    const { data: instructors, isLoading } = useInstructors();
+    const { data: instructors, isLoading, hasNextPage, isFetchingNextPage, fetchNextPage } = useInstructors();
 
     return (
         <div className="space-y-6">
@@ -73,6 +74,11 @@ export default function FacultyDirectoryPage() {
                         )}
                     </TableBody>
                 </Table>
+                <LoadMoreButton
+                    hasNextPage={hasNextPage}
+                    isFetchingNextPage={isFetchingNextPage}
+                    fetchNextPage={fetchNextPage}
+                />
             </div>
         </div>
     );
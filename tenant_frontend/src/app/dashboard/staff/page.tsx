@@ -16,6 +16,7 @@ import {
     Trash2
 } from "lucide-react";
 import { Input } from "@/components/ui/input";
+import { LoadMoreButton } from "@/components/dashboard/LoadMoreButton";
 import {
     Table,
     TableBody,
@@ -46,7 +47,7 @@ import {
 
 export default function StaffPage() {
     const { can, isOwner } = usePermissions();
-    const { data: staff, isLoading } = useStaffMembers();
+    const { data: staff, isLoading, hasNextPage, isFetchingNextPage, fetchNextPage } = useStaffMembers();
     const { mutate: deleteStaff } = useDeleteStaff();
     const [staffToDelete, setStaffToDelete] = useState<string | null>(null);
     const router = useRouter();
@@ -215,6 +216,11 @@ export default function StaffPage() {
                             )}
                         </TableBody>
                     </Table>
+                    <LoadMoreButton
+                        hasNextPage={hasNextPage}
+                        isFetchingNextPage={isFetchingNextPage}
+                        fetchNextPage={fetchNextPage}
+                    />
                 </div>
             </div>
 
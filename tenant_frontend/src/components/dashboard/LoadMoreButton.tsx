@@ -0,0 +1,30 @@
+"use client";
+
+import { LoaderCircle } from "lucide-react";
+import { Button } from "@/components/ui/button";
+
+interface LoadMoreButtonProps {
+    hasNextPage: boolean;
+    isFetchingNextPage: boolean;
+    fetchNextPage: () => unknown;
+}
+
+// Footer of lists served by usePagedList
+export function LoadMoreButton({ hasNextPage, isFetchingNextPage, fetchNextPage }: LoadMoreButtonProps) {
+    if (!hasNextPage) return null;
+
+    return (
+        <div className="flex justify-center py-4">
+            <Button
+                variant="outline"
+                size="sm"
+                className="gap-2"
+                disabled={isFetchingNextPage}
+                onClick={() => fetchNextPage()}
+            >
+                {isFetchingNextPage && <LoaderCircle className="h-4 w-4 animate-spin" />}
+                Load more
+            </Button>
+        </div>
+    );
+}
@@ -58,11 +58,11 @@ export function GradingDialog({
                         </p>
                     </div>
 
-                    {submission.submission_file && (
+                    {submission.download_url && (
                         <div className="flex items-center gap-2">
                             <FileText className="h-4 w-4 text-slate-400" />
                             <a
-                                href={submission.submission_file}
+                                href={submission.download_url}
                                 target="_blank"
                                 rel="noopener noreferrer"
                                 className="text-sm text-blue-600 hover:underline"
@@ -19,7 +19,7 @@ interface MaterialItem {
     content_type_display: string;
     created_by_name: string;
     created_at: string;
-    file?: string | null;
+    download_url?: string | null;
     external_url?: string;
     file_size?: number | null;
     is_pinned: boolean;
@@ -78,12 +78,12 @@ export function MaterialCard({ material }: MaterialCardProps) {
                     )}
                 </div>
 
-                {material.file ? (
+                {material.download_url ? (
                     <Button
                         size="sm"
                         variant="outline"
                         className="h-8 gap-2"
-                        onClick={() => window.open(material.file!, '_blank')}
+                        onClick={() => window.open(material.download_url!, '_blank')}
                     >
                         <Download className="h-3 w-3" />
                         Download
@@ -9,6 +9,7 @@ import {
     StaffMember
 } from "@/hooks/useStaff";
 import { Button } from "@/components/ui/button";
+import { LoadMoreButton } from "@/components/dashboard/LoadMoreButton";
 import {
     Users,
     Key,
@@ -51,7 +52,13 @@ interface ActivationTabProps {
 
 export default function StaffActivationTab({ onSuccess }: ActivationTabProps) {
     // Queries
-    const { data: allStaff, isLoading: loadingStaff } = useStaffMembers();
+    const {
+        data: allStaff,
+        isLoading: loadingStaff,
+        hasNextPage,
+        isFetchingNextPage,
+        fetchNextPage
+    } = useStaffMembers();
     const { data: roles, isLoading: loadingRoles } = useRoles();
     const { mutateAsync: activatePortal, isPending } = useActivateStaff();
 
@@ -83,9 +90,8 @@ export default function StaffActivationTab({ onSuccess }: ActivationTabProps) {
 
         // Auto-match role based on designation
         let preSelectedRole = "";
-        if (roles?.results || Array.isArray(roles)) {
-            const list = roles.results || roles;
-            const match = list.find((r: any) => r.name.toLowerCase() === staff.designation.toLowerCase());
+        if (roles) {
+            const match = roles.find((r: any) => r.name.toLowerCase() === staff.designation.toLowerCase());
             if (match) preSelectedRole = match.slug;
         }
 
@@ -207,6 +213,11 @@ export default function StaffActivationTab({ onSuccess }: ActivationTabProps) {
                                 })}
                             </div>
                         )}
+                        <LoadMoreButton
+                            hasNextPage={hasNextPage}
+                            isFetchingNextPage={isFetchingNextPage}
+                            fetchNextPage={fetchNextPage}
+                        />
                     </CardContent>
                 </Card>
 
@@ -280,7 +291,7 @@ export default function StaffActivationTab({ onSuccess }: ActivationTabProps) {
                                                                 <SelectValue placeholder="Select Role" />
                                                             </SelectTrigger>
                                                             <SelectContent>
-                                                                {(roles?.results || (Array.isArray(roles) ? roles : []))?.map((role: any) => (
+                                                                {roles?.map((role: any) => (
                                                                     <SelectItem key={role.id} value={role.slug}>
                                                                         {role.name}
                                                                     </SelectItem>
@@ -44,15 +44,7 @@ export default function StaffProfessionalInfoStep({ form }: ProfessionalInfoStep
                         <SelectContent>
                             {loadingRoles ? (
                                 <SelectItem value="loading" disabled>Loading...</SelectItem>
-                            ) : roles?.results ? (
-                                // If pagination is used
-                                roles.results.map((role: any) => (
-                                    <SelectItem key={role.id} value={role.name}>
-                                        {role.name}
-                                    </SelectItem>
-                                ))
-                            ) : Array.isArray(roles) ? (
-                                // If generic list
+                            ) : roles && roles.length > 0 ? (
                                 roles.map((role: any) => (
                                     <SelectItem key={role.id} value={role.name}>
                                         {role.name}
@@ -43,6 +43,8 @@ const enrollmentSchema = z.object({
 
     // Parents
     parents: z.array(z.object({
+        // Set for guardians already on record, so an edit updates them instead of re-creating them
+        parent_id: z.string().optional(),
         first_name: z.string().min(2, "First name is required"),
         last_name: z.string().min(2, "Last name is required"),
         phone: z.string().min(1, "Phone is required"),
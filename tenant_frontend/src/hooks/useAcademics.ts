@@ -1,16 +1,19 @@
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import axiosInstance from "@/lib/axios";
+import { fetchAllPages } from "@/lib/pagination";
 import { toast } from "sonner";
 import { Program, AcademicLevel, Section, Subject, SubjectAssignment } from "../types/Academics";
 
+// The academic structure is small and every row feeds the pickers, so these
+// lists are read whole.
+
 // === PROGRAMS ===
 
 export const usePrograms = () => {
     return useQuery({
         queryKey: ["programs"],
         queryFn: async () => {
-            const response = await axiosInstance.get("/academics/programs/");
-            return response.data as Program[];
+            return fetchAllPages<Program>("/academics/programs/");
         }
     });
 };
@@ -71,8 +74,7 @@ export const useAcademicLevels = () => {
     return useQuery({
         queryKey: ["levels"],
         queryFn: async () => {
-            const response = await axiosInstance.get("/academics/levels/");
-            return response.data as AcademicLevel[];
+            return fetchAllPages<AcademicLevel>("/academics/levels/");
         }
     });
 };
@@ -136,8 +138,7 @@ export const useSections = () => {
     return useQuery({
         queryKey: ["sections"],
         queryFn: async () => {
-            const response = await axiosInstance.get("/academics/sections/");
-            return response.data as Section[];
+            return fetchAllPages<Section>("/academics/sections/");
         }
     });
 };
@@ -201,8 +202,7 @@ export const useSubjects = () => {
     return useQuery({
         queryKey: ["subjects"],
         queryFn: async () => {
-            const response = await axiosInstance.get("/academics/subjects/");
-            return response.data as Subject[];
+            return fetchAllPages<Subject>("/academics/subjects/");
         }
     });
 };
@@ -263,8 +263,7 @@ export const useInstructorAssignments = (instructorId: string) => {
     return useQuery({
         queryKey: ["assignments", "instructor", instructorId],
         queryFn: async () => {
-            const response = await axiosInstance.get(`/academics/assignments/?instructor=${instructorId}`);
-            return response.data as SubjectAssignment[];
+            return fetchAllPages<SubjectAssignment>("/academics/assignments/", { instructor: instructorId });
         },
         enabled: !!instructorId
     });
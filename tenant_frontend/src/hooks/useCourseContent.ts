@@ -1,5 +1,6 @@
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import axiosInstance from "@/lib/axios";
+import { fetchAllPages, usePagedList } from "@/lib/pagination";
 import { toast } from "sonner";
 import {
     CourseContent,
@@ -16,27 +17,19 @@ import {
 // === COURSE CONTENT ===
 
 export const useCourseContent = (contentType?: string, excludeAssignments?: boolean) => {
-    return useQuery({
-        queryKey: ["course-content", contentType, excludeAssignments],
-        queryFn: async () => {
-            const params: any = {};
-            if (contentType) params.content_type = contentType;
-            if (excludeAssignments) params.exclude_assignments = 'true';
+    const params: any = {};
+    if (contentType) params.content_type = contentType;
+    if (excludeAssignments) params.exclude_assignments = 'true';
 
-            const response = await axiosInstance.get("/course-content/content/", { params });
-            return response.data as CourseContent[];
-        }
-    });
+    return usePagedList<CourseContent>(
+        ["course-content", contentType, excludeAssignments],
+        "/course-content/content/",
+        params
+    );
 };
 
 export const useMyCourseContent = () => {
-    return useQuery({
-        queryKey: ["my-course-content"],
-        queryFn: async () => {
-            const response = await axiosInstance.get("/course-content/content/my_content/");
-            return response.data as CourseContent[];
-        }
-    });
+    return usePagedList<CourseContent>(["my-course-content"], "/course-content/content/my_content/");
 };
 
 export const useCreateContent = () => {
@@ -106,12 +99,17 @@ export const useDeleteContent = () => {
 // === ASSIGNMENTS ===
 
 export const useAssignments = () => {
+    return usePagedList<Assignment>(["assignments"], "/course-content/assignments/");
+};
+
+// Every assignment, with just what the assignment picker shows
+export const useAssignmentOptions = () => {
     return useQuery({
-        queryKey: ["assignments"],
-        queryFn: async () => {
-            const response = await axiosInstance.get("/course-content/assignments/");
-            return response.data as Assignment[];
-        }
+        queryKey: ["assignments", "options"],
+        queryFn: () =>
+            fetchAllPages<Pick<Assignment, "id" | "content_details">>("/course-content/assignments/", {
+                fields: "id,content_details",
+            }),
     });
 };
 
@@ -185,23 +183,19 @@ export const useDeleteAssignment = () => {
 // === SUBMISSIONS ===
 
 export const useSubmissions = (assignmentId?: string) => {
-    return useQuery({
-        queryKey: ["submissions", assignmentId],
-        queryFn: async () => {
-            const params = assignmentId ? { assignment: assignmentId } : {};
-            const response = await axiosInstance.get("/course-content/submissions/", { params });
-            return response.data as AssignmentSubmission[];
-        }
-    });
+    return usePagedList<AssignmentSubmission>(
+        ["submissions", assignmentId],
+        "/course-content/submissions/",
+        assignmentId ? { assignment: assignmentId } : {}
+    );
 };
 
-export const useMySubmissions = () => {
+// A student's own submissions, read whole to match them to the assignments shown
+export const useMySubmissions = (enabled: boolean = true) => {
     return useQuery({
         queryKey: ["my-submissions"],
-        queryFn: async () => {
-            const response = await axiosInstance.get("/course-content/submissions/");
-            return response.data as AssignmentSubmission[];
-        }
+        queryFn: () => fetchAllPages<AssignmentSubmission>("/course-content/submissions/", { limit: 200 }),
+        enabled
     });
 };
 
@@ -255,17 +249,15 @@ export const useGradeSubmission = () => {
 // === SUBJECT ENROLLMENT ===
 
 export const useSubjectEnrollments = (studentId?: string, subjectId?: string) => {
-    return useQuery({
-        queryKey: ["subject-enrollments", studentId, subjectId],
-        queryFn: async () => {
-            const params: any = {};
-            if (studentId) params.student = studentId;
-            if (subjectId) params.subject = subjectId;
+    const params: any = {};
+    if (studentId) params.student = studentId;
+    if (subjectId) params.subject = subjectId;
 
-            const response = await axiosInstance.get("/course-content/subject-enrollments/", { params });
-            return response.data as SubjectEnrollment[];
-        }
-    });
+    return usePagedList<SubjectEnrollment>(
+        ["subject-enrollments", studentId, subjectId],
+        "/course-content/subject-enrollments/",
+        params
+    );
 };
 
 export const useBulkEnroll = () => {
@@ -1,19 +1,19 @@
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import axiosInstance from "@/lib/axios";
+import { fetchAllPages } from "@/lib/pagination";
 import { Role, Permission } from "@/types/auth";
 import { RoleFormData, PermissionGroup } from "@/types/roles";
 import { toast } from "sonner";
 
 // --- API Functions ---
 
+// Both lists are short and read whole for the role pickers and editors
 async function getRoles(): Promise<Role[]> {
-    const { data } = await axiosInstance.get<Role[]>("/roles/");
-    return data;
+    return fetchAllPages<Role>("/roles/");
 }
 
 async function getPermissions(): Promise<Permission[]> {
-    const { data } = await axiosInstance.get<Permission[]>("/roles/permissions/");
-    return data;
+    return fetchAllPages<Permission>("/roles/permissions/");
 }
 
 async function createRole(payload: RoleFormData): Promise<Role> {
@@ -1,5 +1,6 @@
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import axiosInstance from "@/lib/axios";
+import { fetchAllPages, usePagedList } from "@/lib/pagination";
 import { toast } from "sonner";
 import { InstructorOnboardingData, InstructorActivationData, Instructor, StaffMember, StaffActivationData, StaffOnboardingData } from "../types/Staff";
 export type { InstructorOnboardingData, InstructorActivationData, Instructor, StaffMember, StaffActivationData, StaffOnboardingData };
@@ -90,13 +91,7 @@ export const useActivateStaff = () => {
 // === LISTING ===
 
 export const useInstructors = () => {
-    return useQuery({
-        queryKey: ["instructors"],
-        queryFn: async () => {
-            const response = await axiosInstance.get("/staff/instructors/");
-            return response.data as Instructor[];
-        }
-    });
+    return usePagedList<Instructor>(["instructors"], "/staff/instructors/");
 };
 
 export const useInstructor = (id: string) => {
@@ -111,13 +106,7 @@ export const useInstructor = (id: string) => {
 };
 
 export const useStaffMembers = () => {
-    return useQuery({
-        queryKey: ["staff"],
-        queryFn: async () => {
-            const response = await axiosInstance.get("/staff/members/");
-            return response.data as StaffMember[];
-        }
-    });
+    return usePagedList<StaffMember>(["staff"], "/staff/members/");
 };
 
 export const useStaffMember = (id: string) => {
@@ -226,9 +215,6 @@ export const usePendingStaffCredentials = () => {
 export const useRoles = () => {
     return useQuery({
         queryKey: ["roles"],
-        queryFn: async () => {
-            const response = await axiosInstance.get("/roles/");
-            return response.data;
-        }
+        queryFn: () => fetchAllPages<any>("/roles/"),
     });
 };
@@ -18,6 +18,7 @@ export interface StudentEnrollmentData {
     previous_school?: string;
     last_grade_passed?: string;
     parents?: Array<{
+        parent_id?: string;
         first_name: string;
         last_name: string;
         phone: string;
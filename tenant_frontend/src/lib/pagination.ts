@@ -0,0 +1,52 @@
+import { useInfiniteQuery, type QueryKey } from "@tanstack/react-query";
+import axiosInstance from "@/lib/axios";
+
+// List endpoints return one page at a time. `next` is the absolute URL of the
+// following page (cursor or limit/offset); `count` is only sent by limit/offset lists.
+export interface Page<T> {
+    next: string | null;
+    previous: string | null;
+    count?: number;
+    results: T[];
+}
+
+// The largest page_size the API accepts
+export const MAX_PAGE_SIZE = 500;
+
+// Every row of a list, following `next` links. Only for pickers and lookups
+// over small tables that really need all rows; screens listing records page
+// with usePagedList instead.
+export async function fetchAllPages<T>(url: string, params: Record<string, unknown> = {}): Promise<T[]> {
+    const rows: T[] = [];
+    let page = (await axiosInstance.get<Page<T>>(url, { params: { page_size: MAX_PAGE_SIZE, ...params } })).data;
+    rows.push(...page.results);
+    while (page.next) {
+        // `next` already carries the query string
+        page = (await axiosInstance.get<Page<T>>(page.next)).data;
+        rows.push(...page.results);
+    }
+    return rows;
+}
+
+// One page at a time: `data` holds the rows loaded so far, fetchNextPage()
+// loads the next page while hasNextPage is true.
+export function usePagedList<T>(
+    queryKey: QueryKey,
+    url: string,
+    params: Record<string, unknown> = {},
+    options: { enabled?: boolean } = {}
+) {
+    return useInfiniteQuery({
+        queryKey,
+        queryFn: async ({ pageParam }) => {
+            const response = pageParam
+                ? await axiosInstance.get<Page<T>>(pageParam)
+                : await axiosInstance.get<Page<T>>(url, { params });
+            return response.data;
+        },
+        initialPageParam: null as string | null,
+        getNextPageParam: (lastPage) => lastPage.next,
+        select: (data) => data.pages.flatMap((page) => page.results),
+        ...options,
+    });
+}
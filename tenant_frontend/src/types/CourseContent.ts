@@ -4,7 +4,8 @@ export interface CourseContent {
     description: string;
     content_type: 'note' | 'document' | 'video' | 'link' | 'assignment';
     content_type_display: string;
-    file: string | null;
+    download_url: string | null;
+    file_previews: Record<string, string>;
     file_size: number | null;
     external_url: string;
     created_by: string;
@@ -61,7 +62,7 @@ export interface AssignmentSubmission {
     student_name: string;
     student_enrollment_id: string;
     submitted_at: string | null;
-    submission_file: string | null;
+    download_url: string | null;
     submission_text: string;
     submission_url: string;
     status: 'pending' | 'submitted' | 'graded';